@@ -5,12 +5,15 @@ from json import dump as dump_json
 from logging import Logger
 from sys import stderr
 
-from flask_fullstack import SocketIO
+from flask import got_request_exception
 from requests import HTTPError
 
-import communities.base.discussion_db  # noqa: F401 WPS301  # to create database models
-import pages.pages_db  # noqa: F401 WPS301  # to create database models
-from common import app, db, versions, open_file, JSONEncoder
+import communities.base.invitations_sweeper  # noqa: F401 WPS301  # scheduled jobs
+import communities.tasks.task_counters  # noqa: F401 WPS301  # scheduled jobs
+import models  # noqa: F401 WPS301  # to create database models
+from common import app, db, versions, open_file, output_json, JSONEncoder, SocketIO
+from common.compression import compress_response
+from common.consts import COMPRESSION_ENABLED, COMPRESSION_MIN_SIZE
 from communities.base import (
     invitations_rst,
     invitations_sio,
@@ -30,12 +33,24 @@ from communities.tasks import (
     student_rst,
 )
 from moderation import mub_base_namespace, mub_cli_blueprint, mub_super_namespace
-from other import updater_rst, database_cli
+from other import (
+    api_docs,
+    updater_rst,
+    database_cli,
+    error_groups_mub,
+    hashing_mub,
+    profiler_mub,
+    scheduler_mub,
+    task_queue,
+    throttling_mub,
+)
 from other.discorder import (
     send_message as send_discord_message,
     send_file_message as send_file_discord_message,
     WebhookURLs,
 )
+from other.error_groups import record_request_error
+from other.profiler import start_profiling, finish_profiling
 from users import (
     emailer_mub,
     feedback_mub,
@@ -83,6 +98,7 @@ jwt = app.configure_jwt_with_loaders(
     csrf_protect=False,
 )
 api = app.configure_restx()
+api.representations["application/json"] = output_json
 
 # Files
 api.add_namespace(files_rst.controller)
@@ -114,6 +130,7 @@ api.add_namespace(student_rst.controller)
 
 # Other
 app.register_blueprint(database_cli.blueprint)
+app.register_blueprint(task_queue.blueprint)
 api.add_namespace(updater_rst.controller)
 
 # MUB + QA
@@ -122,6 +139,11 @@ api.add_namespace(mub_base_namespace)
 api.add_namespace(mub_super_namespace)
 api.add_namespace(emailer_mub.controller)
 api.add_namespace(invites_mub.controller)
+api.add_namespace(profiler_mub.controller)
+api.add_namespace(error_groups_mub.controller)
+api.add_namespace(hashing_mub.controller)
+api.add_namespace(throttling_mub.controller)
+api.add_namespace(scheduler_mub.controller)
 
 socketio = SocketIO(
     app,
@@ -133,6 +155,8 @@ socketio = SocketIO(
     engineio_logger=True,
     remove_ping_pong_logs=True,
     restx_models=api.models,
+    http_compression=COMPRESSION_ENABLED,  # for the polling transport
+    compression_threshold=COMPRESSION_MIN_SIZE,
 )
 
 socketio.add_namespace(
@@ -152,9 +176,17 @@ socketio.add_namespace(
     protected=True,
 )
 
+api_documents = api_docs.serve_documents(api, socketio)
+
 socketio.after_event(db.with_autocommit)
+app.after_request(compress_response)  # hooks run in reverse, so after the commit
 app.after_request(db.with_autocommit)
 
+app.before_request(start_profiling)
+app.teardown_request(finish_profiling)
+
+got_request_exception.connect(record_request_error, app)
+
 
 @app.cli.command("form-sio-docs")
 def form_sio_docs() -> None:  # TODO pragma: no coverage
@@ -0,0 +1,14 @@
+"""
+Application for benchmark commands: the serving application from `wsgi`
+(the benchmarks go through its controllers) with the `benchmark` commands,
+which workers don't load. From `xieffect`:
+
+    flask --app benchmarks.app benchmark run
+"""
+
+from __future__ import annotations
+
+from benchmarks import cli
+from wsgi import application
+
+application.register_blueprint(cli.blueprint)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from itertools import islice
+from typing import Any
+
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.orm import InstrumentedAttribute
+
+from common import Base, db
+
+INSERT_CHUNK: int = 1000
+
+Row = dict[str, Any]
+
+
+class BulkInserter:
+    """
+    Inserts rows with core statements, skipping the ORM. Ids are assigned
+    by the caller (see `allocate_ids`), so links between tables are known
+    without reading anything back
+    """
+
+    def __init__(self) -> None:
+        self.counts: dict[str, int] = {}
+
+    def allocate_ids(self, column: InstrumentedAttribute, count: int) -> list[int]:
+        start: int = (db.session.scalar(select(func.max(column))) or 0) + 1
+        return list(range(start, start + count))
+
+    def insert(self, model: Any, rows: list[Row]) -> None:
+        table = model.__table__
+        iterator = iter(rows)
+        chunk: list[Row] = list(islice(iterator, INSERT_CHUNK))
+        while chunk:
+            db.session.execute(insert(table), chunk)
+            chunk = list(islice(iterator, INSERT_CHUNK))
+        self.counts[table.name] = self.counts.get(table.name, 0) + len(rows)
+
+    def update_column(self, model: Any, column: str, values: dict[int, int]) -> None:
+        table = model.__table__
+        db.session.execute(
+            update(table)
+            .where(table.c.id == bindparam("entry_id"))
+            .values({column: bindparam("value")}),
+            [
+                {"entry_id": entry_id, "value": value}
+                for entry_id, value in values.items()
+            ],
+        )
+
+    def sync_sequences(self) -> None:
+        """Explicit ids don't advance postgres sequences, so it's done here"""
+        if db.engine.dialect.name != "postgresql":
+            return
+        for table_name in self.counts:
+            table = Base.metadata.tables[table_name]
+            if "id" not in table.columns or not table.c.id.autoincrement:
+                continue
+            db.session.execute(
+                select(
+                    func.setval(
+                        func.pg_get_serial_sequence(table_name, "id"),
+                        select(func.max(table.c.id)).scalar_subquery(),
+                    )
+                )
+            )
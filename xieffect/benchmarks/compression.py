@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import zlib
+from collections.abc import Callable
+from time import perf_counter
+
+from benchmarks.serialization import collect_payloads
+from common import dump_json_bytes
+from common.compression import brotli, GZIP_WBITS
+
+Codec = Callable[[bytes], bytes]
+
+
+def gzip_codec(level: int) -> Codec:
+    def compress(data: bytes) -> bytes:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+        return compressor.compress(data) + compressor.flush()
+
+    return compress
+
+
+def brotli_codec(quality: int) -> Codec:
+    return lambda data: brotli.compress(data, quality=quality)
+
+
+def collect_codecs() -> dict[str, Codec]:
+    codecs: dict[str, Codec] = {
+        f"gzip-{level}": gzip_codec(level) for level in (1, 6, 9)
+    }
+    if brotli is not None:
+        codecs.update(
+            {f"br-{quality}": brotli_codec(quality) for quality in (1, 4, 11)}
+        )
+    return codecs
+
+
+def time_codec(codec: Codec, data: bytes, repeats: int) -> tuple[bytes, float]:
+    """:return: compressed data & microseconds per run"""
+    compressed: bytes = codec(data)
+    started: float = perf_counter()
+    for _ in range(repeats):
+        codec(data)
+    return compressed, (perf_counter() - started) / repeats * 1e6  # noqa: WPS432
+
+
+def compare_codecs(repeats: int) -> list[str]:
+    """:return: table rows with sizes, ratios & CPU time per response"""
+    rows: list[str] = [
+        f"{'payload':<28}{'codec':<10}{'bytes':>10}{'ratio':>8}{'us':>10}"
+    ]
+    codecs = collect_codecs()
+    for name, payload in collect_payloads().items():
+        if not name.startswith("rest"):
+            continue  # socketio messages are too small to compress
+        data: bytes = dump_json_bytes(payload)
+        rows.append(f"{name:<28}{'none':<10}{len(data):>10}{1:>8.2f}{0:>10.1f}")
+        for codec_name, codec in codecs.items():
+            compressed, elapsed = time_codec(codec, data, repeats)
+            rows.append(
+                f"{'':<28}{codec_name:<10}{len(compressed):>10}"
+                + f"{len(data) / len(compressed):>8.2f}{elapsed:>10.1f}"
+            )
+    return rows
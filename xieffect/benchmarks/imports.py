@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from subprocess import run  # noqa: S404
+from sys import executable
+
+XIEFFECT_PATH: Path = Path(__file__).parent.parent
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+@dataclass()
+class ImportTiming:
+    """Times are in microseconds, as printed by `python -X importtime`"""
+
+    module: str
+    self_time: int
+    cumulative: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.module.partition(".")[0]
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    timings: list[ImportTiming] = []
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is not None:  # skips the header & unrelated stderr
+            self_time, cumulative, indent, module = match.groups()
+            timings.append(
+                ImportTiming(module, int(self_time), int(cumulative), len(indent) // 2)
+            )
+    return timings
+
+
+def profile_imports(module: str) -> list[ImportTiming]:
+    """Imports in a fresh interpreter, so that loaded modules don't hide costs"""
+    result = run(  # noqa: S603
+        [executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=XIEFFECT_PATH,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def group_by_package(timings: list[ImportTiming]) -> dict[str, int]:
+    """:return: self times summed by top-level package, slowest first"""
+    packages: dict[str, int] = {}
+    for timing in timings:
+        packages[timing.package] = packages.get(timing.package, 0) + timing.self_time
+    return dict(sorted(packages.items(), key=lambda item: item[1], reverse=True))
+
+
+def format_profile(timings: list[ImportTiming], top: int) -> list[str]:
+    total: int = sum(timing.self_time for timing in timings)
+    slowest = sorted(timings, key=lambda timing: timing.cumulative, reverse=True)
+    packages = list(group_by_package(timings).items())
+    return [
+        f"Total: {total / 1000:.0f}ms in {len(timings)} modules",
+        "",
+        "Packages by self time:",
+        *(f"{name:<40}{time / 1000:>10.1f}ms" for name, time in packages[:top]),
+        "",
+        "Modules by cumulative time:",
+        *(
+            f"{timing.module:<60}{timing.cumulative / 1000:>10.1f}ms"
+            for timing in slowest[:top]
+        ),
+    ]
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from time import perf_counter
+
+from common import app, db
+from communities.base.invitations_db import Invitation
+from users.invites_db import Invite
+
+
+@dataclass()
+class RedemptionReport:
+    name: str
+    limit: int
+    attempts: int
+    redeemed: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Attempts per second, successful or not"""
+        return self.attempts / self.seconds
+
+    @property
+    def over_redeemed(self) -> bool:
+        return self.redeemed > self.limit
+
+    def format(self) -> str:
+        return (
+            f"{self.name:<12}{self.redeemed:>6}/{self.limit:<6}"
+            f"{self.attempts:>10}{self.throughput:>12.1f}/s"
+        )
+
+
+def redeem_concurrently(
+    name: str,
+    redeem: Callable[[], bool],
+    limit: int,
+    attempts: int,
+    workers: int,
+) -> RedemptionReport:
+    """Each attempt is a separate transaction, as with parallel requests"""
+
+    def redeem_in_context(_: int) -> bool:
+        with app.app_context():
+            redeemed: bool = redeem()
+            db.session.commit()
+            return redeemed
+
+    started: float = perf_counter()
+    with ThreadPoolExecutor(workers) as executor:
+        results: list[bool] = list(executor.map(redeem_in_context, range(attempts)))
+    return RedemptionReport(
+        name, limit, attempts, sum(results), perf_counter() - started
+    )
+
+
+def redeem_invite(invite_id: int) -> Callable[[], bool]:
+    return lambda: Invite.find_by_id(invite_id).redeem()
+
+
+def redeem_invitation(invitation_id: int) -> Callable[[], bool]:
+    def redeem_invitation_inner() -> bool:
+        invitation: Invitation | None = Invitation.find_by_id(invitation_id)
+        return invitation is not None and invitation.redeem()  # deleted if used up
+
+    return redeem_invitation_inner
+
+
+def compare_redemptions(
+    community_id: int, limit: int, attempts: int, workers: int
+) -> list[RedemptionReport]:
+    """Redeems a new signup invite & a new community invitation"""
+    invite_id: int = Invite.create(name="redemption-benchmark", limit=limit).id
+    invitation_id: int = Invitation.create(community_id, limit, None).id
+    db.session.commit()
+
+    reports: list[RedemptionReport] = [
+        redeem_concurrently(
+            "invite", redeem_invite(invite_id), limit, attempts, workers
+        ),
+        redeem_concurrently(
+            "invitation", redeem_invitation(invitation_id), limit, attempts, workers
+        ),
+    ]
+
+    Invite.find_by_id(invite_id).delete()
+    Invitation.delete_bulk([invitation_id])  # if it wasn't used up
+    db.session.commit()
+    return reports
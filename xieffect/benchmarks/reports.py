@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from json import dump as dump_json, load as load_json
+from math import ceil
+from pathlib import Path
+
+BASELINES_PATH: Path = Path(__file__).parent / "baselines"
+DEFAULT_TOLERANCE: float = 0.25  # allowed relative slowdown of the p90
+HEADER: str = f"{'endpoint':<24}{'p50':>9}{'p90':>9}{'p99':>9}{'queries':>9}"
+
+
+def percentile(samples: list[float], percent: float) -> float:
+    """Nearest-rank percentile, `samples` should be sorted"""
+    return samples[max(0, ceil(len(samples) * percent / 100) - 1)]
+
+
+@dataclass()
+class ScenarioResult:
+    name: str
+    p50: float  # milliseconds
+    p90: float
+    p99: float
+    queries: int  # per request, the maximum across runs
+
+    @classmethod
+    def from_samples(cls, name: str, samples: list[float], queries: int):
+        samples = sorted(samples)
+        return cls(
+            name=name,
+            p50=percentile(samples, 50),
+            p90=percentile(samples, 90),
+            p99=percentile(samples, 99),
+            queries=queries,
+        )
+
+    def compare(self, baseline: ScenarioResult, tolerance: float) -> list[str]:
+        """:return: descriptions of regressions, empty if there are none"""
+        regressions: list[str] = []
+        if self.p90 > baseline.p90 * (1 + tolerance):
+            regressions.append(f"p90 {baseline.p90:.1f}ms -> {self.p90:.1f}ms")
+        if self.queries > baseline.queries:
+            regressions.append(f"queries {baseline.queries} -> {self.queries}")
+        return regressions
+
+    def format_row(self, regressions: list[str]) -> str:
+        row: str = (
+            f"{self.name:<24}{self.p50:>9.1f}{self.p90:>9.1f}"
+            + f"{self.p99:>9.1f}{self.queries:>9}"
+        )
+        if regressions:
+            return f"{row}  REGRESSION: {', '.join(regressions)}"
+        return row
+
+
+def format_report(
+    results: list[ScenarioResult],
+    baseline: dict[str, ScenarioResult],
+    tolerance: float,
+) -> tuple[list[str], bool]:
+    """:return: table rows & if anything regressed against the baseline"""
+    rows: list[str] = [HEADER]
+    regressed: bool = False
+    for result in results:
+        previous = baseline.get(result.name)
+        regressions = [] if previous is None else result.compare(previous, tolerance)
+        regressed = regressed or bool(regressions)
+        rows.append(result.format_row(regressions))
+    return rows, regressed
+
+
+def baseline_path(dialect: str) -> Path:
+    """Timings differ too much between databases to share a baseline"""
+    return BASELINES_PATH / f"{dialect}.json"
+
+
+def read_baseline(path: Path) -> dict[str, ScenarioResult]:
+    if not path.exists():
+        return {}
+    with path.open(encoding="utf-8") as f:
+        return {result["name"]: ScenarioResult(**result) for result in load_json(f)}
+
+
+def write_baseline(path: Path, results: list[ScenarioResult]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        dump_json([asdict(result) for result in results], f, indent=2)
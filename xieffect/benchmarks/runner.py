@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any
+
+from flask.testing import FlaskClient
+from sqlalchemy import select
+from sqlalchemy.event import listen, remove
+
+from benchmarks.reports import ScenarioResult
+from benchmarks.seeding import BENCHMARK_COMMUNITY, BENCHMARK_EMAIL
+from common import app, db, BASIC_PASS
+from communities.base.meta_db import Community
+
+BENCHMARK_MOD_NAME: str = "benchmark"
+
+
+@dataclass()
+class Scenario:
+    name: str
+    path: str
+    json: dict[str, Any] = field(default_factory=dict)
+
+
+class QueryCounter:
+    def __init__(self) -> None:
+        self.count: int = 0
+
+    def __call__(self, *_) -> None:
+        self.count += 1
+
+    @contextmanager
+    def listen(self) -> Iterator[None]:
+        self.count = 0
+        listen(db.engine, "before_cursor_execute", self)
+        try:
+            yield
+        except Exception:
+            remove(db.engine, "before_cursor_execute", self)
+            raise
+        remove(db.engine, "before_cursor_execute", self)
+
+
+def find_community_id() -> int:
+    community_id: int | None = db.session.scalar(
+        select(Community.id).filter_by(name=BENCHMARK_COMMUNITY)
+    )
+    if community_id is None:
+        raise LookupError("Benchmark dataset not found, run `flask benchmark seed`")
+    return community_id
+
+
+def collect_scenarios() -> list[Scenario]:
+    community: str = f"/communities/{find_community_id()}"
+    return [
+        Scenario("home", "/home/"),
+        Scenario("participants", f"{community}/participants/"),
+        Scenario("participant-search", f"{community}/participants/", {"search": "a"}),
+        Scenario("roles", f"{community}/roles/"),
+        Scenario(
+            "teacher-tasks",
+            f"{community}/tasks/",
+            {"filter": "ALL", "order": "CREATED"},
+        ),
+        Scenario(
+            "teacher-tasks-active",
+            f"{community}/tasks/",
+            {"filter": "ACTIVE", "order": "OPENED"},
+        ),
+        Scenario("student-tasks", f"{community}/tasks/student/", {"filter": "ALL"}),
+        Scenario("invitations", f"{community}/invitations/"),
+        Scenario("news", f"{community}/news/"),
+        Scenario("chat-messages", f"{community}/videochat/messages/"),
+        Scenario("mub-users", "/mub/users/"),
+        Scenario("mub-invites", "/mub/invites/"),
+        Scenario("mub-files", "/mub/files/"),
+    ]
+
+
+def login(client: FlaskClient, path: str, data: dict[str, str]) -> None:
+    response = client.post(path, data=data)
+    if response.status_code != 200:
+        raise RuntimeError(f"Benchmark login at {path} failed: {response.json}")
+
+
+def measure(
+    client: FlaskClient, scenario: Scenario, repeats: int, warmup: int
+) -> ScenarioResult:
+    counter = QueryCounter()
+    samples: list[float] = []
+    queries: int = 0
+    for run in range(warmup + repeats):
+        with counter.listen():
+            started: float = perf_counter()
+            response = client.get(scenario.path, json=dict(scenario.json, offset=0))
+            elapsed: float = (perf_counter() - started) * 1000
+        if response.status_code != 200:
+            raise RuntimeError(f"{scenario.name} failed: {response.json}")
+        if run >= warmup:  # first runs fill caches & pools
+            samples.append(elapsed)
+            queries = max(queries, counter.count)
+    return ScenarioResult.from_samples(scenario.name, samples, queries)
+
+
+def run_scenarios(repeats: int, warmup: int) -> list[ScenarioResult]:
+    """Logs in as the owner of all benchmark communities & as a moderator"""
+    with app.test_client() as client:
+        login(client, "/signin/", {"email": BENCHMARK_EMAIL, "password": BASIC_PASS})
+        login(
+            client,
+            "/mub/sign-in/",
+            {"username": BENCHMARK_MOD_NAME, "password": BASIC_PASS},
+        )
+        return [
+            measure(client, scenario, repeats, warmup)
+            for scenario in collect_scenarios()
+        ]
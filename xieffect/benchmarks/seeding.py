@@ -0,0 +1,405 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import chain
+from random import Random
+
+from benchmarks.bulk import BulkInserter, Row
+from common import db, BASIC_PASS
+from communities.base.invitations_db import (
+    Invitation,
+    InvitationCounter,
+    InvitationRoles,
+)
+from communities.base.meta_db import Community, Participant
+from communities.base.roles_db import (
+    ParticipantRole,
+    PermissionType,
+    Role,
+    RolePermission,
+)
+from communities.services.news_db import Post
+from communities.services.videochat_db import ChatMessage
+from communities.tasks.task_counters_db import TaskCounter
+from communities.tasks.tasks_db import Task
+from communities.tasks.tests_db import Question, QuestionKind, Test
+from users.invites_db import Invite
+from users.users_db import User
+from vault.files_db import File
+
+WORDS: tuple[str, ...] = (
+    "alpha",
+    "beta",
+    "gamma",
+    "delta",
+    "omega",
+    "sigma",
+    "theta",
+    "kappa",
+    "lambda",
+    "zeta",
+)
+
+PERMISSIONS: list[PermissionType] = list(PermissionType)
+
+
+@dataclass(frozen=True)
+class DatasetSize:
+    """Counts are per community, except for users, communities & files"""
+
+    users: int
+    communities: int
+    participants: int  # in the biggest community, the rest get less
+    roles: int
+    tasks: int  # every third one is a test
+    questions: int  # per test
+    invitations: int
+    posts: int
+    messages: int
+    files: int
+
+
+DATASET_SIZES: dict[str, DatasetSize] = {
+    "small": DatasetSize(
+        users=300,
+        communities=5,
+        participants=250,
+        roles=5,
+        tasks=60,
+        questions=5,
+        invitations=20,
+        posts=30,
+        messages=100,
+        files=200,
+    ),
+    "medium": DatasetSize(
+        users=3000,
+        communities=20,
+        participants=2500,
+        roles=10,
+        tasks=300,
+        questions=10,
+        invitations=50,
+        posts=100,
+        messages=500,
+        files=2000,
+    ),
+    "large": DatasetSize(
+        users=20000,
+        communities=50,
+        participants=15000,
+        roles=20,
+        tasks=1000,
+        questions=20,
+        invitations=50,
+        posts=500,
+        messages=2000,
+        files=10000,
+    ),
+}
+
+BENCHMARK_EMAIL: str = "bench-0@bench.bench"  # owns every benchmark community
+BENCHMARK_COMMUNITY: str = "bench-community-0"  # the biggest one
+
+
+IdsByCommunity = dict[int, list[int]]
+
+
+class DatasetGenerator(BulkInserter):
+    """Generates the same dataset for the same seed & size"""
+
+    def __init__(self, size: DatasetSize, seed: int = 0) -> None:
+        super().__init__()
+        self.size: DatasetSize = size
+        self.random = Random(seed)
+        self.now: datetime = datetime(2023, 1, 1)  # fixed, for reproducibility
+
+    def name(self, index: int) -> str:
+        return f"{self.random.choice(WORDS)}-{index}"
+
+    def moment(self, days: int = 60) -> datetime:
+        return self.now + timedelta(minutes=self.random.randint(-days, days) * 1440)
+
+    def generate_users(self) -> list[int]:
+        password: str = User.generate_hash(BASIC_PASS)  # hashing once is enough
+        user_ids = self.allocate_ids(User.id, self.size.users)
+        self.insert(
+            User,
+            [
+                {
+                    "id": user_id,
+                    "email": f"bench-{index}@bench.bench",
+                    "email_confirmed": True,
+                    "password": password,
+                    "username": self.name(index),
+                    "theme": "system",
+                }
+                for index, user_id in enumerate(user_ids)
+            ],
+        )
+        return user_ids
+
+    def generate_files(self, user_ids: list[int]) -> None:
+        file_ids = self.allocate_ids(File.id, self.size.files)
+        self.insert(
+            File,
+            [
+                {
+                    "id": file_id,
+                    "name": f"{self.name(file_id)}.txt",
+                    "uploader_id": self.random.choice(user_ids),
+                }
+                for file_id in file_ids
+            ],
+        )
+
+    def generate_invites(self) -> None:
+        invite_ids = self.allocate_ids(Invite.id, self.size.invitations)
+        self.insert(
+            Invite,
+            [
+                {
+                    "id": invite_id,
+                    "name": self.name(invite_id),
+                    "code": Invite.serializer.dumps((invite_id, 0)),
+                    "limit": self.random.randint(-1, 100),
+                    "accepted": 0,
+                }
+                for invite_id in invite_ids
+            ],
+        )
+
+    def pick_members(self, index: int, user_ids: list[int]) -> list[int]:
+        """The first user is in every community, so `/home/` lists all of them"""
+        count: int = min(len(user_ids), max(2, self.size.participants // (index + 1)))
+        return [user_ids[0], *self.random.sample(user_ids[1:], count - 1)]
+
+    def generate_participants(self, members: IdsByCommunity) -> IdsByCommunity:
+        """
+        :param members: user ids by community id, owners first
+        :return: participant ids by community id, in the same order
+        """
+        total: int = sum(len(user_ids) for user_ids in members.values())
+        participant_ids: Iterator[int] = iter(self.allocate_ids(Participant.id, total))
+
+        rows: list[Row] = []
+        result: IdsByCommunity = {}
+        for community_id, user_ids in members.items():
+            result[community_id] = []
+            for user_id in user_ids:
+                participant_id: int = next(participant_ids)
+                rows.append(
+                    {
+                        "id": participant_id,
+                        "user_id": user_id,
+                        "community_id": community_id,
+                    }
+                )
+                result[community_id].append(participant_id)
+        self.insert_participants(rows)
+        return result
+
+    def insert_participants(self, rows: list[Row]) -> None:
+        """Participants of each user are linked in the order of `rows`"""
+        last_ids: dict[int, int] = {}
+        next_ids: dict[int, int] = {}
+        for row in rows:
+            prev_id: int | None = last_ids.get(row["user_id"])
+            if prev_id is not None:
+                next_ids[prev_id] = row["id"]
+            row["prev_id"] = prev_id
+            last_ids[row["user_id"]] = row["id"]
+        self.insert(Participant, rows)
+        # `next_id`s point to rows inserted later, so they are set afterwards
+        self.update_column(Participant, "next_id", next_ids)
+
+    def generate_communities(
+        self, user_ids: list[int]
+    ) -> tuple[IdsByCommunity, IdsByCommunity]:
+        """:return: user & participant ids by community id, owners first"""
+        community_ids = self.allocate_ids(Community.id, self.size.communities)
+        self.insert(
+            Community,
+            [
+                {
+                    "id": community_id,
+                    "name": f"bench-community-{index}",
+                    "description": f"Benchmark community {self.name(index)}",
+                }
+                for index, community_id in enumerate(community_ids)
+            ],
+        )
+
+        members: IdsByCommunity = {
+            community_id: self.pick_members(index, user_ids)
+            for index, community_id in enumerate(community_ids)
+        }
+        participants = self.generate_participants(members)
+        self.update_column(
+            Community,
+            "owner_id",
+            {
+                community_id: participant_ids[0]
+                for community_id, participant_ids in participants.items()
+            },
+        )
+        return members, participants
+
+    def generate_roles(self, participants: IdsByCommunity) -> IdsByCommunity:
+        """Gives random roles to a third of participants, :return: role ids"""
+        role_ids: Iterator[int] = iter(
+            self.allocate_ids(Role.id, self.size.roles * len(participants))
+        )
+        roles: IdsByCommunity = {
+            community_id: [next(role_ids) for _ in range(self.size.roles)]
+            for community_id in participants
+        }
+        self.insert(
+            Role,
+            [
+                {
+                    "id": role_id,
+                    "name": self.name(role_id)[:32],
+                    "color": f"{self.random.randrange(0x1000000):06x}",
+                    "community_id": community_id,
+                }
+                for community_id, community_roles in roles.items()
+                for role_id in community_roles
+            ],
+        )
+
+        permission_rows: list[Row] = []
+        for role_id in chain.from_iterable(roles.values()):
+            permission_rows.extend(
+                {"role_id": role_id, "permission_type": permission}
+                for permission in self.random.sample(
+                    PERMISSIONS, self.random.randint(1, len(PERMISSIONS))
+                )
+            )
+        self.insert(RolePermission, permission_rows)
+
+        participant_rows: list[Row] = []
+        for community_id, participant_ids in participants.items():
+            for participant_id in participant_ids[1::3]:
+                participant_rows.extend(
+                    {"participant_id": participant_id, "role_id": role_id}
+                    for role_id in self.random.sample(
+                        roles[community_id], min(2, self.size.roles)
+                    )
+                )
+        self.insert(ParticipantRole, participant_rows)
+        return roles
+
+    def generate_invitations(self, roles: IdsByCommunity) -> None:
+        invitation_ids: Iterator[int] = iter(
+            self.allocate_ids(Invitation.id, self.size.invitations * len(roles))
+        )
+        rows: list[Row] = []
+        role_rows: list[Row] = []
+        for community_id, community_roles in roles.items():
+            for _ in range(self.size.invitations):
+                invitation_id: int = next(invitation_ids)
+                rows.append(
+                    {
+                        "id": invitation_id,
+                        "code": Invitation.serializer.dumps(
+                            (community_id, invitation_id)
+                        ),
+                        "community_id": community_id,
+                        "deadline": self.random.choice((None, self.moment())),
+                        "limit": self.random.choice((None, 10, 100)),
+                    }
+                )
+                role_rows.extend(
+                    {"invitation_id": invitation_id, "role_id": role_id}
+                    for role_id in self.random.sample(
+                        community_roles, min(2, self.size.roles)
+                    )
+                )
+        self.insert(Invitation, rows)
+        self.insert(InvitationRoles, role_rows)
+        InvitationCounter.recompute()  # rows are inserted without the counters
+
+    def generate_tasks(self, members: IdsByCommunity) -> None:
+        task_ids: Iterator[int] = iter(
+            self.allocate_ids(Task.id, self.size.tasks * len(members))
+        )
+        rows: list[Row] = []
+        for community_id, user_ids in members.items():
+            for index in range(self.size.tasks):
+                opened: datetime | None = self.random.choice((None, self.moment()))
+                rows.append(
+                    {
+                        "id": next(task_ids),
+                        "user_id": user_ids[0],
+                        "community_id": community_id,
+                        "page_id": index,
+                        "name": self.name(index),
+                        "description": f"Task {index} of {community_id}",
+                        "created": self.moment(),
+                        "opened": opened,
+                        "closed": opened and opened + timedelta(days=7),
+                    }
+                )
+        self.insert(Task, rows)
+
+        test_ids: list[int] = [row["id"] for row in rows[::3]]
+        self.insert(Test, [{"id": test_id} for test_id in test_ids])
+        kinds: list[QuestionKind] = list(QuestionKind)
+        self.insert(
+            Question,
+            [
+                {
+                    "text": f"Question {index} of {test_id}",
+                    "kind": self.random.choice(kinds),
+                    "test_id": test_id,
+                }
+                for test_id in test_ids
+                for index in range(self.size.questions)
+            ],
+        )
+        TaskCounter.recompute()  # rows are inserted without the counters
+
+    def generate_content(self, members: IdsByCommunity) -> None:
+        self.insert(
+            Post,
+            [
+                {
+                    "title": self.name(index),
+                    "description": f"Post {index} of {community_id}",
+                    "user_id": user_ids[0],
+                    "community_id": community_id,
+                }
+                for community_id, user_ids in members.items()
+                for index in range(self.size.posts)
+            ],
+        )
+        self.insert(
+            ChatMessage,
+            [
+                {
+                    "content": f"Message {index} in {self.name(index)}",
+                    "community_id": community_id,
+                    "sender_id": self.random.choice(user_ids),
+                }
+                for community_id, user_ids in members.items()
+                for index in range(self.size.messages)
+            ],
+        )
+
+    def generate(self) -> dict[str, int]:
+        """:return: the number of inserted rows by table name"""
+        user_ids = self.generate_users()
+        self.generate_files(user_ids)
+        self.generate_invites()
+
+        members, participants = self.generate_communities(user_ids)
+        roles = self.generate_roles(participants)
+        self.generate_invitations(roles)
+        self.generate_tasks(members)
+        self.generate_content(members)
+        self.sync_sequences()
+        db.session.commit()
+        return self.counts
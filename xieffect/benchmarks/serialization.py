@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Any
+
+from flask_fullstack.siox.eventor import CustomJSON
+
+from common import dump_json_bytes, SocketJSON
+from communities.tasks.tests_db import QuestionKind
+
+Payload = Any
+
+STARTED: datetime = datetime(2023, 9, 1, 12)  # noqa: WPS432
+
+
+def task_entry(index: int) -> dict[str, Any]:
+    """As `Task.FullModel` after marshalling, but datetimes are left for SIO"""
+    created = STARTED + timedelta(hours=index)
+    return {
+        "id": index,
+        "page-id": index,
+        "name": f"Task #{index}",
+        "description": "Read the chapter & answer the questions " * 4,
+        "opened": created + timedelta(days=1),
+        "closed": None if index % 3 else created + timedelta(days=7),
+        "created": created,
+        "username": f"user-{index % 50}",
+        "files": [{"id": index * 3 + i, "filename": f"file-{i}.pdf"} for i in range(3)],
+    }
+
+
+def community_entry(index: int) -> dict[str, Any]:
+    """As `Community.IndexModel` after marshalling"""
+    return {
+        "id": index,
+        "name": f"Community #{index}",
+        "description": "Everything about the course, tasks & schedules " * 2,
+        "avatar": {"id": index, "filename": "avatar.webp"} if index % 2 else None,
+    }
+
+
+def question_entry(index: int) -> dict[str, Any]:
+    """SIO broadcasts contain enums as well"""
+    return {"id": index, "text": f"Question #{index}", "kind": QuestionKind.CHOICE}
+
+
+def stringify_dates(entry: dict[str, Any]) -> dict[str, Any]:
+    """REST payloads come marshalled, so dates are strings there"""
+    return {
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in entry.items()
+    }
+
+
+def collect_payloads() -> dict[str, Payload]:
+    tasks: list[dict[str, Any]] = [task_entry(index) for index in range(48)]
+    return {
+        "rest: tasks page (48)": {
+            "results": [stringify_dates(task) for task in tasks],
+            "has-next": True,
+        },
+        "rest: communities (100)": [community_entry(index) for index in range(100)],
+        "sio: new task": tasks[0],
+        "sio: questions (20)": [question_entry(index) for index in range(20)],
+    }
+
+
+def restx_dumps(payload: Payload) -> str:
+    """What restx did before, marshalled data has no special types"""
+    return json.dumps(payload)
+
+
+def time_function(
+    function: Callable[[Payload], Any], payload: Payload, repeats: int
+) -> float:
+    started: float = perf_counter()
+    for _ in range(repeats):
+        function(payload)
+    return (perf_counter() - started) / repeats * 1e6  # noqa: WPS432
+
+
+def compare_serializers(repeats: int) -> list[str]:
+    """:return: table rows, times are microseconds per payload"""
+    socket_json = SocketJSON()
+    rows: list[str] = [f"{'payload':<28}{'stdlib':>10}{'fast':>10}{'speedup':>10}"]
+    for name, payload in collect_payloads().items():
+        if name.startswith("sio"):
+            baseline = time_function(CustomJSON.dumps, payload, repeats)
+            fast = time_function(socket_json.dumps, payload, repeats)
+        else:
+            baseline = time_function(restx_dumps, payload, repeats)
+            fast = time_function(dump_json_bytes, payload, repeats)
+        rows.append(f"{name:<28}{baseline:>10.1f}{fast:>10.1f}{baseline / fast:>9.1f}x")
+    return rows
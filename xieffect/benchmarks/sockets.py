@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from random import Random
+from threading import Lock, Thread
+from time import perf_counter, sleep
+from typing import Any
+
+from flask_jwt_extended import create_access_token
+from socketio import Client
+from socketio.exceptions import SocketIOError
+
+from benchmarks.reports import percentile
+
+ACK_TIMEOUT: float = 10  # seconds, an ack that took longer counts as an error
+GRACE_PERIOD: float = 2  # seconds to wait for broadcasts after the run
+THINK_TIME: float = 1  # mean pause between events of one client, seconds
+CHAT_LIMIT: int = 50  # `PARTICIPANT_LIMIT` of the videochat
+MESSAGE_SHARE: float = 0.7  # of events sent by chat participants, the rest are states
+
+
+def issue_token(user_id: int) -> str:
+    """Same token as after `/signin/`, but without hashing & throttling"""
+    return create_access_token(identity={"": user_id})
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    if not samples:
+        return {"count": 0}
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "p50": percentile(samples, 50),
+        "p90": percentile(samples, 90),
+        "p99": percentile(samples, 99),
+        "max": samples[-1],
+    }
+
+
+class LoadStats:  # noqa: WPS230
+    """Shared by all clients, latencies are in milliseconds"""
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.acks: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.sent: dict[str, float] = {}  # broadcast tag -> `perf_counter`
+        self.fanout: list[float] = []
+        self.expected: int = 0
+        self.received: int = 0
+
+    def record_ack(self, event_name: str, started: float, ack: Any) -> None:
+        elapsed: float = (perf_counter() - started) * 1000
+        with self.lock:
+            if isinstance(ack, dict) and ack.get("code") == 200:
+                self.acks[event_name].append(elapsed)
+            else:
+                self.errors[event_name] += 1
+
+    def record_error(self, event_name: str) -> None:
+        with self.lock:
+            self.errors[event_name] += 1
+
+    def record_broadcast(self, tag: str, started: float, receivers: int) -> None:
+        with self.lock:
+            self.sent[tag] = started
+            self.expected += receivers
+
+    def record_delivery(self, tag: str) -> None:
+        received: float = perf_counter()
+        with self.lock:
+            started: float | None = self.sent.get(tag)
+            if started is not None:
+                self.received += 1
+                self.fanout.append((received - started) * 1000)
+
+
+@dataclass()
+class LoadReport:
+    clients: int
+    chat_clients: int
+    duration: float
+    acks: dict[str, dict[str, float]]
+    errors: dict[str, int]
+    fanout: dict[str, float]
+    expected_deliveries: int
+    dropped_deliveries: int
+
+    @classmethod
+    def from_stats(cls, stats: LoadStats, **kwargs) -> LoadReport:
+        return cls(
+            acks={name: summarize(samples) for name, samples in stats.acks.items()},
+            errors=dict(stats.errors),
+            fanout=summarize(stats.fanout),
+            expected_deliveries=stats.expected,
+            dropped_deliveries=max(0, stats.expected - stats.received),
+            **kwargs,
+        )
+
+    @property
+    def loss_rate(self) -> float:
+        if self.expected_deliveries == 0:
+            return 0
+        return self.dropped_deliveries / self.expected_deliveries
+
+    def check(
+        self, max_ack_p90: float, max_fanout_p90: float, max_loss_rate: float = 0
+    ) -> list[str]:
+        """:return: descriptions of failed limits, empty if all passed"""
+        failures: list[str] = [
+            f"{name} ack p90 {summary['p90']:.1f}ms > {max_ack_p90}ms"
+            for name, summary in self.acks.items()
+            if summary.get("p90", 0) > max_ack_p90
+        ]
+        if self.fanout.get("p90", 0) > max_fanout_p90:
+            failures.append(
+                f"fan-out p90 {self.fanout['p90']:.1f}ms > {max_fanout_p90}ms"
+            )
+        if self.loss_rate > max_loss_rate:
+            failures.append(f"dropped {self.loss_rate:.2%} > {max_loss_rate:.2%}")
+        if any(self.errors.values()):
+            failures.append(f"errors: {self.errors}")
+        return failures
+
+    def to_json(self) -> dict[str, Any]:
+        return dict(asdict(self), loss_rate=self.loss_rate)
+
+
+class SimulatedClient:  # noqa: WPS230
+    """
+    One user with a real socketio connection. Joins the community room,
+    the chat room (if `in_chat`) & the tasks room (if `manager`), then sends
+    a random mix of events with exponentially distributed pauses in between
+    """
+
+    def __init__(  # noqa: WPS211
+        self,
+        index: int,
+        user_id: int,
+        community_id: int,
+        stats: LoadStats,
+        chat: set[int],
+        in_chat: bool = False,
+        manager: bool = False,
+        think_time: float = THINK_TIME,
+    ) -> None:
+        self.index: int = index
+        self.user_id: int = user_id
+        self.community_id: int = community_id
+        self.stats: LoadStats = stats
+        self.chat: set[int] = chat  # indexes of clients in the chat room
+        self.in_chat: bool = in_chat
+        self.manager: bool = manager
+        self.think_time: float = think_time
+        self.random = Random(index)
+        self.sent: int = 0
+        self.client = Client(reconnection=False)
+        self.client.on("send-message", self.on_message)
+
+    def on_message(self, data: dict[str, Any]) -> None:
+        content: str = data.get("content", "")
+        if content.startswith(f"load {self.index}/"):
+            return  # ignore own messages, if the server sends them back
+        if content.startswith("load "):
+            self.stats.record_delivery(content)
+
+    def call(self, event_name: str, **data: Any) -> Any:
+        started: float = perf_counter()
+        try:
+            ack = self.client.call(
+                event_name,
+                {
+                    "community-id": self.community_id,
+                    **{key.replace("_", "-"): value for key, value in data.items()},
+                },
+                timeout=ACK_TIMEOUT,
+            )
+        except SocketIOError:
+            self.stats.record_error(event_name)
+            return None
+        self.stats.record_ack(event_name, started, ack)
+        return ack
+
+    def connect(self, url: str) -> bool:
+        try:
+            self.client.connect(
+                url,
+                headers={"Cookie": f"access_token_cookie={issue_token(self.user_id)}"},
+            )
+        except SocketIOError:
+            self.stats.record_error("connect")
+            return False
+        return True
+
+    def join(self) -> None:
+        self.call("open-communities")
+        if self.manager:
+            self.call("open-tasks")
+        if self.in_chat:
+            ack = self.call("new-chat-participant", state={"microphone": False})
+            if isinstance(ack, dict) and ack.get("code") == 200:
+                self.chat.add(self.index)
+
+    def send_message(self) -> None:
+        self.sent += 1
+        tag: str = f"load {self.index}/{self.sent}"
+        receivers: int = len(self.chat) - 1  # the sender doesn't get it back
+        self.stats.record_broadcast(tag, perf_counter(), receivers)
+        self.call("send-message", content=tag)
+
+    def act(self) -> None:
+        if self.index in self.chat:
+            if self.random.random() < MESSAGE_SHARE:
+                self.send_message()
+            else:
+                state: bool = self.random.choice((True, False))
+                self.call("change-state", target="microphone", state=state)
+        else:  # re-entering the community, like switching between tabs
+            self.call("close-communities")
+            self.call("open-communities")
+
+    def run(self, deadline: float) -> None:
+        while perf_counter() < deadline:
+            sleep(self.random.expovariate(1 / self.think_time))
+            if not self.client.connected:
+                self.stats.record_error("disconnect")
+                return
+            self.act()
+
+    def leave(self) -> None:
+        if self.index in self.chat:
+            self.call("delete-chat-participant", participant_id=self.user_id)
+        self.client.disconnect()
+
+
+def run_in_threads(clients: list[SimulatedClient], method: str, *args) -> None:
+    threads = [Thread(target=getattr(client, method), args=args) for client in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def simulate_clients(  # noqa: WPS211
+    url: str,
+    community_id: int,
+    user_ids: list[int],
+    chat_clients: int,
+    duration: float,
+    think_time: float = THINK_TIME,
+) -> LoadReport:
+    """The first user should own the community, only it opens the tasks room"""
+    stats = LoadStats()
+    chat: set[int] = set()
+    clients: list[SimulatedClient] = [
+        SimulatedClient(
+            index=index,
+            user_id=user_id,
+            community_id=community_id,
+            stats=stats,
+            chat=chat,
+            in_chat=index < min(chat_clients, CHAT_LIMIT),
+            manager=index == 0,
+            think_time=think_time,
+        )
+        for index, user_id in enumerate(user_ids)
+    ]
+
+    connected = [client for client in clients if client.connect(url)]
+    run_in_threads(connected, "join")
+    run_in_threads(connected, "run", perf_counter() + duration)
+    sleep(GRACE_PERIOD)  # the last broadcasts might still be on their way
+    run_in_threads(connected, "leave")
+
+    return LoadReport.from_stats(
+        stats,
+        clients=len(connected),
+        chat_clients=len(chat),
+        duration=duration,
+    )
@@ -8,8 +8,9 @@ from ._core import (  # noqa: WPS436
     mail_initialized,
     JSONEncoder,
 )
-from ._eventor import EventController, EmptyBody  # noqa: WPS436
+from ._eventor import EventController, EmptyBody, SocketIO  # noqa: WPS436
 from ._files import open_file, absolute_path  # noqa: WPS436
+from ._json import dump_json_bytes, output_json, SocketJSON  # noqa: WPS436
 from ._marshals import message_response, success_response, ResponseDoc  # noqa: WPS436
 from ._restx import ResourceController  # noqa: WPS436
 from .consts import TEST_EMAIL, TEST_MOD_NAME, BASIC_PASS, TEST_PASS, TEST_INVITE_ID
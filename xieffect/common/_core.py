@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from json import dumps as dump_json, load as load_json, JSONEncoder as _JSONEncoder
+from json import load as load_json, JSONEncoder as _JSONEncoder
 from os import getenv
 from sys import modules
 from typing import Any
@@ -14,13 +14,16 @@ from flask_mail import Mail
 from pydantic_marshals.base import PatchDefault
 from sqlalchemy import MetaData, Table
 from sqlalchemy.orm import declarative_base
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 from ._files import absolute_path, open_file  # noqa: WPS436
+from ._json import dump_json_bytes, FastJSONProvider  # noqa: WPS436
+from .consts import PROXY_HOPS  # noqa: WPS436
 
 
 class Flask(_Flask):
     def return_error(self, code: int, message: str):
-        return Response(dump_json({"a": message}), code)
+        return Response(dump_json_bytes({"a": message}), code)
 
     def configure_jwt_with_loaders(self, *args, **kwargs) -> JWTManager:
         from users.users_db import BlockedToken
@@ -52,6 +55,8 @@ app.config["RESTX_INCLUDE_ALL_MODELS"] = True
 app.secrets_from_env("hope it's local")
 # TODO DI to use secrets in `URLSafeSerializer`s
 app.configure_cors()
+if PROXY_HOPS > 0:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=PROXY_HOPS)
 
 
 class JSONEncoder(_JSONEncoder):  # pragma: no cover
@@ -61,7 +66,7 @@ class JSONEncoder(_JSONEncoder):  # pragma: no cover
         return super().default(o)
 
 
-app.json_encoder = JSONEncoder
+app.json = FastJSONProvider(app)
 
 
 class DeclaredBase(CustomModel):
@@ -1,6 +1,20 @@
 from __future__ import annotations
 
-from flask_fullstack import EventController as _EventController, PydanticModel
+from collections import OrderedDict
+from typing import Any
+
+from flask_fullstack import (
+    EventController as _EventController,
+    PydanticModel,
+    ServerEvent,
+    SocketIO as _SocketIO,
+)
+from flask_fullstack.restx.marshals import v2_model_to_ffs
+from flask_fullstack.utils import restx_model_to_message
+from flask_restx import Model
+from pydantic import BaseModel
+
+from ._json import SocketJSON  # noqa: WPS436
 
 
 class EventController(_EventController):
@@ -8,6 +22,43 @@ class EventController(_EventController):
         kwargs["use_kebab_case"] = kwargs.get("use_kebab_case", True)
         super().__init__(*args, **kwargs)
 
+    def server_event(self, model: type[BaseModel], **kwargs: Any) -> ServerEvent:
+        """
+        Server-only event (emitted outside of client events), its model
+        is converted & bound (with kebab-case) same as by `mark_duplex`
+        """
+        ffs_model = v2_model_to_ffs(model)
+        self._maybe_bind_model(ffs_model)
+        return self.ServerEvent(ffs_model, **kwargs)
+
 
 class EmptyBody(PydanticModel):
     pass
+
+
+class SocketIO(_SocketIO):
+    """
+    Converts restx models into AsyncAPI messages on the first `docs` call
+    instead of on import, so workers & commands that never serve the docs
+    don't pay for it. Models added to `restx_models` later are included too
+    """
+
+    def __init__(self, *args, restx_models: dict[str, Model], **kwargs) -> None:
+        self.restx_models: dict[str, Model] | None = restx_models
+        kwargs.setdefault("json", SocketJSON())
+        super().__init__(*args, **kwargs)
+
+    def docs(self) -> dict[str, Any]:
+        if self.restx_models is not None:
+            components: dict[str, Any] = self.async_api["components"]
+            components["messages"] = OrderedDict(
+                [
+                    *(
+                        (name, restx_model_to_message(name, model))
+                        for name, model in self.restx_models.items()
+                    ),
+                    *components["messages"].items(),  # from event groups
+                ]
+            )
+            self.restx_models = None
+        return super().docs()
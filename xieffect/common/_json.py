@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+from typing import Any
+
+from flask import make_response, Response
+from flask.json.provider import DefaultJSONProvider
+from flask_fullstack import TypeEnum
+from pydantic import BaseModel
+from pydantic.v1 import BaseModel as BaseModelV1
+from pydantic_marshals.base import PatchDefault
+
+from .consts import FAST_JSON_ENABLED  # noqa: WPS436
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+USE_ORJSON: bool = orjson is not None and FAST_JSON_ENABLED
+PLAIN_TYPES = (str, int, float, type(None))  # noqa: WPS465
+
+
+def default(value: Any) -> Any:
+    """For types, that neither backend serializes the way the API expects"""
+    if value is PatchDefault or value is PatchDefault.value:  # orjson sends `.value`
+        return None
+    if isinstance(value, TypeEnum):
+        return value.to_string()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    if isinstance(value, BaseModelV1):
+        return value.dict(by_alias=True)
+    if isinstance(value, date):  # orjson does datetimes on its own
+        return value.isoformat()
+    raise TypeError(f"Type {type(value)} is not JSON serializable")
+
+
+def replace_enums(value: Any) -> Any:
+    """orjson serializes enums by value without calling `default`"""
+    if isinstance(value, dict):
+        return {
+            key: item if isinstance(item, PLAIN_TYPES) else replace_enums(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [
+            item if isinstance(item, PLAIN_TYPES) else replace_enums(item)
+            for item in value
+        ]
+    if isinstance(value, TypeEnum):
+        return value.to_string()
+    return value
+
+
+def dump_json_bytes(value: Any, indent: bool = False) -> bytes:
+    """Doesn't replace enums, which don't get past marshalling in REST"""
+    if USE_ORJSON:
+        option: int = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(value, default=default, option=option)
+    return json.dumps(  # pragma: no cover
+        value, default=default, ensure_ascii=False, indent=2 if indent else None
+    ).encode("utf-8")
+
+
+def parse_json(data: str | bytes) -> Any:
+    if USE_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)  # pragma: no cover
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask's `app.json`, used by `jsonify`, the test client & request parsing"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dump_json_bytes(obj, indent="indent" in kwargs).decode("utf-8")
+
+    def loads(self, s: str | bytes, **_: Any) -> Any:
+        return parse_json(s)
+
+
+class SocketJSON:
+    """The `json` module for python-socketio, payloads might contain enums"""
+
+    def dumps(self, value: Any, **_: Any) -> str:
+        if USE_ORJSON:
+            value = replace_enums(value)
+        return dump_json_bytes(value).decode("utf-8")
+
+    def loads(self, data: str | bytes, **_: Any) -> Any:
+        return parse_json(data)
+
+
+def output_json(data: Any, code: int, headers: dict | None = None) -> Response:
+    """Replaces restx's representation, which uses the stdlib encoder"""
+    response = make_response(dump_json_bytes(data), code)
+    response.headers.extend(headers or {})
+    return response
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Hashable
 from functools import wraps
+from hashlib import sha256
 
+from flask import request, Response
 from flask_fullstack import ResourceController as _ResourceController
 from flask_restx import abort as default_abort
+from flask_restx.utils import unpack
+from werkzeug.http import quote_etag
 
 from ._marshals import success_response, message_response, ResponseDoc  # noqa: WPS436
+from .caching import cache  # noqa: WPS436
+from .consts import CACHE_ENABLED  # noqa: WPS436
+from .throttling import abort_throttled, limiter, RateLimit  # noqa: WPS436
 
 
 class ResourceController(_ResourceController):
@@ -44,3 +52,81 @@ class ResourceController(_ResourceController):
             return a_response_inner
 
         return a_response_wrapper
+
+    def throttle(self, *limits: RateLimit):
+        """
+        - Rejects requests over any of the limits with 429 and `Retry-After`
+        - Place it above other decorators to reject before any DB work,
+          except for limits that need the ``user`` from ``jwt_authorizer``
+        """
+
+        def throttle_wrapper(function):
+            @self.doc_abort(429, "Too many requests")
+            @wraps(function)
+            def throttle_inner(*args, **kwargs):
+                retry_after: float = limiter.check(limits, kwargs)
+                if retry_after > 0:
+                    abort_throttled(retry_after)
+                return function(*args, **kwargs)
+
+            return throttle_inner
+
+        return throttle_wrapper
+
+    def conditional(self, validator: Callable[..., Hashable | None]):
+        """
+        - Adds an ETag to responses & answers 304 to matching ``If-None-Match``
+        - ``validator`` gets the same kwargs as the method and returns whatever
+          the response depends on (like ``changed`` timestamps), or None to skip
+        - Place it under authorizers & searchers, but above marshalling,
+          so that 304s are sent before relationships are loaded or serialized
+        """
+
+        def conditional_wrapper(function):
+            @self.response(304, "Not modified")
+            @wraps(function)
+            def conditional_inner(*args, **kwargs):
+                version: Hashable | None = validator(**kwargs)
+                if version is None:
+                    return function(*args, **kwargs)
+
+                etag: str = sha256(repr(version).encode("utf-8")).hexdigest()[:32]
+                headers = {
+                    "ETag": quote_etag(etag, weak=True),  # compression keeps it
+                    "Cache-Control": "private, no-cache",
+                }
+                if request.if_none_match.contains_weak(etag):
+                    return Response(status=304, headers=headers)
+
+                data, code, original_headers = unpack(function(*args, **kwargs))
+                return data, code, dict(original_headers or {}, **headers)
+
+            return conditional_inner
+
+        return conditional_wrapper
+
+    def cached(self, tags: Callable[..., list[str]], ttl: float | None = None):
+        """
+        - Keeps marshalled results in the cache, so place it above marshalling
+        - ``tags`` gets the same kwargs as the method and returns tags,
+          which identify the result (like ``community:<id>``). Entries are
+          dropped after commits that change any of the tagged rows
+        """
+
+        def cached_wrapper(function):
+            if not CACHE_ENABLED:  # pragma: no cover
+                return function
+
+            @wraps(function)
+            def cached_inner(*args, **kwargs):
+                entry_tags: tuple[str, ...] = tuple(tags(**kwargs))
+                return cache.get_or_create(
+                    f"{function.__qualname__}:{'|'.join(entry_tags)}",
+                    entry_tags,
+                    lambda: function(*args, **kwargs),
+                    ttl,
+                )
+
+            return cached_inner
+
+        return cached_wrapper
@@ -42,6 +42,22 @@ class SoftDeletable(Base):  # TODO pragma: no coverage
         return cls.select_by_kwargs(deleted=None)
 
 
+class Versioned(Base):
+    """
+    Rows with a ``changed`` timestamp, which works as a version for ETags.
+    Changes only to related tables should ``touch`` the row explicitly
+    """
+
+    __abstract__ = True
+
+    changed = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    def touch(self) -> None:
+        self.changed = datetime.utcnow()  # noqa: WPS601
+
+
 class LinkedListNode(Base):
     __abstract__ = True
 
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from itertools import chain
+from math import ceil
+from threading import Lock
+from time import time
+from typing import Any, Protocol
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from common.consts import CACHE_MAX_ENTRIES, CACHE_REDIS_URL, CACHE_TTL
+
+try:
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+PENDING_TAGS_KEY: str = "cache-tags"
+INVALIDATIONS_LIMIT: int = 10000
+
+Tags = tuple[str, ...]
+
+
+class InvalidationBackend(Protocol):
+    def latest(self, tags: Tags) -> float:
+        """:return: time of the latest invalidation of any of the tags or 0"""
+
+    def invalidate(self, tags: Iterable[str], now: float) -> None:
+        pass
+
+
+class MemoryInvalidations:
+    """
+    Invalidations of this process only, enough for a single worker. Tags are
+    kept oldest first & at most `max_tags` of them: on overflow, the oldest
+    ones are evicted & everything cached before them is treated as stale
+    """
+
+    def __init__(self, ttl: float, max_tags: int = INVALIDATIONS_LIMIT) -> None:
+        self.ttl: float = ttl
+        self.max_tags: int = max_tags
+        self.times: OrderedDict[str, float] = OrderedDict()
+        self.floor: float = 0  # time of the latest evicted invalidation
+        self.lock = Lock()
+
+    def latest(self, tags: Tags) -> float:
+        if not tags:
+            return 0
+        return max(self.floor, *(self.times.get(tag, 0) for tag in tags))
+
+    def prune(self, now: float) -> None:
+        """Entries older than any ttl are gone, so are their invalidations"""
+        while self.times and next(iter(self.times.values())) <= now - self.ttl:
+            self.times.popitem(last=False)
+        while len(self.times) > self.max_tags:
+            _, invalidated = self.times.popitem(last=False)
+            self.floor = max(self.floor, invalidated)
+
+    def invalidate(self, tags: Iterable[str], now: float) -> None:
+        with self.lock:
+            for tag in tags:
+                self.times[tag] = now
+                self.times.move_to_end(tag)
+            self.prune(now)
+
+
+class RedisInvalidations:
+    """Invalidations shared by all workers, expire together with the entries"""
+
+    def __init__(self, client: Any, ttl: float, prefix: str = "cache-tag:") -> None:
+        self.client = client
+        self.ttl: int = ceil(ttl)
+        self.prefix: str = prefix
+
+    @classmethod
+    def from_url(cls, url: str, ttl: float) -> RedisInvalidations:
+        if redis is None:  # pragma: no cover
+            raise RuntimeError("CACHE_REDIS_URL is set, but redis is not installed")
+        return cls(redis.Redis.from_url(url), ttl)
+
+    def latest(self, tags: Tags) -> float:
+        if not tags:
+            return 0
+        values = self.client.mget([f"{self.prefix}{tag}" for tag in tags])
+        return max((float(value) for value in values if value is not None), default=0)
+
+    def invalidate(self, tags: Iterable[str], now: float) -> None:
+        pipeline = self.client.pipeline()
+        for tag in tags:
+            pipeline.set(f"{self.prefix}{tag}", now, ex=self.ttl)
+        pipeline.execute()
+
+
+@dataclass()
+class CacheEntry:
+    value: Any
+    tags: Tags
+    created: float
+    expires: float
+
+
+class Cache:
+    """
+    LRU of values with tags & TTL. Entries, whose tags were invalidated
+    after the entry started being created, are never returned
+    """
+
+    def __init__(
+        self,
+        invalidations: InvalidationBackend,
+        ttl: float,
+        max_entries: int = CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.invalidations: InvalidationBackend = invalidations
+        self.ttl: float = ttl
+        self.max_entries: int = max_entries
+        self.entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.lock = Lock()
+        self.stats: Counter[str] = Counter()  # hits & misses
+
+    def lookup(self, key: str, now: float) -> CacheEntry | None:
+        with self.lock:
+            entry: CacheEntry | None = self.entries.get(key)
+        if entry is None:
+            return None
+        fresh: bool = entry.expires > now
+        if fresh and self.invalidations.latest(entry.tags) < entry.created:
+            with self.lock:
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+            return entry
+        with self.lock:
+            self.entries.pop(key, None)
+        return None
+
+    def store(self, key: str, entry: CacheEntry) -> None:
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get_or_create(
+        self,
+        key: str,
+        tags: Tags,
+        create: Callable[[], Any],
+        ttl: float | None = None,
+    ) -> Any:
+        now: float = time()  # before creating, to notice invalidations meanwhile
+        entry: CacheEntry | None = self.lookup(key, now)
+        if entry is not None:
+            self.stats["hits"] += 1
+            return entry.value
+        self.stats["misses"] += 1
+        value = create()
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self.store(key, CacheEntry(value, tags, now, now + ttl))
+        return value
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        self.invalidations.invalidate(tags, time())
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+cache = Cache(
+    (
+        MemoryInvalidations(CACHE_TTL)
+        if CACHE_REDIS_URL is None
+        else RedisInvalidations.from_url(CACHE_REDIS_URL, CACHE_TTL)
+    ),
+    CACHE_TTL,
+)
+
+
+def row_tags(instance: Any) -> Iterator[str]:
+    """
+    ``<table>:<primary key>`` for each table of the row, plus model-specific
+    ones from the ``related_tags`` property (like ``roles:community:<id>``)
+    """
+    mapper = inspect(instance).mapper
+    primary_key: str = ":".join(
+        str(value) for value in mapper.primary_key_from_instance(instance)
+    )
+    yield from (f"{table.name}:{primary_key}" for table in mapper.tables)
+    yield from getattr(instance, "related_tags", ())
+
+
+def invalidate_after_commit(session: Session, *tags: str) -> None:
+    """For bulk statements, which only invalidate the whole ``<table>`` tag"""
+    session.info.setdefault(PENDING_TAGS_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, "after_flush")
+def collect_flushed_tags(session: Session, _: Any) -> None:
+    for instance in chain(session.new, session.dirty, session.deleted):
+        invalidate_after_commit(session, *row_tags(instance))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def collect_statement_tags(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        invalidate_after_commit(state.session, state.statement.table.name)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")  # in case something was cached
+def invalidate_pending(session: Session) -> None:
+    tags: set[str] | None = session.info.pop(PENDING_TAGS_KEY, None)
+    if tags:
+        cache.invalidate(tags)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+
+from flask import request, Response
+
+from common.consts import COMPRESSION_ENABLED, COMPRESSION_MIN_SIZE
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+GZIP_LEVEL: int = 6
+GZIP_WBITS: int = 31  # deflate with gzip header & trailer
+BROTLI_QUALITY: int = 4  # about as fast as gzip's 6, but smaller
+COMPRESSIBLE_TYPES: tuple[str, ...] = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+UNCOMPRESSED_STATUSES: frozenset[int] = frozenset((204, 206, 304))
+
+Compressor = tuple[Callable[[bytes], bytes], Callable[[], bytes]]
+
+
+def choose_encoding() -> str | None:
+    accepted = request.accept_encodings
+    if brotli is not None and accepted.quality("br") > 0:
+        return "br"
+    if accepted.quality("gzip") > 0:
+        return "gzip"
+    return None
+
+
+def create_compressor(encoding: str) -> Compressor:
+    """:return: functions to compress (and flush) a chunk & to finish the stream"""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return (
+            lambda chunk: compressor.process(chunk) + compressor.flush(),
+            compressor.finish,
+        )
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, GZIP_WBITS)
+    return (
+        lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH),
+        compressor.flush,
+    )
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """Flushes after every chunk, so that clients get data as soon as it's ready"""
+    compress_chunk, finish = create_compressor(encoding)
+    for chunk in chunks:
+        if chunk:
+            yield compress_chunk(chunk)
+    yield finish()
+
+
+def compress_data(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, GZIP_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def is_compressible(response: Response) -> bool:
+    if response.status_code < 200 or response.status_code in UNCOMPRESSED_STATUSES:
+        return False
+    return (
+        "Content-Encoding" not in response.headers
+        and not response.cache_control.no_transform
+        and response.mimetype.startswith(COMPRESSIBLE_TYPES)
+    )
+
+
+def compress_response(response: Response) -> Response:
+    """
+    Compresses text-like responses with brotli (if installed) or gzip.
+    Regular responses under `COMPRESSION_MIN_SIZE` are left as they are,
+    streamed ones are always compressed, as their size is unknown
+    """
+    if not COMPRESSION_ENABLED or not is_compressible(response):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding: str | None = choose_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.iter_encoded(), encoding)
+        response.direct_passthrough = False
+        response.headers.pop("Content-Length", None)
+    else:
+        data: bytes = response.get_data()
+        if len(data) < COMPRESSION_MIN_SIZE:
+            return response
+        response.set_data(compress_data(data, encoding))
+    response.content_encoding = encoding
+
+    etag, weak = response.get_etag()
+    if etag is not None and not weak:  # bytes differ from the original now
+        response.set_etag(etag, weak=True)
+    return response
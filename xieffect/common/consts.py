@@ -16,5 +16,42 @@ DISABLE_WEBHOOKS: bool = getenv("ENABLE_WEBHOOKS", "0") != "1"
 PRODUCTION_MODE: bool = getenv("PRODUCTION", "0") == "1"
 DATABASE_RESET: bool = getenv("DATABASE_RESET", "0") == "1"
 
+# Percentage of requests to profile automatically (0 disables sampling)
+PROFILING_SAMPLE_RATE: float = float(getenv("PROFILING_SAMPLE_RATE", "0"))
+
+# Password hashing cost & concurrency (changed rounds rehash passwords on login)
+PASSWORD_HASH_ROUNDS: int = int(getenv("PASSWORD_HASH_ROUNDS", "29000"))
+HASHING_WORKERS: int = int(getenv("HASHING_WORKERS", "2"))
+
+# Proxies in front of the server, their X-Forwarded-For is trusted for client
+# addresses (used by throttling). Opt-in, as clients can send the header too
+PROXY_HOPS: int = int(getenv("PROXY_HOPS", "0"))
+
+# Throttling of sensitive endpoints, backend is "memory" or "database" (shared)
+RATE_LIMITS_ENABLED: bool = getenv("RATE_LIMITS", "1") == "1"
+RATE_LIMITS_BACKEND: str = getenv("RATE_LIMITS_BACKEND", "memory")
+
+# Workers that don't serve API specs can skip building them (API_DOCS=0)
+API_DOCS_ENABLED: bool = getenv("API_DOCS", "1") == "1"
+
+# JSON through orjson, if it's installed (FAST_JSON=0 falls back to the stdlib)
+FAST_JSON_ENABLED: bool = getenv("FAST_JSON", "1") == "1"
+
+# Compression of text-like responses (COMPRESSION=0 leaves it to the proxy),
+# REST responses & polling payloads under the size are sent as they are
+COMPRESSION_ENABLED: bool = getenv("COMPRESSION", "1") == "1"
+COMPRESSION_MIN_SIZE: int = int(getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# Cache of read-heavy data, dropped after commits that change the tagged rows.
+# Entries are kept by each process, CACHE_REDIS_URL shares invalidations
+CACHE_ENABLED: bool = getenv("CACHE", "1") == "1"
+CACHE_TTL: int = int(getenv("CACHE_TTL", "300"))
+CACHE_MAX_ENTRIES: int = int(getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_REDIS_URL: str | None = getenv("CACHE_REDIS_URL")
+
+# Worker of the job queue inside the server, QUEUE_WORKER=0 if it's run
+# separately (`flask --app manage queue work`)
+QUEUE_WORKER_ENABLED: bool = getenv("QUEUE_WORKER", "1") == "1"
+
 # File limit for the embed tables
 FILES_LIMIT: int = 10
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from math import ceil
+from threading import Lock
+from time import time
+from typing import Any, Protocol
+
+from flask import request
+from werkzeug.exceptions import TooManyRequests
+
+from common._core import app  # noqa: WPS436
+from common.consts import RATE_LIMITS_BACKEND, RATE_LIMITS_ENABLED
+from common.throttling_db import DatabaseBackend
+
+MEMORY_BUCKETS_LIMIT: int = 10000
+
+KeyFunction = Callable[[dict[str, Any]], "str | None"]
+
+
+def ip_key(_: dict[str, Any]) -> str | None:
+    """Client's address, as forwarded by the trusted proxies (see `PROXY_HOPS`)"""
+    return request.remote_addr
+
+
+def email_key(kwargs: dict[str, Any]) -> str | None:
+    """Reads the body directly, so it works before the argument parser"""
+    email = kwargs.get("email")
+    if email is None:
+        email = (request.get_json(silent=True) or {}).get("email")
+    if email is None:
+        email = request.form.get("email")
+    return None if email is None else str(email).strip().lower()
+
+
+def user_key(kwargs: dict[str, Any]) -> str | None:
+    """Needs the user, so should be placed after `jwt_authorizer`"""
+    user = kwargs.get("user")
+    return None if user is None else str(user.id)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Token bucket: `capacity` requests at once, refilled fully in `period`"""
+
+    name: str
+    capacity: int
+    period: float  # seconds
+    key: KeyFunction = ip_key
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period
+
+    def refill(self, tokens: float, updated: float, now: float) -> float:
+        return min(self.capacity, tokens + (now - updated) * self.refill_rate)
+
+    def wait(self, tokens: float) -> float:
+        """:return: 0 if there is a token to take, otherwise seconds to wait for one"""
+        return 0 if tokens >= 1 else (1 - tokens) / self.refill_rate
+
+
+class RateLimitBackend(Protocol):
+    def peek(self, key: str, limit: RateLimit, now: float) -> float:
+        """Same as `consume`, but doesn't take the token"""
+
+    def consume(self, key: str, limit: RateLimit, now: float) -> float:
+        """:return: 0 if a token was taken, otherwise seconds to wait for one"""
+
+
+class MemoryBackend:
+    """Buckets of this process only, the cheapest option for a single worker"""
+
+    def __init__(self, max_buckets: int = MEMORY_BUCKETS_LIMIT) -> None:
+        self.max_buckets: int = max_buckets
+        self.buckets: dict[str, tuple[float, float, float]] = {}
+        self.lock = Lock()
+
+    def prune(self, now: float) -> None:
+        """Forgets buckets that are full again, as they are same as new ones"""
+        self.buckets = {
+            key: bucket for key, bucket in self.buckets.items() if bucket[2] > now
+        }
+
+    def find_tokens(self, key: str, limit: RateLimit, now: float) -> float:
+        tokens, updated, _ = self.buckets.get(key, (limit.capacity, now, now))
+        return limit.refill(tokens, updated, now)
+
+    def peek(self, key: str, limit: RateLimit, now: float) -> float:
+        with self.lock:
+            return limit.wait(self.find_tokens(key, limit, now))
+
+    def consume(self, key: str, limit: RateLimit, now: float) -> float:
+        with self.lock:
+            if len(self.buckets) >= self.max_buckets:
+                self.prune(now)
+            tokens: float = self.find_tokens(key, limit, now)
+            wait: float = limit.wait(tokens)
+            if wait == 0:
+                tokens -= 1
+            full_at: float = now + (limit.capacity - tokens) / limit.refill_rate
+            self.buckets[key] = tokens, now, full_at
+        return wait
+
+    def clear(self) -> None:
+        with self.lock:
+            self.buckets.clear()
+
+
+@dataclass()
+class RateLimitStats:
+    name: str
+    allowed: int = 0
+    rejected: int = 0
+
+
+class RateLimiter:
+    def __init__(self, backend: RateLimitBackend, enabled: bool = True) -> None:
+        self.backend: RateLimitBackend = backend
+        self.enabled: bool = enabled
+        self.stats: dict[str, RateLimitStats] = {}
+
+    def find_stats(self, limit: RateLimit) -> RateLimitStats:
+        return self.stats.setdefault(limit.name, RateLimitStats(limit.name))
+
+    def check(self, limits: tuple[RateLimit, ...], kwargs: dict[str, Any]) -> float:
+        """
+        All limits are checked before any tokens are taken, so a request
+        rejected by one of the limits doesn't use up the others
+
+        :return: seconds to wait if any of the limits is exceeded, else 0
+        """
+        if not self.enabled:
+            return 0
+        now: float = time()
+        buckets: list[tuple[RateLimit, str]] = []
+        for limit in limits:
+            key: str | None = limit.key(kwargs)
+            if key is not None:
+                buckets.append((limit, f"{limit.name}:{key}"))
+
+        for limit, bucket in buckets:
+            wait: float = self.backend.peek(bucket, limit, now)
+            if wait > 0:
+                self.find_stats(limit).rejected += 1
+                return wait
+
+        for limit, bucket in buckets:
+            wait = self.backend.consume(bucket, limit, now)
+            if wait > 0:  # the last tokens were taken concurrently
+                self.find_stats(limit).rejected += 1
+                return wait
+            self.find_stats(limit).allowed += 1
+        return 0
+
+
+def abort_throttled(retry_after: float) -> None:
+    error = TooManyRequests(retry_after=ceil(retry_after))
+    error.data = {"a": "Too many requests"}
+    raise error
+
+
+limiter = RateLimiter(
+    DatabaseBackend() if RATE_LIMITS_BACKEND == "database" else MemoryBackend(),
+    enabled=RATE_LIMITS_ENABLED and not app.testing,
+)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.sqltypes import String
+
+from common._core import Base, db  # noqa: WPS436
+
+if TYPE_CHECKING:
+    from common.throttling import RateLimit
+
+
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+
+    key: Mapped[str] = mapped_column(String(200), primary_key=True)
+    tokens: Mapped[float] = mapped_column()
+    updated: Mapped[float] = mapped_column()  # unix timestamp
+
+
+class DatabaseBackend:
+    """
+    Buckets shared by all workers & instances. Uses its own transaction,
+    so that consumed tokens are kept even if the request is rolled back
+    """
+
+    def peek(self, key: str, limit: RateLimit, now: float) -> float:
+        with db.engine.connect() as connection:
+            row = connection.execute(
+                select(RateLimitBucket.tokens, RateLimitBucket.updated).filter_by(
+                    key=key
+                )
+            ).first()
+        if row is None:
+            return 0
+        return limit.wait(limit.refill(row.tokens, row.updated, now))
+
+    def consume(self, key: str, limit: RateLimit, now: float) -> float:
+        with db.engine.begin() as connection:
+            row = connection.execute(
+                select(RateLimitBucket.tokens, RateLimitBucket.updated)
+                .filter_by(key=key)
+                .with_for_update()
+            ).first()
+            if row is None:
+                tokens: float = limit.capacity
+            else:
+                tokens = limit.refill(row.tokens, row.updated, now)
+
+            wait: float = limit.wait(tokens)
+            if wait == 0:
+                tokens -= 1
+
+            if row is None:
+                stmt = insert(RateLimitBucket).values(key=key)
+            else:
+                stmt = update(RateLimitBucket).filter_by(key=key)
+            try:
+                connection.execute(stmt.values(tokens=tokens, updated=now))
+            except IntegrityError:  # created concurrently, let this one pass
+                return 0
+        return wait
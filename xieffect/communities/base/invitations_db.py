@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+from collections import Counter
+from collections.abc import Iterable
 from datetime import datetime, timedelta
 from typing import Self, ClassVar
 
 from flask_fullstack import PydanticModel, Identifiable
-from itsdangerous import URLSafeSerializer
-from sqlalchemy import Column, select, ForeignKey, Index
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import Column, delete, func, select, ForeignKey, Index, or_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import relationship, selectinload
-from sqlalchemy.sql.functions import count
 from sqlalchemy.sql.sqltypes import Integer, DateTime, String
 
 from common import Base, db, app
+from common.caching import invalidate_after_commit
 from .meta_db import Community
 from .roles_db import Role
 
@@ -33,6 +38,50 @@ class InvitationRoles(Base):
         db.session.flush()
 
 
+class InvitationCounter(Base):
+    """Invitations per community, so that limiting them needs no ``COUNT(*)``"""
+
+    __tablename__ = "cs_invitation_counters"
+
+    community_id = Column(
+        Integer, ForeignKey(Community.id, ondelete="CASCADE"), primary_key=True
+    )
+    total = Column(Integer, nullable=False, default=0)
+
+    @classmethod
+    def find_total(cls, community_id: int) -> int:
+        total: int | None = db.get_first(
+            select(cls.total).filter_by(community_id=community_id)
+        )
+        return total or 0
+
+    @classmethod
+    def change(cls, community_id: int, difference: int) -> None:
+        """Upsert, so that concurrent changes don't overwrite each other"""
+        dialect_insert = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+        stmt = dialect_insert[db.engine.dialect.name](cls).values(
+            community_id=community_id, total=difference
+        )
+        db.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[cls.community_id],
+                set_={"total": cls.total + stmt.excluded.total},
+            )
+        )
+
+    @classmethod
+    def recompute(cls) -> None:
+        """Rebuilds all counters, for invitations inserted without them"""
+        totals: list[Row] = db.get_all_rows(
+            select(Invitation.community_id, func.count()).group_by(
+                Invitation.community_id
+            )
+        )
+        db.session.execute(delete(cls))
+        for community_id, total in totals:
+            cls.change(community_id, total)
+
+
 class Invitation(Base, Identifiable):
     __tablename__ = "cs_invitations"
     serializer: URLSafeSerializer = URLSafeSerializer(
@@ -51,7 +100,7 @@ class Invitation(Base, Identifiable):
     community = relationship("Community")
 
     roles = relationship("Role", secondary=InvitationRoles.__table__)
-    deadline = Column(DateTime, nullable=True)
+    deadline = Column(DateTime, nullable=True, index=True)
     limit = Column(Integer, nullable=True)
 
     __table_args__ = (
@@ -74,6 +123,7 @@ class Invitation(Base, Identifiable):
         limit: int | None,
         days_to_live: int | None,
     ) -> Self:
+        InvitationCounter.change(community_id, 1)
         entry: cls = super().create(
             community_id=community_id,
             limit=limit,
@@ -103,9 +153,26 @@ class Invitation(Base, Identifiable):
             limit,
         )
 
+    @classmethod
+    def decode_code(cls, code: str) -> tuple[int, int] | None:
+        """:return: community & invitation ids, None if the signature is bad"""
+        try:
+            community_id, invitation_id = cls.serializer.loads(code)
+        except (BadSignature, TypeError, ValueError):
+            return None
+        return community_id, invitation_id
+
+    @classmethod
+    def find_by_ids(cls, community_id: int, invitation_id: int) -> Self | None:
+        return db.get_first(
+            select(cls).filter_by(id=invitation_id, community_id=community_id)
+        )
+
     @classmethod
     def find_by_code(cls, code: str) -> Self | None:
-        return db.get_first(select(cls).filter_by(code=code))
+        """Looks up the primary key from the code, instead of the code itself"""
+        ids: tuple[int, int] | None = cls.decode_code(code)
+        return None if ids is None else cls.find_by_ids(*ids)
 
     def generate_code(self) -> str | bytes:
         return self.serializer.dumps((self.community_id, self.id))
@@ -116,8 +183,59 @@ class Invitation(Base, Identifiable):
     def is_invalid(self) -> bool:
         return not self.has_valid_deadline() or self.limit == 0
 
+    def redeem(self) -> bool:
+        """
+        Takes one use with ``UPDATE ... WHERE limit > 0``, so that concurrent
+        joins can't exceed the limit. Used up invitations are deleted,
+        unlimited ones are not updated at all (no contention on the row)
+        """
+        if self.limit is None:
+            return True
+        remaining: int | None = db.get_first(
+            update(Invitation)
+            .filter(Invitation.id == self.id, Invitation.limit > 0)
+            .values(limit=Invitation.limit - 1)
+            .returning(Invitation.limit)
+        )
+        if remaining == 0:
+            self.delete()
+        return remaining is not None
+
+    def delete(self) -> None:
+        InvitationCounter.change(self.community_id, -1)
+        super().delete()
+
     @classmethod
     def get_count_by_community(cls, community_id: int) -> int:
-        return db.get_first(
-            select(count()).select_from(cls).filter_by(community_id=community_id)
+        return InvitationCounter.find_total(community_id)
+
+    @classmethod
+    def find_expired(cls, limit: int) -> list[Row]:
+        """:return: ids & community ids of expired or used up invitations"""
+        return db.get_all_rows(
+            select(cls.id, cls.community_id)
+            .filter(or_(cls.deadline < datetime.utcnow(), cls.limit == 0))
+            .order_by(cls.id)
+            .limit(limit)
+        )
+
+    @classmethod
+    def delete_bulk(cls, ids: Iterable[int]) -> list[Row]:
+        """
+        Counters are updated only for actually deleted invitations,
+        in case some were deleted concurrently
+        :return: ids & community ids of deleted invitations
+        """
+        deleted: list[Row] = db.get_all_rows(
+            delete(cls)
+            .filter(cls.id.in_(list(ids)))
+            .returning(cls.id, cls.community_id)
+        )
+        counts = Counter(row.community_id for row in deleted)
+        for community_id, difference in counts.items():
+            InvitationCounter.change(community_id, -difference)
+        # bulk statements only invalidate the whole table by themselves
+        invalidate_after_commit(
+            db.session, *(f"cs_invitations:{row.id}" for row in deleted)
         )
+        return deleted
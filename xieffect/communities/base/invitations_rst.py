@@ -7,6 +7,7 @@ from flask_fullstack.restx.marshals import v2_model_to_ffs
 from flask_restx import Resource
 
 from common import ResourceController
+from common.caching import cache
 from communities.base.invitations_db import Invitation
 from communities.base.meta_db import Community, Participant
 from communities.base.meta_sio import CommunitiesEventSpace
@@ -16,6 +17,7 @@ from users.users_db import User
 
 controller = ResourceController("communities-invitation", path="/communities/")
 INVITATIONS_PER_REQUEST = 20
+PREVIEW_TTL: int = 30  # seconds, joining checks the deadline again anyway
 
 
 @controller.route("/<int:community_id>/invitations/")
@@ -77,16 +79,56 @@ class InvitePreview(PydanticModel):
     community: CommunityIndexModel = None
 
 
+def build_preview(
+    community_id: int, invitation_id: int
+) -> tuple[CommunityIndexModel, bool] | None:
+    """:return: community's preview & whether the invitation can be used"""
+    invitation: Invitation | None = Invitation.find_by_ids(community_id, invitation_id)
+    if invitation is None:
+        return None
+    return (
+        CommunityIndexModel.convert(invitation.community),
+        not invitation.is_invalid(),
+    )
+
+
+def find_preview(
+    community_id: int, invitation_id: int
+) -> tuple[CommunityIndexModel, bool] | None:
+    """Cached, as links shared with a whole class are opened all at once"""
+    return cache.get_or_create(
+        f"invitation-preview:{community_id}:{invitation_id}",
+        (f"cs_invitations:{invitation_id}", f"community:{community_id}"),
+        lambda: build_preview(community_id, invitation_id),
+        PREVIEW_TTL,
+    )
+
+
 @controller.route("/join/<code>/")
 class InvitationJoin(Resource):
+    @controller.doc_abort("400 ", "Invalid invitation")
     @controller.jwt_authorizer(User, optional=True)
-    @check_invitation()
     @controller.marshal_with(InvitePreview)
-    def get(self, user: User, invitation: Invitation | None, community: Community):
+    def get(self, user: User | None, code: str):
+        ids: tuple[int, int] | None = Invitation.decode_code(code)
+        preview = None if ids is None else find_preview(*ids)
+        if preview is None:
+            controller.abort(400, "Invalid invitation")
+
+        community_id, invitation_id = ids
+        community, usable = preview
+        joined: bool = (
+            user is not None
+            and Participant.find_by_ids(community_id, user.id) is not None
+        )
+        if not joined and not usable:  # same as in `check_invitation`
+            Invitation.delete_bulk([invitation_id])
+            controller.abort(400, "Invalid invitation")
+
         return InvitePreview(
-            joined=invitation is None,
+            joined=joined,
             authorized=user is not None,
-            community=CommunityIndexModel.convert(community),
+            community=community,
         )
 
     @controller.doc_abort(400, "User has already joined")
@@ -96,19 +138,16 @@ class InvitationJoin(Resource):
     def post(self, user: User, invitation: Invitation | None, community: Community):
         if invitation is None:
             controller.abort(400, "User has already joined")
+        role_ids: list[int] = [role.id for role in invitation.roles]
+        if not invitation.redeem():  # used up by concurrent joins
+            controller.abort(400, "Invalid invitation")
+
         participant = Participant.add(
             list_id=user.id,
             user_id=user.id,
             community_id=community.id,
         )
-        ParticipantRole.create_bulk(
-            participant_id=participant.id,
-            role_ids=[role.id for role in invitation.roles],
-        )
-        if invitation.limit == 1:
-            invitation.delete()
-        elif invitation.limit is not None:
-            invitation.limit -= 1
+        ParticipantRole.create_bulk(participant_id=participant.id, role_ids=role_ids)
 
         CommunitiesEventSpace.new_community.emit_convert(
             community, include_self=True, user_id=user.id
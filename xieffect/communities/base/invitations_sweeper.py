@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from sqlalchemy import Row
+
+from common import db
+from other.scheduler import IntervalTrigger, scheduler
+from .invitations_db import Invitation
+from .invitations_sio import InvitationsEventSpace
+
+SWEEP_BATCH_SIZE: int = 100
+SWEEP_INTERVAL: float = 60  # seconds between sweeps
+
+
+def sweep_invitations(limit: int = SWEEP_BATCH_SIZE) -> int:
+    """
+    Deletes a batch of expired & used up invitations, notifying
+    the rooms of their communities, as with manual deletion
+    :return: the number of deleted invitations
+    """
+    expired: list[Row] = Invitation.find_expired(limit)
+    if len(expired) == 0:
+        return 0
+    deleted: list[Row] = Invitation.delete_bulk(row.id for row in expired)
+    db.session.commit()
+
+    for invitation_id, community_id in deleted:
+        InvitationsEventSpace.delete_invite.emit_convert(  # outside of requests
+            room=InvitationsEventSpace.room_name(community_id),
+            namespace="/",
+            include_self=True,
+            community_id=community_id,
+            invitation_id=invitation_id,
+        )
+    return len(expired)
+
+
+@scheduler.job("invitation-sweeper", IntervalTrigger(SWEEP_INTERVAL))
+def sweep_all_invitations(batch_size: int = SWEEP_BATCH_SIZE) -> None:
+    swept: int = sweep_invitations(batch_size)
+    while swept == batch_size:
+        swept = sweep_invitations(batch_size)
@@ -9,7 +9,7 @@ from sqlalchemy.orm import aliased, relationship, selectinload, Mapped, mapped_c
 from sqlalchemy.sql.sqltypes import String, Text
 
 from common import db
-from common.abstract import SoftDeletable, LinkedListNode
+from common.abstract import SoftDeletable, LinkedListNode, Versioned
 from communities.base.roles_db import (
     ParticipantRole,
     Role,
@@ -19,7 +19,7 @@ from communities.base.roles_db import (
 from vault.files_db import File
 
 
-class Community(SoftDeletable, Identifiable):
+class Community(SoftDeletable, Versioned, Identifiable):
     __tablename__ = "community"
     not_found_text = "Community not found"
 
@@ -5,6 +5,7 @@ from flask_restx import Resource
 
 from common import ResourceController
 from communities.base.meta_db import Community, Participant
+from communities.base.roles_db import ParticipantRole, Role
 from communities.base.utils import check_participant
 
 controller = ResourceController(
@@ -13,9 +14,29 @@ controller = ResourceController(
 )
 
 
+def participant_version(participant: Participant) -> tuple:
+    """Permissions depend on the owner (community), roles & their permissions"""
+    return (
+        participant.id,
+        participant.community.changed,
+        ParticipantRole.get_role_ids(participant.id),
+        Role.get_version(participant.community_id),
+    )
+
+
+def participant_tags(participant: Participant) -> list[str]:
+    return [
+        f"community:{participant.community_id}",
+        f"community_participant:{participant.id}",
+        f"roles:community:{participant.community_id}",
+    ]
+
+
 @controller.route("/")
 class CommunityReader(Resource):
     @check_participant(controller, use_participant=True, use_community=False)
+    @controller.conditional(participant_version)
+    @controller.cached(participant_tags)
     @controller.marshal_with(Participant.IndexModel)
     def get(self, participant: Participant) -> Participant:
         return participant
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
+from datetime import datetime
 from typing import Self, ClassVar
 
 from flask_fullstack import Identifiable, TypeEnum
@@ -8,10 +9,12 @@ from pydantic_marshals.sqlalchemy import MappedModel
 from sqlalchemy import ForeignKey, select, distinct
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.sql.expression import and_
-from sqlalchemy.sql.functions import count
+from sqlalchemy.sql.functions import count, max as max_
 from sqlalchemy.sql.sqltypes import String
 
 from common import Base, db
+from common.abstract import Versioned
+from common.caching import invalidate_after_commit
 
 
 class PermissionType(TypeEnum):
@@ -24,7 +27,7 @@ class PermissionType(TypeEnum):
     MANAGE_PARTICIPANTS = 5
 
 
-class Role(Base, Identifiable):
+class Role(Versioned, Identifiable):
     __tablename__ = "cs_roles"
     max_count: ClassVar[int] = 50
     not_found_text = "Role not found"
@@ -48,6 +51,10 @@ class Role(Base, Identifiable):
     IndexModel = CreateModel.extend(columns=[id])
     FullModel = IndexModel.extend(properties=[permissions])
 
+    @property
+    def related_tags(self) -> list[str]:
+        return [f"roles:community:{self.community_id}"]
+
     @classmethod
     def create(
         cls,
@@ -73,6 +80,17 @@ class Role(Base, Identifiable):
     def get_count_by_community(cls, community_id: int) -> int:
         return db.get_first(select(count(cls.id)).filter_by(community_id=community_id))
 
+    @classmethod
+    def get_version(cls, community_id: int) -> tuple[int, datetime | None]:
+        """Count is included, as deleting a role doesn't update the others"""
+        return tuple(
+            db.session.execute(
+                select(count(cls.id), max_(cls.changed)).filter_by(
+                    community_id=community_id
+                )
+            ).one()
+        )
+
 
 class RolePermission(Base):
     __tablename__ = "cs_role_permissions"
@@ -116,6 +134,10 @@ class ParticipantRole(Base):
         primary_key=True,
     )
 
+    @property
+    def related_tags(self) -> list[str]:
+        return [f"community_participant:{self.participant_id}"]
+
     @classmethod
     def deny_permission(cls, participant_id: int, permission: PermissionType) -> bool:
         return (
@@ -149,3 +171,4 @@ class ParticipantRole(Base):
                 cls.participant_id == participant_id, cls.role_id.in_(role_ids)
             )
         )
+        invalidate_after_commit(db.session, f"community_participant:{participant_id}")
@@ -15,6 +15,8 @@ controller = ResourceController(
 @controller.route("/")
 class RolesLister(Resource):
     @check_participant(controller)
+    @controller.conditional(lambda community: Role.get_version(community.id))
+    @controller.cached(lambda community: [f"roles:community:{community.id}"])
     @controller.marshal_list_with(Role.FullModel)
     def get(self, community: Community):
         return Role.find_by_community(community_id=community.id)
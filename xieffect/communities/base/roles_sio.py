@@ -115,6 +115,7 @@ class RolesEventSpace(EventSpace):
                 role_id=role.id,
                 permissions=list(received_permissions - permissions_from_db),
             )
+            role.touch()
 
         event.emit_convert(role, self.room_name(community.id))
         return role
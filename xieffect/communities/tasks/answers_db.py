@@ -0,0 +1,327 @@
+"""
+Answers of students to tests & their grading. Tests are graded when they close
+(or on demand) by the ``grade-test`` queue job, which compiles the answer key
+once & goes through submissions in batches, committing after each one
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Self
+
+from pydantic_marshals.sqlalchemy import MappedModel
+from sqlalchemy import and_, bindparam, case, ForeignKey, func, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import foreign, Mapped, mapped_column, relationship
+from sqlalchemy.sql.sqltypes import Text
+
+from common import Base, db
+from communities.tasks.tests_db import Question, QuestionKind, Test
+from other.task_queue import enqueue, handler
+
+GRADING_BATCH_SIZE: int = 100  # submissions graded & committed together
+SUBMISSIONS_PER_PAGE: int = 48
+
+Normalized = str | frozenset[str]
+
+
+class Answer(Base):
+    __tablename__ = "cs_answers"
+
+    question_id: Mapped[int] = mapped_column(
+        ForeignKey("cs_questions.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    test_id: Mapped[int] = mapped_column(
+        ForeignKey("cs_tests.id", ondelete="CASCADE"),
+        index=True,
+    )
+    content: Mapped[str] = mapped_column(Text)
+    # None until graded & for questions without an answer key (detailed)
+    correct: Mapped[bool | None] = mapped_column()
+
+    BaseModel = MappedModel.create(columns=[question_id, content])
+    FullModel = BaseModel.extend(columns=[correct])
+
+    @classmethod
+    def update_bulk(cls, answers: list[dict[str, Any]]) -> None:
+        """Updates by ``question_id`` & ``user_id``, other keys set the columns"""
+        if len(answers) != 0:
+            db.session.execute(update(cls), answers)
+
+    @classmethod
+    def find_by_users(cls, test_id: int, user_ids: list[int]) -> list[Row]:
+        return db.get_all_rows(
+            select(cls.question_id, cls.user_id, cls.content).filter(
+                cls.test_id == test_id, cls.user_id.in_(user_ids)
+            )
+        )
+
+
+class Submission(Base):
+    """Answers of one student to a test, any change resets the grading"""
+
+    __tablename__ = "cs_submissions"
+
+    test_id: Mapped[int] = mapped_column(
+        ForeignKey("cs_tests.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    submitted: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    graded: Mapped[datetime | None] = mapped_column()
+    score: Mapped[int | None] = mapped_column()  # number of correct answers
+
+    answers: Mapped[list[Answer]] = relationship(
+        primaryjoin=and_(
+            test_id == foreign(Answer.test_id),
+            user_id == foreign(Answer.user_id),
+        ),
+        viewonly=True,
+    )
+
+    IndexModel = MappedModel.create(columns=[user_id, submitted, graded, score])
+    FullModel = IndexModel.extend(relationships=[(answers, Answer.FullModel)])
+
+    @classmethod
+    def find_by_ids(cls, test_id: int, user_id: int) -> Self | None:
+        return cls.find_first_by_kwargs(test_id=test_id, user_id=user_id)
+
+    @classmethod
+    def submit(cls, test_id: int, user_id: int, answers: dict[int, str]) -> Self:
+        """Upserts answers by question ids & the submission in two statements"""
+        dialect_insert = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+        insert = dialect_insert[db.engine.dialect.name]
+        now: datetime = datetime.utcnow()
+
+        if len(answers) != 0:
+            answers_stmt = insert(Answer)
+            db.session.execute(
+                answers_stmt.on_conflict_do_update(
+                    index_elements=[Answer.question_id, Answer.user_id],
+                    set_={"content": answers_stmt.excluded.content, "correct": None},
+                ),
+                [
+                    {
+                        "question_id": question_id,
+                        "user_id": user_id,
+                        "test_id": test_id,
+                        "content": content,
+                    }
+                    for question_id, content in answers.items()
+                ],
+            )
+        db.session.execute(
+            insert(cls)
+            .values(test_id=test_id, user_id=user_id, submitted=now)
+            .on_conflict_do_update(
+                index_elements=[cls.test_id, cls.user_id],
+                set_={"submitted": now, "graded": None, "score": None},
+            )
+        )
+        db.session.expire_all()  # answers & the submission could be loaded
+        return cls.find_by_ids(test_id, user_id)
+
+    @classmethod
+    def find_paginated_by_test(
+        cls, test_id: int, offset: int, limit: int
+    ) -> list[Self]:
+        return db.get_paginated(
+            select(cls).filter_by(test_id=test_id).order_by(cls.user_id), offset, limit
+        )
+
+    @classmethod
+    def find_ungraded(cls, test_id: int, limit: int) -> list[Row]:
+        """:return: user ids & submission times"""
+        return db.get_all_rows(
+            select(cls.user_id, cls.submitted)
+            .filter(cls.test_id == test_id, cls.graded.is_(None))
+            .order_by(cls.user_id)
+            .limit(limit)
+        )
+
+    @classmethod
+    def mark_graded(cls, test_id: int, scores: list[dict[str, Any]]) -> None:
+        """
+        Submissions, which were changed since they were read for grading,
+        are left ungraded. Each of `scores` has ``user``, ``read`` & ``score``
+        """
+        table = cls.__table__
+        db.session.execute(
+            update(table)
+            .where(
+                table.c.test_id == test_id,
+                table.c.user_id == bindparam("user"),
+                table.c.submitted == bindparam("read"),
+            )
+            .values(graded=datetime.utcnow(), score=bindparam("score")),
+            scores,
+        )
+
+    @classmethod
+    def count_by_test(cls, test_id: int) -> Row:
+        """:return: numbers of submissions & of graded ones"""
+        return db.get_first_row(
+            select(func.count(), func.count(cls.graded)).filter(cls.test_id == test_id)
+        )
+
+
+def normalize_answer(kind: QuestionKind, content: str) -> Normalized:
+    """Case & whitespace are ignored, choices are comma-separated & unordered"""
+    if kind == QuestionKind.CHOICE:
+        return frozenset(
+            normalize_answer(QuestionKind.SIMPLE, choice)
+            for choice in content.split(",")
+            if choice.strip() != ""
+        )
+    return " ".join(content.split()).casefold()
+
+
+@dataclass
+class AnswerKey:
+    """Normalized correct answers of a test, compiled once for all submissions"""
+
+    answers: dict[int, tuple[QuestionKind, Normalized]]
+
+    @classmethod
+    def compile(cls, test_id: int) -> Self:
+        rows: list[Row] = db.get_all_rows(
+            select(Question.id, Question.kind, Question.answer).filter(
+                Question.test_id == test_id,
+                Question.kind != QuestionKind.DETAILED,
+                Question.answer.is_not(None),
+            )
+        )
+        return cls(
+            {row.id: (row.kind, normalize_answer(row.kind, row.answer)) for row in rows}
+        )
+
+    def check(self, question_id: int, content: str) -> bool | None:
+        """:return: None for questions, which can't be graded automatically"""
+        key: tuple[QuestionKind, Normalized] | None = self.answers.get(question_id)
+        if key is None:
+            return None
+        kind, correct = key
+        return normalize_answer(kind, content) == correct
+
+
+def grade_batch(test_id: int, answer_key: AnswerKey, limit: int) -> int:
+    """:return: the number of graded submissions"""
+    submissions: list[Row] = Submission.find_ungraded(test_id, limit)
+    if len(submissions) == 0:
+        return 0
+
+    results: list[dict[str, Any]] = [
+        {
+            "question_id": answer.question_id,
+            "user_id": answer.user_id,
+            "correct": answer_key.check(answer.question_id, answer.content),
+        }
+        for answer in Answer.find_by_users(
+            test_id, [submission.user_id for submission in submissions]
+        )
+    ]
+    scores: Counter[int] = Counter(
+        result["user_id"] for result in results if result["correct"]
+    )
+    Answer.update_bulk(results)
+    Submission.mark_graded(
+        test_id,
+        [
+            {
+                "user": submission.user_id,
+                "read": submission.submitted,
+                "score": scores[submission.user_id],
+            }
+            for submission in submissions
+        ],
+    )
+    db.session.commit()
+    return len(submissions)
+
+
+@handler("grade-test")
+def grade_test(test_id: int, closed: str | None = None) -> None:
+    """
+    Grades all ungraded submissions. Jobs, scheduled for closing (with `closed`),
+    are skipped if the test was deleted or its closing time was changed
+    """
+    test: Test | None = Test.find_by_id(test_id)
+    if test is None:
+        return
+    scheduled: str | None = None if test.closed is None else test.closed.isoformat()
+    if closed is not None and closed != scheduled:
+        return
+
+    answer_key: AnswerKey = AnswerKey.compile(test_id)
+    graded: int = GRADING_BATCH_SIZE
+    while graded == GRADING_BATCH_SIZE:
+        graded = grade_batch(test_id, answer_key, GRADING_BATCH_SIZE)
+
+
+def grade_on_closing(test: Test) -> None:
+    """Should be called after the test's closing time is set or changed"""
+    if test.closed is None:
+        return
+    closed: str = test.closed.isoformat()
+    enqueue(
+        "grade-test",
+        key=f"grade-test:{test.id}:{closed}",
+        delay=test.closed - datetime.utcnow(),
+        test_id=test.id,
+        closed=closed,
+    )
+
+
+def grade_later(test_id: int) -> None:
+    enqueue("grade-test", key=f"grade-test:{test_id}", test_id=test_id)
+
+
+@dataclass
+class QuestionStatistics:
+    question_id: int
+    answers: int
+    correct: int
+
+
+@dataclass
+class TestStatistics:
+    __test__ = False
+
+    submissions: int
+    graded: int
+    questions: list[QuestionStatistics]
+
+    @classmethod
+    def from_test(cls, test_id: int) -> Self:
+        """Aggregated by the database, so memory doesn't grow with submissions"""
+        rows: list[Row] = db.get_all_rows(
+            select(
+                Question.id,
+                func.count(Answer.user_id),
+                func.coalesce(
+                    func.sum(case((Answer.correct.is_(True), 1), else_=0)), 0
+                ),
+            )
+            .outerjoin(Answer, Answer.question_id == Question.id)
+            .filter(Question.test_id == test_id)
+            .group_by(Question.id, Question.position)
+            .order_by(Question.position, Question.id)
+        )
+        submissions, graded = Submission.count_by_test(test_id)
+        return cls(
+            submissions=submissions,
+            graded=graded,
+            questions=[QuestionStatistics(*row) for row in rows],
+        )
@@ -2,17 +2,29 @@ from __future__ import annotations
 
 from flask_fullstack import DuplexEvent, EventSpace
 from flask_socketio import join_room, leave_room
+from pydantic import BaseModel, Field
 
 from common import EventController
 from communities.base.meta_db import PermissionType, Community
 from communities.base.utils import check_permission
-from communities.tasks.tests_db import Test, Question, QuestionKind
+from communities.tasks.tests_db import Test, TestQuestions, Question, QuestionKind
 from communities.tasks.tests_sio import TestsEventSpace
-from communities.tasks.utils import test_finder, question_finder
+from communities.tasks.utils import apply_questions_edit, test_finder, question_finder
 
 controller: EventController = EventController()
 
 
+class QuestionPatchModel(Question.UpdateModel):
+    # nested models are not kebabified by controllers, so the alias is explicit
+    question_id: int = Field(alias="question-id")
+
+
+class QuestionsEditModel(BaseModel):
+    created: list[Question.BaseModel] = []
+    updated: list[QuestionPatchModel] = []
+    order: list[int] | None = None  # ids of all existing questions
+
+
 @controller.route()
 class QuestionsEventSpace(EventSpace):
     @classmethod
@@ -47,14 +59,43 @@ class QuestionsEventSpace(EventSpace):
         test: Test,
         text: str,
         kind: QuestionKind,
+        answer: str | None,
     ) -> Question:
-        question: Question = Question.create(text, kind, test.id)
+        question: Question = Question.create(text, kind, test.id, answer)
         event.emit_convert(question, self.room_name(test.id))
         return question
 
     class QuestionIdModel(TestsEventSpace.TestIdModel):
         question_id: int
 
+    class EditModel(QuestionsEditModel, TestsEventSpace.TestIdModel):
+        pass
+
+    class QuestionsModel(TestsEventSpace.TestIdModel):
+        questions: list[Question.FullModel]
+
+    @controller.doc_abort(400, "Order should list every question of the test once")
+    @controller.doc_abort(413, "Too many questions")
+    @controller.argument_parser(EditModel)
+    @controller.mark_duplex(QuestionsModel, use_event=True)
+    @check_permission(controller, PermissionType.MANAGE_TASKS)
+    @test_finder(controller)
+    @controller.marshal_ack(QuestionsModel)
+    def edit_questions(
+        self,
+        event: DuplexEvent,
+        test: Test,
+        created: list[dict],
+        updated: list[dict],
+        order: list[int] | None,
+    ) -> TestQuestions:
+        """Creates, updates & reorders many questions with one broadcast"""
+        edited: TestQuestions = apply_questions_edit(
+            controller, test, created, updated, order
+        )
+        event.emit_convert(edited, self.room_name(test.id))
+        return edited
+
     class UpdateModel(QuestionIdModel, Question.UpdateModel):
         pass
 
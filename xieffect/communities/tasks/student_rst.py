@@ -3,12 +3,19 @@ from __future__ import annotations
 from datetime import datetime
 
 from flask_fullstack import counter_parser, RequestParser
+from flask_fullstack.restx.marshals import v2_model_to_ffs
 from flask_restx import Resource
+from pydantic import BaseModel, Field
+from pydantic.v1 import ValidationError
 
 from common import ResourceController
 from communities.base.meta_db import Community
 from communities.base.utils import check_participant
+from communities.tasks.answers_db import Answer, Submission
+from communities.tasks.task_counters_db import ACTIVE, task_state
 from communities.tasks.tasks_db import Task, TaskFilter, TASKS_PER_PAGE
+from communities.tasks.tests_db import Question, Test
+from communities.tasks.utils import test_finder
 from users.users_db import User
 
 controller = ResourceController(
@@ -16,6 +23,18 @@ controller = ResourceController(
 )
 
 
+class AnswerModel(Answer.BaseModel):
+    # nested models are not kebabified by controllers, so the alias is explicit
+    question_id: int = Field(alias="question-id")
+
+
+class AnswersModel(BaseModel):
+    answers: list[AnswerModel]
+
+
+AnswersParser = v2_model_to_ffs(AnswersModel)
+
+
 @controller.route("/")
 class StudentTasks(Resource):
     parser: RequestParser = counter_parser.copy()
@@ -47,13 +66,60 @@ class StudentTasks(Resource):
         )
 
 
+def task_version(community: Community, task: Task) -> tuple | None:
+    """Tasks, that are not visible, are left for the 404 in the method"""
+    if task.community_id != community.id or task.opened > datetime.utcnow():
+        return None
+    return task.id, task.changed, task.user.changed  # username is in the model
+
+
 @controller.route("/<int:task_id>/")
 class StudentTaskGet(Resource):
     @controller.jwt_authorizer(User)
     @check_participant(controller)
     @controller.database_searcher(Task)
+    @controller.conditional(task_version)
     @controller.marshal_with(Task.FullModel)
     def get(self, community: Community, task: Task):
         if task.community_id != community.id or task.opened > datetime.utcnow():
             controller.abort(404, Task.not_found_text)
         return task
+
+
+@controller.route("/<int:test_id>/answers/")
+class StudentTestAnswers(Resource):
+    parser: RequestParser = RequestParser()
+    parser.add_argument("answers", type=dict, action="append", required=True)
+
+    @controller.doc_abort(404, "Submission not found")
+    @check_participant(controller, use_user=True)
+    @test_finder(controller)
+    @controller.marshal_with(Submission.FullModel)
+    def get(self, user: User, test: Test):
+        submission: Submission | None = Submission.find_by_ids(test.id, user.id)
+        if submission is None:
+            controller.abort(404, "Submission not found")
+        return submission
+
+    @controller.doc_abort(409, "Test is not open for answers")
+    @controller.argument_parser(parser)
+    @check_participant(controller, use_user=True)
+    @test_finder(controller)
+    @controller.marshal_with(Submission.FullModel)
+    def put(self, user: User, test: Test, answers: list[dict]):
+        """Saves answers to some of the questions, replacing the previous ones"""
+        if task_state(test.opened, test.closed, datetime.utcnow()) != ACTIVE:
+            controller.abort(409, "Test is not open for answers")
+
+        try:
+            answers = AnswersParser.parse_obj({"answers": answers}).dict()["answers"]
+        except ValidationError as e:
+            controller.abort(400, str(e))
+        contents: dict[int, str] = {
+            answer["question_id"]: answer["content"] for answer in answers
+        }
+        questions: dict[int, int] = Question.find_positions(test.id)
+        if any(question_id not in questions for question_id in contents):
+            controller.abort(404, Question.not_found_text)
+
+        return Submission.submit(test.id, user.id, contents)
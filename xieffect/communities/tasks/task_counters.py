@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from common import db
+from other.scheduler import IntervalTrigger, scheduler
+from .task_counters_db import TaskCounter
+
+RECOUNT_BATCH_SIZE: int = 100
+RECOUNT_INTERVAL: float = 60  # seconds, counters can lag behind by as much
+
+
+@scheduler.job("recount-tasks", IntervalTrigger(RECOUNT_INTERVAL))
+def recount_due_tasks(batch_size: int = RECOUNT_BATCH_SIZE) -> None:
+    """Moves tasks, which were opened or closed by time, to their new states"""
+    recounted: int = batch_size
+    while recounted == batch_size:
+        recounted = TaskCounter.recount_due(batch_size)
+        db.session.commit()
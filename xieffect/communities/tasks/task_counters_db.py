@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Self
+
+from sqlalchemy import and_, case, delete, ForeignKey, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.sqltypes import String
+
+from common import Base, db
+from communities.tasks.tasks_db import Task
+from communities.tasks.tests_db import Test
+
+TASK_KINDS: tuple[str, str] = ("task", "test")
+UPCOMING: str = "upcoming"
+ACTIVE: str = "active"
+CLOSED: str = "closed"
+
+CounterKey = tuple[int, str, str]  # community id, kind & state
+
+
+def task_state(opened: datetime | None, closed: datetime | None, now: datetime) -> str:
+    """Same as in `TaskFilter.ACTIVE`: tasks without `opened` are never active"""
+    if opened is None or opened > now:
+        return UPCOMING
+    if closed is None or closed > now:
+        return ACTIVE
+    return CLOSED
+
+
+def state_case(now: datetime):
+    """SQL version of `task_state`"""
+    return case(
+        (or_(Task.opened.is_(None), Task.opened > now), UPCOMING),
+        (or_(Task.closed.is_(None), Task.closed > now), ACTIVE),
+        else_=CLOSED,
+    )
+
+
+tests_table = Test.__table__  # without the join to `cs_tasks`, as with `Test`
+kind_case = case((tests_table.c.id.is_(None), TASK_KINDS[0]), else_=TASK_KINDS[1])
+
+
+@dataclass
+class TaskCounts:
+    upcoming: int = 0
+    active: int = 0
+    closed: int = 0
+
+
+@dataclass
+class TaskSummary:
+    tasks: TaskCounts = field(default_factory=TaskCounts)
+    tests: TaskCounts = field(default_factory=TaskCounts)
+
+
+class TaskCounter(Base):
+    """
+    Number of not deleted tasks of a community by kind & state. Each task
+    remembers the state it's counted in (`Task.counted_state`), so that
+    the counters are moved once per change, even with concurrent updates
+    """
+
+    __tablename__ = "cs_task_counters"
+
+    community_id: Mapped[int] = mapped_column(
+        ForeignKey("community.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    kind: Mapped[str] = mapped_column(String(10), primary_key=True)
+    state: Mapped[str] = mapped_column(String(10), primary_key=True)
+    total: Mapped[int] = mapped_column(default=0)
+
+    @classmethod
+    def change(cls, community_id: int, kind: str, state: str, difference: int) -> None:
+        dialect_insert = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+        stmt = dialect_insert[db.engine.dialect.name](cls).values(
+            community_id=community_id, kind=kind, state=state, total=difference
+        )
+        db.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[cls.community_id, cls.kind, cls.state],
+                set_={"total": cls.total + stmt.excluded.total},
+            )
+        )
+
+    @classmethod
+    def move(
+        cls,
+        task_id: int,
+        community_id: int,
+        kind: str,
+        counted: str | None,
+        state: str | None,
+    ) -> None:
+        """Conditional update, so that only one of the concurrent moves wins"""
+        if counted == state:
+            return
+        moved: int | None = db.get_first(
+            update(Task)
+            .filter(
+                Task.id == task_id, Task.counted_state.is_not_distinct_from(counted)
+            )
+            .values(counted_state=state, changed=Task.changed)  # no new ETag
+            .returning(Task.id)
+        )
+        if moved is None:
+            return
+        if counted is not None:
+            cls.change(community_id, kind, counted, -1)
+        if state is not None:
+            cls.change(community_id, kind, state, 1)
+
+    @classmethod
+    def recount(cls, task: Task, now: datetime | None = None) -> None:
+        """Should be called after every change to a task, including deletion"""
+        state: str | None = None
+        if task.deleted is None:
+            state = task_state(task.opened, task.closed, now or datetime.utcnow())
+        is_test: bool = (
+            db.get_first(select(tests_table.c.id).filter_by(id=task.id)) is not None
+        )
+        kind: str = TASK_KINDS[is_test]
+        cls.move(task.id, task.community_id, kind, task.counted_state, state)
+
+    @classmethod
+    def recount_due(cls, limit: int, now: datetime | None = None) -> int:
+        """
+        Moves a batch of tasks, which were opened or closed since they were counted
+        :return: the number of moved tasks
+        """
+        now = now or datetime.utcnow()
+        rows: list[Row] = db.get_all_rows(
+            select(
+                Task.id,
+                Task.community_id,
+                Task.opened,
+                Task.closed,
+                Task.counted_state,
+                kind_case.label("kind"),
+            )
+            .outerjoin(tests_table, tests_table.c.id == Task.id)
+            .filter(
+                Task.deleted.is_(None),
+                or_(
+                    and_(Task.counted_state == UPCOMING, Task.opened <= now),
+                    and_(Task.counted_state == ACTIVE, Task.closed <= now),
+                ),
+            )
+            .order_by(Task.id)
+            .limit(limit)
+        )
+        for row in rows:
+            state: str = task_state(row.opened, row.closed, now)
+            cls.move(row.id, row.community_id, row.kind, row.counted_state, state)
+        return len(rows)
+
+    @classmethod
+    def find_summary(cls, community_id: int) -> TaskSummary:
+        summary = TaskSummary()
+        counters: list[Self] = db.get_all(
+            select(cls).filter_by(community_id=community_id)
+        )
+        for counter in counters:
+            counts: TaskCounts = getattr(summary, f"{counter.kind}s")
+            setattr(counts, counter.state, counter.total)
+        return summary
+
+    @classmethod
+    def recompute(
+        cls, now: datetime | None = None
+    ) -> dict[CounterKey, tuple[int, int]]:
+        """
+        Rebuilds all counters & counted states from scratch
+        :return: counters, which didn't match, with the stored & the actual totals
+        """
+        now = now or datetime.utcnow()
+        actual: Counter[CounterKey] = Counter(
+            {
+                (community_id, kind, state): total
+                for community_id, kind, state, total in db.get_all_rows(
+                    select(
+                        Task.community_id,
+                        kind_case,
+                        state_case(now),
+                        func.count(Task.id),
+                    )
+                    .outerjoin(tests_table, tests_table.c.id == Task.id)
+                    .filter(Task.deleted.is_(None))
+                    .group_by(Task.community_id, kind_case, state_case(now))
+                )
+            }
+        )
+        stored: Counter[CounterKey] = Counter(
+            {
+                (counter.community_id, counter.kind, counter.state): counter.total
+                for counter in db.get_all(select(cls))
+            }
+        )
+
+        db.session.execute(
+            update(Task)
+            .filter(Task.deleted.is_(None))
+            .values(counted_state=state_case(now), changed=Task.changed)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.execute(
+            update(Task)
+            .filter(Task.deleted.is_not(None))
+            .values(counted_state=None, changed=Task.changed)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.execute(delete(cls))
+        for (community_id, kind, state), total in actual.items():
+            cls.change(community_id, kind, state, total)
+
+        return {
+            key: (stored[key], actual[key])
+            for key in stored.keys() | actual.keys()
+            if stored[key] != actual[key]
+        }
@@ -6,12 +6,12 @@ from typing import Self
 from flask_fullstack import Identifiable, TypeEnum
 from pydantic_marshals.base import PatchDefault
 from pydantic_marshals.sqlalchemy import MappedModel
-from sqlalchemy import ForeignKey, select, or_
+from sqlalchemy import and_, ForeignKey, Row, select, or_
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql.sqltypes import String, Text
 
 from common import db
-from common.abstract import FileEmbed, SoftDeletable
+from common.abstract import FileEmbed, SoftDeletable, Versioned
 from vault.files_db import File
 
 TASKS_PER_PAGE: int = 48
@@ -37,7 +37,7 @@ class TaskOrder(TypeEnum):
     CLOSED = 2
 
 
-class Task(SoftDeletable, Identifiable):
+class Task(SoftDeletable, Versioned, Identifiable):
     __tablename__ = "cs_tasks"
     not_found_text = "Task not found"
 
@@ -61,6 +61,8 @@ class Task(SoftDeletable, Identifiable):
     created: Mapped[datetime] = mapped_column(default=datetime.utcnow, index=True)
     opened: Mapped[datetime | None] = mapped_column(index=True)
     closed: Mapped[datetime | None] = mapped_column(index=True)
+    # state in `TaskCounter`, None if not counted (deleted)
+    counted_state: Mapped[str | None] = mapped_column(String(10), index=True)
 
     files: Mapped[list[File]] = relationship(
         secondary=TaskEmbed.__table__,
@@ -127,3 +129,16 @@ class Task(SoftDeletable, Identifiable):
                 or_(cls.closed > datetime.utcnow(), cls.closed.is_(None)),
             )
         return db.get_paginated(stmt, offset, limit)
+
+    @classmethod
+    def find_scheduled(cls, since: datetime, until: datetime) -> list[Row]:
+        """:return: ids & times of tasks, opened or closed in (since, until]"""
+        return db.get_all_rows(
+            select(cls.id, cls.opened, cls.closed).filter(
+                cls.deleted.is_(None),
+                or_(
+                    and_(cls.opened > since, cls.opened <= until),
+                    and_(cls.closed > since, cls.closed <= until),
+                ),
+            )
+        )
@@ -10,8 +10,10 @@ from common import EventController
 from common.utils import check_files
 from communities.base.meta_db import Community
 from communities.base.roles_db import PermissionType
-from communities.base.utils import check_permission
+from communities.base.utils import check_participant, check_permission
+from communities.tasks.task_counters_db import TaskCounter
 from communities.tasks.tasks_db import Task, TaskEmbed
+from communities.tasks.tasks_timers import task_timers
 from users.users_db import User
 
 controller: EventController = EventController()
@@ -29,6 +31,41 @@ class TasksEventSpace(EventSpace):
     class TaskIdsModel(CommunityIdModel):
         task_id: int
 
+    @classmethod
+    def student_room_name(cls, community_id: int) -> str:
+        return f"cs-student-tasks-{community_id}"
+
+    task_opened = controller.server_event(
+        TaskIdsModel, description="Task's opening time has come"
+    )
+    task_closed = controller.server_event(
+        TaskIdsModel, description="Task's closing time has come"
+    )
+
+    @classmethod
+    def notify_students(cls, column: str, task: Task) -> None:
+        """Emits `task_opened` or `task_closed` (by the column) outside of requests"""
+        event = cls.task_opened if column == "opened" else cls.task_closed
+        event.emit_convert(
+            room=cls.student_room_name(task.community_id),
+            namespace="/",
+            include_self=True,
+            community_id=task.community_id,
+            task_id=task.id,
+        )
+
+    @controller.argument_parser(CommunityIdModel)
+    @check_participant(controller)
+    @controller.force_ack()
+    def open_student_tasks(self, community: Community):
+        join_room(self.student_room_name(community.id))
+
+    @controller.argument_parser(CommunityIdModel)
+    @check_participant(controller)
+    @controller.force_ack()
+    def close_student_tasks(self, community: Community):
+        leave_room(self.student_room_name(community.id))
+
     @controller.argument_parser(CommunityIdModel)
     @check_permission(controller, PermissionType.MANAGE_TASKS)
     @controller.force_ack()
@@ -66,6 +103,8 @@ class TasksEventSpace(EventSpace):
         )
 
         TaskEmbed.add_files(checked_files, task_id=task.id)
+        TaskCounter.recount(task)
+        task_timers.schedule(task)
         event.emit_convert(task, self.room_name(community.id))
         return task
 
@@ -94,8 +133,11 @@ class TasksEventSpace(EventSpace):
 
         if files is not None:
             TaskEmbed.update_files(check_files(controller, files), task_id=task.id)
+            task.touch()
 
         task.update(**kwargs)
+        TaskCounter.recount(task)
+        task_timers.schedule(task)
         event.emit_convert(task, room=self.room_name(community.id))
         return task
 
@@ -108,6 +150,7 @@ class TasksEventSpace(EventSpace):
         if task.community_id != community.id:
             controller.abort(404, Task.not_found_text)
         task.soft_delete()
+        TaskCounter.recount(task)
         event.emit_convert(
             room=self.room_name(community.id),
             community_id=community.id,
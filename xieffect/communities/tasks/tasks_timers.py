@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from heapq import heapify, heappop, heappush
+from os import getpid
+from socket import gethostname
+from threading import Lock
+
+from common import app, db
+from communities.tasks.tasks_db import Task
+from other.scheduler_db import JobLease
+
+TIMERS_HORIZON: timedelta = timedelta(minutes=10)  # of timers kept in memory
+TIMERS_RELOAD: timedelta = timedelta(seconds=30)  # to see changes of other workers
+TIMERS_LEASE: timedelta = timedelta(minutes=1)
+TIMERS_LEASE_NAME: str = "task-timers"
+TASK_TIMES: tuple[str, str] = ("opened", "closed")
+
+Timer = tuple[datetime, int, str]  # time, task id & the column
+Notify = Callable[[str, Task], None]
+
+
+class TaskTimers:
+    """
+    Heap of task openings & closings within the horizon, loaded from the indexed
+    columns & updated on changes. Timers are checked against the task when they
+    fire, so timers of changed & deleted tasks don't have to be removed.
+    Only the worker holding the lease fires them, others reload when they take over
+    """
+
+    def __init__(self, holder: str) -> None:
+        self.holder: str = holder
+        self.timers: list[Timer] = []
+        self.checked: datetime | None = None  # timers up to this time have fired
+        self.loaded: datetime | None = None
+        self.lock = Lock()
+
+    def refresh(self, now: datetime) -> None:
+        since: datetime = self.checked or now
+        timers: list[Timer] = [
+            (moment, row.id, column)
+            for row in Task.find_scheduled(since, now + TIMERS_HORIZON)
+            for column, moment in zip(TASK_TIMES, (row.opened, row.closed))
+            if moment is not None and since < moment <= now + TIMERS_HORIZON
+        ]
+        heapify(timers)
+        with self.lock:
+            self.timers = timers
+            self.checked = since
+            self.loaded = now
+
+    def schedule(self, task: Task) -> None:
+        """Adds timers of a new or updated task, if they are within the horizon"""
+        if self.loaded is None:
+            return
+        until: datetime = self.loaded + TIMERS_HORIZON
+        for column in TASK_TIMES:
+            moment: datetime | None = getattr(task, column)
+            if moment is not None and self.checked < moment <= until:
+                with self.lock:
+                    heappush(self.timers, (moment, task.id, column))
+
+    def pop_due(self, now: datetime) -> list[Timer]:
+        due: list[Timer] = []
+        with self.lock:
+            while self.timers and self.timers[0][0] <= now:
+                due.append(heappop(self.timers))
+            self.checked = now
+        return due
+
+    def fire(self, now: datetime, notify: Notify) -> int:
+        """:return: the number of notifications"""
+        notified: int = 0
+        for moment, task_id, column in self.pop_due(now):
+            task: Task | None = Task.find_by_id(task_id)
+            if task is not None and getattr(task, column) == moment:
+                notify(column, task)
+                notified += 1
+        return notified
+
+    def seconds_until_next(self, now: datetime) -> float:
+        reload: float = TIMERS_RELOAD.total_seconds()
+        with self.lock:
+            next_time: datetime | None = self.timers[0][0] if self.timers else None
+        if next_time is None:
+            return reload
+        return min(max((next_time - now).total_seconds(), 0), reload)
+
+    def lead(self) -> bool:
+        """Renews or takes the lease. Timers are reloaded on each takeover"""
+        if JobLease.renew(TIMERS_LEASE_NAME, self.holder, TIMERS_LEASE):
+            return True
+        self.loaded = None
+        self.checked = None
+        return JobLease.acquire(TIMERS_LEASE_NAME, self.holder, TIMERS_LEASE)
+
+    def tick(self, now: datetime, notify: Notify) -> None:
+        leading: bool = self.lead()
+        db.session.commit()
+        if not leading:
+            return
+        if self.loaded is None or now - self.loaded >= TIMERS_RELOAD:
+            self.refresh(now)
+        self.fire(now, notify)
+
+    def run(
+        self, sleep: Callable[[float], None], notify: Notify
+    ) -> None:  # pragma: no cover
+        """`sleep` is the same as in `run_email_sender`"""
+        while True:  # noqa: WPS457
+            with app.app_context():
+                try:
+                    self.tick(datetime.utcnow(), notify)
+                except Exception as e:  # noqa: PIE786
+                    logging.error("Task timers failed", exc_info=e)
+                    db.session.rollback()
+            sleep(self.seconds_until_next(datetime.utcnow()))
+
+
+task_timers = TaskTimers(holder=f"{gethostname()}:{getpid()}")
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from flask_fullstack import counter_parser, RequestParser
 from flask_restx import Resource
+from pydantic import BaseModel
 
 from common import ResourceController
 from communities.base.meta_db import Community, PermissionType
 from communities.base.utils import check_permission
+from communities.tasks.task_counters_db import TaskCounter
 from communities.tasks.tasks_db import Task, TaskFilter, TaskOrder, TASKS_PER_PAGE
 from users.users_db import User
 
@@ -52,6 +54,27 @@ class TeacherTasks(Resource):
         )
 
 
+class TaskCountsModel(BaseModel):
+    upcoming: int
+    active: int
+    closed: int
+
+
+class TaskSummaryModel(BaseModel):
+    tasks: TaskCountsModel
+    tests: TaskCountsModel
+
+
+@controller.route("/summary/")
+class TeacherTasksSummary(Resource):
+    @controller.jwt_authorizer(User)
+    @check_permission(controller, PermissionType.MANAGE_TASKS)
+    @controller.marshal_with(TaskSummaryModel)
+    def get(self, community: Community):
+        """Numbers of tasks & tests by state, updated within a minute of changes"""
+        return TaskCounter.find_summary(community.id)
+
+
 @controller.route("/<int:task_id>/")
 class TeacherTaskGet(Resource):
     @controller.jwt_authorizer(User)
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
-from typing import Self
+from dataclasses import dataclass
+from typing import Any, Self
 
 from flask_fullstack import Identifiable, TypeEnum
 from pydantic_marshals.base.fields.base import PatchDefault
 from pydantic_marshals.sqlalchemy import MappedModel
-from sqlalchemy import ForeignKey, Text
+from sqlalchemy import ForeignKey, func, Index, insert, select, Text, update
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from common import Base
+from common import Base, db
 from communities.tasks.tasks_db import Task
 
+QUESTIONS_PER_EDIT: int = 200
+
 
 class QuestionKind(TypeEnum):
     SIMPLE = 0
@@ -25,20 +28,87 @@ class Question(Base, Identifiable):
     id: Mapped[int] = mapped_column(primary_key=True)
     text: Mapped[str] = mapped_column(Text)
     kind: Mapped[QuestionKind] = mapped_column()
+    # correct answer for grading, comma-separated for choices, None for manual
+    answer: Mapped[str | None] = mapped_column(Text)
     test_id: Mapped[int] = mapped_column(
         ForeignKey("cs_tests.id", ondelete="CASCADE"),
     )
+    position: Mapped[int] = mapped_column(default=0)  # in the test, ties go by id
+
+    __table_args__ = (Index("ix_cs_questions_test_id_position", "test_id", "position"),)
 
-    BaseModel = MappedModel.create(columns=[text, kind])
+    BaseModel = MappedModel.create(columns=[text, kind, answer])
     UpdateModel = BaseModel.as_patch()
     FullModel = BaseModel.extend(columns=[id])
 
     @classmethod
-    def create(cls, text: str, kind: QuestionKind, test_id: int) -> Self:
+    def find_next_position(cls, test_id: int) -> int:
+        last: int | None = db.get_first(
+            select(func.max(cls.position)).filter_by(test_id=test_id)
+        )
+        return 0 if last is None else last + 1
+
+    @classmethod
+    def create(
+        cls,
+        text: str,
+        kind: QuestionKind,
+        test_id: int,
+        answer: str | None = None,
+    ) -> Self:
         return super().create(
             text=text,
             kind=kind,
             test_id=test_id,
+            answer=answer,
+            position=cls.find_next_position(test_id),
+        )
+
+    @classmethod
+    def create_bulk(cls, test_id: int, questions: list[dict[str, Any]]) -> None:
+        """Adds questions to the end of the test in one statement"""
+        if len(questions) == 0:
+            return
+        start: int = cls.find_next_position(test_id)
+        db.session.execute(
+            insert(cls),
+            [
+                dict(question, test_id=test_id, position=start + index)
+                for index, question in enumerate(questions)
+            ],
+        )
+
+    @classmethod
+    def update_bulk(cls, questions: list[dict[str, Any]]) -> None:
+        """Updates by the ``id`` key, other keys set the columns"""
+        if len(questions) != 0:
+            db.session.execute(update(cls), questions)
+
+    @classmethod
+    def find_positions(cls, test_id: int) -> dict[int, int]:
+        """:return: positions of the test's questions by their ids"""
+        return dict(
+            db.get_all_rows(select(cls.id, cls.position).filter_by(test_id=test_id))
+        )
+
+    @classmethod
+    def reorder(cls, positions: dict[int, int], question_ids: list[int]) -> None:
+        """
+        Numbers questions in the order of `question_ids`,
+        only the ones, which change their positions, are updated
+        """
+        cls.update_bulk(
+            [
+                {"id": question_id, "position": position}
+                for position, question_id in enumerate(question_ids)
+                if positions[question_id] != position
+            ]
+        )
+
+    @classmethod
+    def find_by_test(cls, test_id: int) -> list[Self]:
+        return db.get_all(
+            select(cls).filter_by(test_id=test_id).order_by(cls.position, cls.id)
         )
 
     def update(self, **kwargs) -> None:
@@ -62,8 +132,24 @@ class Test(Task):
     )
     questions: Mapped[list[Question]] = relationship(
         passive_deletes=True,
+        order_by=(Question.position, Question.id),
     )
 
     FullModel = Task.__dict__["FullModel"].extend(
         relationships=[(questions, Question.BaseModel)],
     )
+
+
+@dataclass
+class TestQuestions:
+    """All questions of a test in their order, after an edit"""
+
+    __test__ = False
+
+    community_id: int
+    test_id: int
+    questions: list[Question]
+
+    @classmethod
+    def from_test(cls, test: Test) -> Self:
+        return cls(test.community_id, test.id, Question.find_by_test(test.id))
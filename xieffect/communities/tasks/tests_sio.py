@@ -8,8 +8,11 @@ from common import EventController
 from common.utils import check_files
 from communities.base.meta_db import Community, PermissionType
 from communities.base.utils import check_permission
+from communities.tasks.answers_db import grade_on_closing
+from communities.tasks.task_counters_db import TaskCounter
 from communities.tasks.tasks_db import TaskEmbed
 from communities.tasks.tasks_sio import TasksEventSpace
+from communities.tasks.tasks_timers import task_timers
 from communities.tasks.tests_db import Test
 from communities.tasks.utils import test_finder
 from users.users_db import User
@@ -48,6 +51,9 @@ class TestsEventSpace(TasksEventSpace):
         )
 
         TaskEmbed.add_files(checked_files, task_id=test.id)
+        TaskCounter.recount(test)
+        task_timers.schedule(test)
+        grade_on_closing(test)
         event.emit_convert(test, TasksEventSpace.room_name(community.id))
         return test
 
@@ -70,6 +76,9 @@ class TestsEventSpace(TasksEventSpace):
             TaskEmbed.update_files(check_files(controller, files), task_id=test.id)
 
         test.update(**kwargs)
+        TaskCounter.recount(test)
+        task_timers.schedule(test)
+        grade_on_closing(test)
         event.emit_convert(test, room=TasksEventSpace.room_name(test.community_id))
         return test
 
@@ -80,6 +89,7 @@ class TestsEventSpace(TasksEventSpace):
     @controller.force_ack()
     def delete_test(self, event: DuplexEvent, test: Test) -> None:
         test.soft_delete()
+        TaskCounter.recount(test)
         event.emit_convert(
             room=TasksEventSpace.room_name(test.community_id),
             community_id=test.community_id,
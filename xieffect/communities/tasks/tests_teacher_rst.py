@@ -1,20 +1,44 @@
 from __future__ import annotations
 
 from flask_fullstack import counter_parser, RequestParser
+from flask_fullstack.restx.marshals import v2_model_to_ffs
 from flask_restx import Resource
+from pydantic import BaseModel
+from pydantic.v1 import ValidationError
 
 from common import ResourceController
 from communities.base.meta_db import Community, PermissionType
 from communities.base.utils import check_permission
+from communities.tasks.answers_db import (
+    grade_later,
+    Submission,
+    SUBMISSIONS_PER_PAGE,
+    TestStatistics,
+)
+from communities.tasks.questions_sio import QuestionsEditModel, QuestionsEventSpace
 from communities.tasks.tasks_db import TaskFilter, TaskOrder, TASKS_PER_PAGE
-from communities.tasks.tests_db import Test
-from communities.tasks.utils import test_finder
+from communities.tasks.tests_db import Test, TestQuestions
+from communities.tasks.utils import apply_questions_edit, test_finder
 from users.users_db import User
 
 controller = ResourceController(
     "cs-teacher-tests", path="/communities/<int:community_id>/tests/"
 )
 
+QuestionsEditParser = v2_model_to_ffs(QuestionsEditModel)
+
+
+class QuestionStatisticsModel(BaseModel):
+    question_id: int
+    answers: int
+    correct: int
+
+
+class TestStatisticsModel(BaseModel):
+    submissions: int
+    graded: int
+    questions: list[QuestionStatisticsModel]
+
 
 @controller.route("/")
 class TeacherTests(Resource):
@@ -62,3 +86,65 @@ class TeacherTestGet(Resource):
     @controller.marshal_with(Test.FullModel)
     def get(self, test: Test):
         return test
+
+
+@controller.route("/<int:test_id>/questions/")
+class TeacherTestQuestions(Resource):
+    parser: RequestParser = RequestParser()
+    parser.add_argument("created", type=dict, action="append", default=[])
+    parser.add_argument("updated", type=dict, action="append", default=[])
+    parser.add_argument("order", type=int, action="append")
+
+    @controller.doc_abort(400, "Order should list every question of the test once")
+    @controller.doc_abort(413, "Too many questions")
+    @controller.jwt_authorizer(User)
+    @controller.argument_parser(parser)
+    @check_permission(controller, PermissionType.MANAGE_TASKS)
+    @test_finder(controller)
+    @controller.marshal_with(QuestionsEventSpace.QuestionsModel)
+    def put(self, test: Test, **kwargs) -> TestQuestions:
+        """Same as the `edit-questions` event, for importing tests"""
+        try:
+            edit: dict = QuestionsEditParser.parse_obj(kwargs).dict()
+        except ValidationError as e:
+            controller.abort(400, str(e))
+        edited: TestQuestions = apply_questions_edit(controller, test, **edit)
+        QuestionsEventSpace.edit_questions.emit_convert(  # outside of SIO events
+            edited,
+            room=QuestionsEventSpace.room_name(test.id),
+            namespace="/",
+            include_self=True,
+        )
+        return edited
+
+
+@controller.route("/<int:test_id>/submissions/")
+class TeacherTestSubmissions(Resource):
+    @controller.jwt_authorizer(User)
+    @controller.argument_parser(counter_parser)
+    @check_permission(controller, PermissionType.MANAGE_TASKS)
+    @test_finder(controller)
+    @controller.lister(SUBMISSIONS_PER_PAGE, Submission.IndexModel)
+    def get(self, test: Test, start: int, finish: int):
+        return Submission.find_paginated_by_test(test.id, start, finish - start)
+
+
+@controller.route("/<int:test_id>/grading/")
+class TeacherTestGrading(Resource):
+    @controller.jwt_authorizer(User)
+    @check_permission(controller, PermissionType.MANAGE_TASKS)
+    @test_finder(controller)
+    @controller.a_response()
+    def post(self, test: Test) -> None:
+        """Grades new submissions in the background, tests are graded on closing"""
+        grade_later(test.id)
+
+
+@controller.route("/<int:test_id>/statistics/")
+class TeacherTestStatistics(Resource):
+    @controller.jwt_authorizer(User)
+    @check_permission(controller, PermissionType.MANAGE_TASKS)
+    @test_finder(controller)
+    @controller.marshal_with(TestStatisticsModel)
+    def get(self, test: Test) -> TestStatistics:
+        return TestStatistics.from_test(test.id)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from functools import wraps
+from typing import Any
 
 from flask_fullstack import ResourceController, EventController, get_or_pop
+from pydantic_marshals.base.fields.base import PatchDefault
 
-from communities.tasks.tests_db import Test, Question
+from communities.tasks.tests_db import Question, QUESTIONS_PER_EDIT, Test, TestQuestions
 
 
 def test_finder(
@@ -51,3 +53,39 @@ def question_finder(
         return question_finder_inner
 
     return question_finder_wrapper
+
+
+def apply_questions_edit(
+    controller: ResourceController | EventController,
+    test: Test,
+    created: list[dict[str, Any]],
+    updated: list[dict[str, Any]],
+    order: list[int] | None,
+) -> TestQuestions:
+    """
+    Validates the whole edit with one query, then applies it in bulk statements:
+    updates first, then the new `order` of existing questions, created ones go last
+    """
+    if len(created) + len(updated) > QUESTIONS_PER_EDIT:
+        controller.abort(413, "Too many questions")
+
+    positions: dict[int, int] = Question.find_positions(test.id)
+    changes: list[dict[str, Any]] = [
+        {
+            "id" if key == "question_id" else key: value
+            for key, value in question.items()
+            if value is not PatchDefault
+        }
+        for question in updated
+    ]
+    if any(question["id"] not in positions for question in changes):
+        controller.abort(404, Question.not_found_text)
+    if order is not None and sorted(order) != sorted(positions):
+        controller.abort(400, "Order should list every question of the test once")
+
+    Question.update_bulk([question for question in changes if len(question) > 1])
+    if order is not None:
+        Question.reorder(positions, order)
+    Question.create_bulk(test.id, created)
+    test.touch()
+    return TestQuestions.from_test(test)
@@ -0,0 +1,16 @@
+"""
+Application for commands that only need the database, without controllers,
+API docs & the socketio server, which `wsgi` loads. From `xieffect`:
+
+    flask --app manage database remove_stale
+    flask --app manage queue work
+"""
+
+from __future__ import annotations
+
+import models  # noqa: F401 WPS301  # to create database models
+from common import app
+from other import database_cli, task_queue
+
+app.register_blueprint(database_cli.blueprint)
+app.register_blueprint(task_queue.blueprint)
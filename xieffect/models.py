@@ -0,0 +1,30 @@
+"""
+Imports every database model, so that `Base.metadata` is complete
+without importing controllers (for alembic & lightweight commands)
+"""
+
+from __future__ import annotations
+
+import common.throttling_db
+import communities.base.discussion_db
+import communities.base.invitations_db
+import communities.base.meta_db
+import communities.base.roles_db
+import communities.services.news_db
+import communities.services.videochat_db
+import communities.tasks.answers_db
+import communities.tasks.task_counters_db
+import communities.tasks.tasks_db
+import communities.tasks.tests_db
+import other.outbox_db
+import other.scheduler_db
+import other.task_queue_db
+import pages.pages_db
+import users.feedback_db
+import users.invites_db
+import users.users_db
+import vault.files_db
+from common import Base
+from moderation import Moderator
+
+metadata = Base.metadata
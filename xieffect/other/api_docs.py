@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from gzip import compress
+from hashlib import sha256
+from json import loads as load_json
+from pathlib import Path
+from typing import Any
+
+from flask import abort, has_request_context, request, Response
+from flask_fullstack import SocketIO
+from flask_restx import Api
+from flask_restx.swagger import Swagger
+
+from common import absolute_path, app, dump_json_bytes
+from common.consts import API_DOCS_ENABLED
+
+VERSIONS_PATH: Path = Path(absolute_path("static/versions.json"))
+GZIP_LEVEL: int = 9  # compressed once per deploy, so the slowest level is fine
+
+Document = dict[str, Any]
+
+
+class CachedDocument:
+    """
+    JSON document (API specs) built once per contents of `versions.json`,
+    served from memory with a (weak) ETag & gzip. Changes to versions are
+    noticed by the file's mtime, so checking them is one `stat` per request
+    """
+
+    def __init__(self, name: str, build: Callable[[dict[str, str]], Document]):
+        self.name: str = name
+        self.build = build
+        self.checked_mtime: float | None = None
+        self.etag: str | None = None
+        self.body: bytes = b""
+        self.compressed: bytes = b""
+
+    def build_document(self, versions: dict[str, str]) -> Document:
+        """Restx builds URLs for the specs, so a request is needed at startup"""
+        if has_request_context():
+            return self.build(versions)
+        with app.test_request_context():
+            return self.build(versions)
+
+    def prepare(self) -> None:
+        mtime: float = VERSIONS_PATH.stat().st_mtime
+        if mtime == self.checked_mtime:
+            return
+        versions: bytes = VERSIONS_PATH.read_bytes()
+        etag: str = sha256(self.name.encode("utf-8") + versions).hexdigest()[:32]
+        if etag != self.etag:
+            document: Document = self.build_document(load_json(versions))
+            self.body = dump_json_bytes(document)
+            self.compressed = compress(self.body, GZIP_LEVEL)
+            self.etag = etag
+        self.checked_mtime = mtime
+
+    def respond(self) -> Response:
+        self.prepare()
+        gzipped: bool = request.accept_encodings.quality("gzip") > 0
+        response = Response(
+            self.compressed if gzipped else self.body,
+            mimetype="application/json",
+        )
+        if gzipped:
+            response.content_encoding = "gzip"
+        response.vary.add("Accept-Encoding")
+        response.set_etag(self.etag, weak=True)  # same for both encodings
+        return response.make_conditional(request)
+
+
+def documents_disabled() -> Response:
+    abort(404)
+
+
+def serve_documents(api: Api, socketio: SocketIO) -> list[CachedDocument]:
+    """
+    Replaces views of restx's `/swagger.json` & ffs's AsyncAPI document.
+    With `API_DOCS=0` both respond with 404 & nothing is ever built
+
+    :return: documents to build in advance
+    """
+
+    def build_swagger(versions: dict[str, str]) -> Document:
+        api.version = versions["API"]
+        return Swagger(api).as_dict()
+
+    def build_async_api(versions: dict[str, str]) -> Document:
+        socketio.async_api["info"]["version"] = versions["SIO"]
+        return socketio.docs()
+
+    documents: dict[str, CachedDocument] = {
+        api.endpoint("specs"): CachedDocument("swagger", build_swagger),
+        # ffs names the AsyncAPI endpoint after its view function
+        "documentation": CachedDocument("async-api", build_async_api),
+    }
+    for endpoint, document in documents.items():
+        if API_DOCS_ENABLED:
+            app.view_functions[endpoint] = document.respond
+        else:  # pragma: no cover
+            app.view_functions[endpoint] = documents_disabled
+    return list(documents.values()) if API_DOCS_ENABLED else []
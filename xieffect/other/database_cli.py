@@ -1,18 +1,22 @@
 from __future__ import annotations
 
 from datetime import datetime
-from os import remove
 
+import click
 from flask import Blueprint
 from sqlalchemy import delete, select
 from sqlalchemy.sql import Delete
 
 from common import Base, db
-from vault.files_db import FILES_PATH
+from communities.tasks.task_counters_db import TaskCounter
+from other.scheduler import CronTrigger, scheduler
+from users.users_db import BlockedToken
+from vault.files_db import delete_file_later
 
 blueprint = Blueprint("database", __name__)
 
 
+@scheduler.job("remove-stale", CronTrigger("0 3 * * *"))
 def remove_stale() -> None:
     for table in Base.metadata.sorted_tables:
         if "deleted" in table.columns:
@@ -21,7 +25,7 @@ def remove_stale() -> None:
             if table.name == "files":
                 files: list = db.get_all_rows(select(table).filter(filter_condition))
                 for file in files:
-                    remove(f"{FILES_PATH}{file.id}-{file.name}")
+                    delete_file_later(f"{file.id}-{file.name}")
             db.session.execute(stmt)
             db.session.commit()
 
@@ -29,3 +33,18 @@ def remove_stale() -> None:
 @blueprint.cli.command("remove_stale")
 def remove_stale_cli() -> None:  # TODO pragma: no coverage
     remove_stale()
+
+
+@scheduler.job("purge-blocked-tokens", CronTrigger("30 3 * * *"))
+def purge_blocked_tokens() -> None:
+    BlockedToken.delete_expired()
+
+
+@blueprint.cli.command("recount_tasks")
+def recount_tasks_cli() -> None:  # pragma: no cover
+    """Recomputes task counters from scratch, printing the ones, which didn't match"""
+    mismatches = TaskCounter.recompute()
+    db.session.commit()
+    for (community_id, kind, state), (stored, actual) in mismatches.items():
+        click.echo(f"community {community_id}, {state} {kind}s: {stored} -> {actual}")
+    click.echo(f"Recounted, {len(mismatches)} counters didn't match")
@@ -1,12 +1,25 @@
 from __future__ import annotations
 
 import logging
+from atexit import register as register_atexit
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic, sleep as time_sleep
 
 from discord_webhook import DiscordWebhook
 from flask_fullstack import TypeEnum
+from requests import HTTPError, RequestException, Response
 
 from common.consts import DISABLE_WEBHOOKS
 
+WEBHOOKS_URL: str = "https://discord.com/api/webhooks/"
+DISPATCHER_LIMIT: int = 100  # pending messages, newer ones are dropped
+DISPATCHER_INTERVAL: float = 0.5  # seconds between queue checks
+DISPATCHER_DRAIN_TIMEOUT: float = 10
+DEFAULT_RETRY_AFTER: float = 1
+
 
 class WebhookURLs(TypeEnum):
     STATUS = "843500826223312936/9ZcT7YinTBn4g0hdwPL_ca-YszwRUYrNrLhVEPjDrZQw_lMWHeo7l5LNtl6rq4LAUhgv"
@@ -21,6 +34,163 @@ class WebhookURLs(TypeEnum):
     GALINA = "1145473799836401674/gCfOGyLHcqqj-LC1Wjz4r9tyGYx7YPh5Z9DppCl2naMHkGQzLB51LxNscQ1N_lyQQrCk"
 
 
+@dataclass()
+class WebhookMessage:
+    webhook_url: WebhookURLs
+    message: str
+    file_content: str | None = None
+    file_name: str = "attachment.txt"
+    repeats: int = 1
+
+    @property
+    def key(self) -> tuple[WebhookURLs, str, str | None]:
+        return self.webhook_url, self.message, self.file_content
+
+    @property
+    def content(self) -> str:
+        if self.repeats == 1:
+            return self.message
+        return f"{self.message}\n(repeated {self.repeats} times)"
+
+
+class RateLimitedError(HTTPError):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"Rate limited for {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+def parse_retry_after(response: Response) -> float:
+    header: str | None = response.headers.get("Retry-After")
+    try:
+        if header is not None:
+            return float(header)
+        return float(response.json()["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        return DEFAULT_RETRY_AFTER
+
+
+def execute_webhook(message: WebhookMessage, base_url: str = WEBHOOKS_URL) -> None:
+    webhook = DiscordWebhook(url=f"{base_url}{message.webhook_url.value}")
+    if message.file_content is not None:
+        webhook.add_file(file=message.file_content, filename=message.file_name)
+    webhook.set_content(message.content)
+    response: Response = webhook.execute()
+    if response.status_code == 429:
+        raise RateLimitedError(parse_retry_after(response))
+    response.raise_for_status()
+
+
+class WebhookDispatcher:  # noqa: WPS230
+    """
+    Sends webhook messages in the background, so slow or rate-limited discord
+    doesn't stall the worker. Identical pending messages are coalesced into one
+    with a counter, each webhook waits for its own `Retry-After` when limited
+    """
+
+    def __init__(self, base_url: str = WEBHOOKS_URL, limit: int = DISPATCHER_LIMIT):
+        self.base_url: str = base_url
+        self.limit: int = limit
+        self.lock = Lock()
+        self.queues: dict[WebhookURLs, deque[WebhookMessage]] = {}
+        self.pending: dict[tuple, WebhookMessage] = {}
+        self.blocked_until: dict[WebhookURLs, float] = {}
+        self.running: bool = False
+
+    def submit(self, message: WebhookMessage) -> bool:
+        with self.lock:
+            duplicate: WebhookMessage | None = self.pending.get(message.key)
+            if duplicate is not None:
+                duplicate.repeats += message.repeats
+                return True
+            if len(self.pending) >= self.limit:
+                logging.warning(
+                    f"Webhook message dropped: {message.message}"  # noqa: PIE803
+                )
+                return False
+            self.pending[message.key] = message
+            self.queues.setdefault(message.webhook_url, deque()).append(message)
+        return True
+
+    def is_empty(self) -> bool:
+        return len(self.pending) == 0
+
+    def pop_ready(self) -> WebhookMessage | None:
+        now: float = monotonic()
+        with self.lock:
+            for webhook_url, queue in self.queues.items():
+                if len(queue) != 0 and self.blocked_until.get(webhook_url, 0) <= now:
+                    message: WebhookMessage = queue.popleft()
+                    self.pending.pop(message.key)
+                    return message
+        return None
+
+    def postpone(self, message: WebhookMessage, retry_after: float) -> None:
+        with self.lock:
+            self.blocked_until[message.webhook_url] = monotonic() + retry_after
+            duplicate: WebhookMessage | None = self.pending.get(message.key)
+            if duplicate is None:
+                self.pending[message.key] = message
+                self.queues[message.webhook_url].appendleft(message)
+            else:
+                duplicate.repeats += message.repeats
+
+    def send_ready(self) -> float:
+        """
+        Sends everything that is not rate-limited
+
+        :return: seconds to wait before the next check
+        """
+        message: WebhookMessage | None = self.pop_ready()
+        while message is not None:
+            try:
+                execute_webhook(message, self.base_url)
+            except RateLimitedError as e:
+                self.postpone(message, e.retry_after)
+            except RequestException as e:
+                logging.error(
+                    f"Webhook message not sent: {message.message}",  # noqa: PIE803
+                    exc_info=e,
+                )
+            message = self.pop_ready()
+
+        now: float = monotonic()
+        waits = [
+            self.blocked_until.get(webhook_url, now) - now
+            for webhook_url, queue in self.queues.items()
+            if len(queue) != 0
+        ]
+        return min([DISPATCHER_INTERVAL, *waits])
+
+    def run(self, sleep: Callable[[float], None]) -> None:  # pragma: no cover
+        while self.running:
+            sleep(max(self.send_ready(), 0))
+
+    def start(
+        self,
+        start_task: Callable[..., object],
+        sleep: Callable[[float], None],
+    ) -> None:  # pragma: no cover
+        """
+        Use the server's async primitives (`socketio.start_background_task`
+        and `socketio.sleep`), so the loop doesn't block the worker
+        """
+        self.running = True
+        start_task(self.run, sleep)
+        register_atexit(self.drain)
+
+    def drain(self, timeout: float = DISPATCHER_DRAIN_TIMEOUT) -> None:
+        """Stops the background loop & sends the rest before the timeout"""
+        self.running = False
+        deadline: float = monotonic() + timeout
+        while not self.is_empty() and monotonic() < deadline:
+            wait: float = self.send_ready()
+            if not self.is_empty():
+                time_sleep(max(min(wait, deadline - monotonic()), 0))
+
+
+dispatcher = WebhookDispatcher()
+
+
 def send_file_message(
     webhook_url: WebhookURLs,
     message: str,
@@ -33,13 +203,11 @@ def send_file_message(
             logging.warning(file_content)
         return
 
-    webhook = DiscordWebhook(
-        url=f"https://discord.com/api/webhooks/{webhook_url.value}"
-    )
-    if file_content is not None:
-        webhook.add_file(file=file_content, filename=file_name)
-    webhook.set_content(message)
-    webhook.execute().raise_for_status()
+    webhook_message = WebhookMessage(webhook_url, message, file_content, file_name)
+    if dispatcher.running:
+        dispatcher.submit(webhook_message)
+    else:  # no background loop (cli & scripts), send right away
+        execute_webhook(webhook_message)
 
 
 def send_message(webhook_url: WebhookURLs, message: str) -> None:
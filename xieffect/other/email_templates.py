@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from pathlib import Path
+
+from flask_mail import Message
+from markupsafe import escape
+
+CODE_PLACEHOLDER: str = "&code"
+CODE_SENTINEL: str = "\x00code\x00"  # survives html parsing, unlike `&code`
+SKIPPED_TAGS: frozenset[str] = frozenset(("head", "style", "script", "title"))
+BLOCK_TAGS: frozenset[str] = frozenset(
+    ("br", "p", "div", "tr", "table", "h1", "h2", "h3", "h4", "li", "hr")
+)
+
+
+class TextExtractor(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__()
+        self.chunks: list[str] = []
+        self.skipping: int = 0
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in SKIPPED_TAGS:
+            self.skipping += 1
+        elif tag in BLOCK_TAGS:
+            self.chunks.append("\n")
+        elif tag == "a":
+            href: str | None = dict(attrs).get("href")
+            if href is not None and CODE_SENTINEL in href:
+                self.chunks.append(f"{href} ")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in SKIPPED_TAGS:
+            self.skipping = max(self.skipping - 1, 0)
+        elif tag in BLOCK_TAGS:
+            self.chunks.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if self.skipping == 0:
+            self.chunks.append(data)
+
+    def extract(self, html: str) -> str:
+        self.feed(html)
+        self.close()
+        lines = (" ".join(line.split()) for line in "".join(self.chunks).splitlines())
+        return "\n".join(line for line in lines if line != "")
+
+
+@dataclass()
+class EmailTemplate:
+    """
+    Template split around the code placeholder, so rendering is a single join.
+    The text alternative is extracted from the html once, when loading
+    """
+
+    path: Path
+    modified: float
+    html_parts: list[str]
+    text_parts: list[str]
+
+    @classmethod
+    def from_file(cls, path: Path) -> EmailTemplate:
+        source: str = path.read_text(encoding="utf-8")
+        text: str = TextExtractor().extract(
+            source.replace(CODE_PLACEHOLDER, CODE_SENTINEL)
+        )
+        return cls(
+            path=path,
+            modified=path.stat().st_mtime,
+            html_parts=source.split(CODE_PLACEHOLDER),
+            text_parts=text.split(CODE_SENTINEL),
+        )
+
+    def is_outdated(self) -> bool:
+        return self.path.stat().st_mtime != self.modified
+
+    def render_html(self, code: str) -> str:
+        return str(escape(code)).join(self.html_parts)
+
+    def render_text(self, code: str) -> str:
+        return code.join(self.text_parts)
+
+    def render(self, receiver: str, code: str, theme: str) -> Message:
+        return Message(
+            theme,
+            recipients=[receiver],
+            html=self.render_html(code),
+            body=self.render_text(code),
+        )
+
+
+class TemplateRegistry:
+    def __init__(self, folder: str) -> None:
+        self.folder: Path = Path(folder)
+        self.templates: dict[str, EmailTemplate] = {}
+
+    def register(self, *filenames: str) -> None:
+        for filename in filenames:
+            self.templates[filename] = EmailTemplate.from_file(self.folder / filename)
+
+    def get(self, filename: str, reload_changed: bool = False) -> EmailTemplate:
+        """
+        Returns the compiled template, loading it on the first use.
+        Use `reload_changed` in debug to pick up edited files
+        """
+        template: EmailTemplate | None = self.templates.get(filename)
+        if template is None or (reload_changed and template.is_outdated()):
+            self.register(filename)
+            template = self.templates[filename]
+        return template
+
+    def render_bulk(
+        self,
+        filename: str,
+        theme: str,
+        recipients: Iterable[tuple[str, str]],
+        reload_changed: bool = False,
+    ) -> Iterator[Message]:
+        """Renders one template for many (receiver, code) pairs"""
+        template: EmailTemplate = self.get(filename, reload_changed)
+        yield from (
+            template.render(receiver, code, theme) for receiver, code in recipients
+        )
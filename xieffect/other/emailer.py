@@ -1,23 +1,28 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
+from itertools import groupby
+from operator import attrgetter
 from os import urandom
 from random import SystemRandom
-from smtplib import SMTPDataError
 
 from flask_fullstack import TypeEnum
 from flask_mail import Message
 from flask_restx import Resource
 from itsdangerous import URLSafeSerializer, BadSignature
 
-from common import mail, app, mail_initialized, open_file
-from other.discorder import send_message as send_discord_message, WebhookURLs
+from common import absolute_path, app, mail_initialized
+from other.email_templates import TemplateRegistry
+from other.outbox_db import OutboxEmail
 from users.users_db import User
 
 safe_random = SystemRandom()
 EMAIL_FOLDER: str = "static/emails/"
 SALT: str = app.config["SECURITY_PASSWORD_SALT"]
 
+templates = TemplateRegistry(absolute_path(EMAIL_FOLDER))
+
 
 def create_random_serializer():
     return URLSafeSerializer(urandom(safe_random.randint(32, 64)))
@@ -54,22 +59,26 @@ class EmailType(EmailTypeData, TypeEnum):
     )
 
 
-def generate_email(receiver: str, code: str, filename: str, theme: str) -> Message:
-    with open_file(EMAIL_FOLDER + filename) as f:
-        html: str = f.read().replace("&code", code)
+def preload_email_templates() -> None:
+    templates.register(*(email_type.filename for email_type in EmailType))
+
 
-    return Message(theme, recipients=[receiver], html=html)
+def generate_emails(emails: Iterable[OutboxEmail]) -> Iterator[Message]:
+    """Consecutive emails with the same template (mailings) are rendered in bulk"""
+    for (filename, theme), group in groupby(emails, attrgetter("filename", "theme")):
+        yield from templates.render_bulk(
+            filename,
+            theme,
+            ((email.receiver, email.code) for email in group),
+            reload_changed=app.debug,
+        )
 
 
-def send_email(receiver: str, code: str, filename: str, theme: str):
+def send_email(receiver: str, code: str, filename: str, theme: str) -> None:
+    """Only enqueues the email, it is sent later by the outbox sender"""
     if not mail_initialized:  # TODO pragma: no coverage (action)
         return
-    try:
-        mail.send(generate_email(receiver, code, filename, theme))
-    except SMTPDataError as e:
-        send_discord_message(
-            WebhookURLs.MAILBT, f"Email for {receiver} not sent:\n```{e}```"
-        )
+    OutboxEmail.create(receiver, code, filename, theme)
 
 
 def send_code_email(receiver: str, email_type: EmailType) -> str:
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from hashlib import blake2b
+from threading import Lock
+from traceback import extract_tb, format_exception
+
+from flask import request
+from werkzeug.exceptions import HTTPException
+
+from other.discorder import send_file_message, WebhookURLs
+
+ERROR_WINDOW: timedelta = timedelta(minutes=5)
+ERROR_GROUPS_LIMIT: int = 100  # the least recently seen groups are forgotten
+STACK_DEPTH: int = 10  # innermost frames, used for fingerprinting
+
+
+def fingerprint_error(error: BaseException, endpoint: str) -> str:
+    """Line numbers are left out, so groups survive unrelated edits"""
+    frames = extract_tb(error.__traceback__)[-STACK_DEPTH:]
+    parts: list[str] = [
+        type(error).__qualname__,
+        endpoint,
+        *(f"{frame.filename}:{frame.name}" for frame in frames),
+    ]
+    return blake2b("\n".join(parts).encode("utf-8"), digest_size=8).hexdigest()
+
+
+@dataclass()
+class ErrorGroup:
+    fingerprint: str
+    error_type: str
+    endpoint: str
+    message: str
+    traceback: str  # of the first occurrence
+    first_seen: datetime
+    last_seen: datetime
+    count: int = 1
+    window_start: datetime | None = None
+    unreported: int = 1
+
+    @property
+    def title(self) -> str:
+        return f"`{self.error_type}` at `{self.endpoint}` [{self.fingerprint}]"
+
+
+def report_error_group(group: ErrorGroup, occurrences: int) -> None:
+    if occurrences == group.count:
+        message: str = f"New error {group.title}:\n{group.message}"
+    else:
+        message = (
+            f"Error {group.title} repeated {occurrences} time(s), "
+            + f"{group.count} in total"
+        )
+    send_file_message(
+        WebhookURLs.ERRORS,
+        message=message,
+        file_content=group.traceback,
+        file_name=f"error-{group.fingerprint}.txt",
+    )
+
+
+class ErrorAggregator:
+    """
+    Groups errors by fingerprint and reports each group at most once
+    per window: the first occurrence right away, the rest as a summary
+    with the count when the window is over
+    """
+
+    def __init__(
+        self,
+        report: Callable[[ErrorGroup, int], None] = report_error_group,
+        window: timedelta = ERROR_WINDOW,
+        limit: int = ERROR_GROUPS_LIMIT,
+    ) -> None:
+        self.report = report
+        self.window: timedelta = window
+        self.limit: int = limit
+        self.groups: dict[str, ErrorGroup] = {}
+        self.lock = Lock()
+
+    def create_group(self, error: BaseException, endpoint: str) -> ErrorGroup:
+        now: datetime = datetime.utcnow()
+        group = ErrorGroup(
+            fingerprint=fingerprint_error(error, endpoint),
+            error_type=type(error).__qualname__,
+            endpoint=endpoint,
+            message=repr(error),
+            traceback="".join(format_exception(error)),
+            first_seen=now,
+            last_seen=now,
+        )
+        if len(self.groups) >= self.limit:
+            oldest = min(self.groups.values(), key=lambda old: old.last_seen)
+            self.groups.pop(oldest.fingerprint)
+        self.groups[group.fingerprint] = group
+        return group
+
+    def is_window_over(self, group: ErrorGroup, now: datetime) -> bool:
+        return group.window_start is None or now - group.window_start >= self.window
+
+    def pop_report(self, group: ErrorGroup, now: datetime) -> int:
+        occurrences: int = group.unreported
+        group.window_start = now
+        group.unreported = 0
+        return occurrences
+
+    def record(self, error: BaseException, endpoint: str | None) -> ErrorGroup:
+        endpoint = endpoint or "unknown"
+        now: datetime = datetime.utcnow()
+        with self.lock:
+            group = self.groups.get(fingerprint_error(error, endpoint))
+            if group is None:
+                group = self.create_group(error, endpoint)
+            else:
+                group.count += 1
+                group.unreported += 1
+                group.last_seen = now
+
+            occurrences: int = 0
+            if self.is_window_over(group, now):
+                occurrences = self.pop_report(group, now)
+        if occurrences != 0:
+            self.report(group, occurrences)
+        return group
+
+    def flush(self) -> int:
+        """
+        Reports groups with occurrences left from windows that are over
+
+        :return: number of sent reports
+        """
+        now: datetime = datetime.utcnow()
+        with self.lock:
+            reports: list[tuple[ErrorGroup, int]] = [
+                (group, self.pop_report(group, now))
+                for group in self.groups.values()
+                if group.unreported != 0 and self.is_window_over(group, now)
+            ]
+        for group, occurrences in reports:
+            self.report(group, occurrences)
+        return len(reports)
+
+    def list_groups(self) -> list[ErrorGroup]:
+        """Lists known groups, the most recently seen first"""
+        with self.lock:
+            groups = list(self.groups.values())
+        return sorted(groups, key=lambda group: group.last_seen, reverse=True)
+
+    def run(self, sleep: Callable[[float], None]) -> None:  # pragma: no cover
+        while True:  # noqa: WPS457
+            sleep(self.window.total_seconds() / 5)
+            self.flush()
+
+
+error_groups = ErrorAggregator()
+
+
+def record_request_error(_, exception: BaseException) -> None:
+    """
+    Receiver for flask's `got_request_exception` signal. Skips HTTP errors
+    (aborts), as flask-restx sends the signal for them too
+    """
+    if not isinstance(exception, HTTPException):
+        error_groups.record(exception, request.endpoint)
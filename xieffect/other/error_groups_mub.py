@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from flask_fullstack import counter_parser
+from flask_restx import Resource
+from pydantic import BaseModel
+
+from moderation import MUBController, permission_index
+from other.error_groups import error_groups, ErrorGroup
+from other.profiler_mub import monitoring_section
+
+error_monitoring = permission_index.add_permission(monitoring_section, "errors")
+controller = MUBController("error-groups", path="/errors/")
+
+
+class ErrorGroupModel(BaseModel):
+    fingerprint: str
+    error_type: str
+    endpoint: str
+    message: str
+    first_seen: datetime
+    last_seen: datetime
+    count: int
+
+
+class FullErrorGroupModel(ErrorGroupModel):
+    traceback: str
+
+
+@controller.route("/")
+class ErrorGroupLister(Resource):
+    @controller.require_permission(error_monitoring, use_moderator=False)
+    @controller.argument_parser(counter_parser)
+    @controller.lister(20, ErrorGroupModel)
+    def get(self, start: int, finish: int) -> list[ErrorGroup]:
+        """Lists error groups, the most recently seen first"""
+        return error_groups.list_groups()[start:finish]
+
+
+@controller.route("/<fingerprint>/")
+class ErrorGroupManager(Resource):
+    @controller.doc_abort(404, "Error group not found")
+    @controller.require_permission(error_monitoring, use_moderator=False)
+    @controller.marshal_with(FullErrorGroupModel)
+    def get(self, fingerprint: str) -> ErrorGroup:
+        """Shows the group with the traceback of its first occurrence"""
+        group: ErrorGroup | None = error_groups.groups.get(fingerprint)
+        if group is None:
+            controller.abort(404, "Error group not found")
+        return group
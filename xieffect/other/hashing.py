@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from time import perf_counter
+from typing import TypeVar
+
+from passlib.context import CryptContext
+
+from common.consts import HASHING_WORKERS, PASSWORD_HASH_ROUNDS
+
+try:
+    from gevent import monkey
+    from gevent.threadpool import ThreadPool as GeventThreadPool
+except ImportError:  # pragma: no cover
+    monkey = None
+
+t = TypeVar("t")
+
+# Hashes with other rounds stay valid, but are replaced on the next login
+password_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    pbkdf2_sha256__default_rounds=PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__min_rounds=PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__max_rounds=PASSWORD_HASH_ROUNDS,
+)
+
+
+@dataclass()
+class HashingStats:
+    total: int = 0
+    pending: int = 0  # submitted, but not finished yet
+    max_pending: int = 0
+    total_wait: float = 0  # seconds spent in the queue
+    max_wait: float = 0
+    total_time: float = 0  # seconds spent hashing
+
+
+def measure(function: Callable[..., t], *args) -> tuple[float, float, t]:
+    started: float = perf_counter()
+    result = function(*args)
+    return started, perf_counter(), result
+
+
+class HashingPool:
+    """
+    Runs CPU-heavy hashing in native threads with bounded concurrency.
+    Under gevent it uses gevent's native threadpool, so the waiting greenlet
+    yields and the event loop keeps serving sockets while hashes are computed
+    """
+
+    def __init__(self, workers: int = HASHING_WORKERS) -> None:
+        self.workers: int = workers
+        self.executor: ThreadPoolExecutor | GeventThreadPool | None = None
+        self.stats = HashingStats()
+        self.lock = Lock()
+
+    def ensure_executor(self) -> ThreadPoolExecutor | GeventThreadPool:
+        if self.executor is None:  # lazy, so that pools are created post-fork
+            if monkey is not None and monkey.is_module_patched("threading"):
+                self.executor = GeventThreadPool(self.workers)
+            else:
+                self.executor = ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="hashing"
+                )
+        return self.executor
+
+    def submit(self, function: Callable[..., t], *args) -> tuple[float, float, t]:
+        executor = self.ensure_executor()
+        if isinstance(executor, ThreadPoolExecutor):
+            return executor.submit(measure, function, *args).result()
+        return executor.spawn(measure, function, *args).get()  # pragma: no cover
+
+    def run(self, function: Callable[..., t], *args) -> t:
+        with self.lock:
+            self.stats.pending += 1
+            self.stats.max_pending = max(self.stats.max_pending, self.stats.pending)
+
+        submitted: float = perf_counter()
+        try:
+            started, finished, result = self.submit(function, *args)
+        except Exception:
+            with self.lock:
+                self.stats.pending -= 1
+            raise
+
+        with self.lock:
+            self.stats.pending -= 1
+            self.stats.total += 1
+            self.stats.total_wait += started - submitted
+            self.stats.max_wait = max(self.stats.max_wait, started - submitted)
+            self.stats.total_time += finished - started
+        return result
+
+
+hashing_pool = HashingPool()
+
+
+def hash_password(password: str) -> str:
+    return hashing_pool.run(password_context.hash, password)
+
+
+def verify_password(password: str, hashed: str) -> tuple[bool, str | None]:
+    """
+    :return: if the password is valid & a new hash for it, if the stored one
+             was made with outdated parameters (otherwise None)
+    """
+    return hashing_pool.run(password_context.verify_and_update, password, hashed)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from flask_restx import Resource
+from pydantic import BaseModel
+
+from moderation import MUBController, permission_index
+from other.hashing import hashing_pool, HashingStats
+from other.profiler_mub import monitoring_section
+
+hashing_monitoring = permission_index.add_permission(monitoring_section, "hashing")
+controller = MUBController("hashing")
+
+
+class HashingStatsModel(BaseModel):
+    total: int
+    pending: int
+    max_pending: int
+    total_wait: float
+    max_wait: float
+    total_time: float
+
+
+@controller.route("/")
+class HashingStatsResource(Resource):
+    @controller.require_permission(hashing_monitoring, use_moderator=False)
+    @controller.marshal_with(HashingStatsModel)
+    def get(self) -> HashingStats:
+        """Queueing metrics of the password hashing pool (times in seconds)"""
+        return hashing_pool.stats
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from smtplib import SMTPException
+
+from flask_mail import Connection
+
+from common import app, db, mail
+from other.discorder import send_message as send_discord_message, WebhookURLs
+from other.emailer import generate_emails
+from other.outbox_db import OutboxEmail
+
+OUTBOX_BATCH_SIZE: int = 50
+OUTBOX_INTERVAL: float = 5  # seconds between outbox checks
+
+
+def report_failed_emails(failed: list[OutboxEmail]) -> None:
+    if len(failed) == 0:
+        return
+    errors: str = "\n".join(
+        f"{email.receiver} (attempt {email.attempts}): {email.last_error}"
+        for email in failed
+    )
+    send_discord_message(
+        WebhookURLs.MAILBT, f"{len(failed)} email(s) not sent:\n```{errors}```"
+    )
+
+
+def deliver_emails(
+    connection: Connection,
+    emails: list[OutboxEmail],
+    sent: list[OutboxEmail],
+    failed: list[OutboxEmail],
+) -> None:
+    for email, message in zip(emails, generate_emails(emails)):
+        try:
+            connection.send(message)
+        except SMTPException as e:
+            email.mark_failed(repr(e))
+            failed.append(email)
+        else:
+            sent.append(email)
+
+
+def cleanup_outbox(sent: list[OutboxEmail], failed: list[OutboxEmail]) -> None:
+    for email in sent:
+        email.delete()
+    for email in failed:
+        if email.is_exhausted():
+            email.delete()
+    db.session.commit()
+
+
+def send_queued_emails(limit: int = OUTBOX_BATCH_SIZE) -> int:
+    """
+    Sends a batch of due emails from the outbox over a single SMTP connection.
+    Failed emails are retried with backoff until they run out of attempts,
+    all failures of the batch are reported to discord in one message
+
+    :return: number of emails processed
+    """
+    emails: list[OutboxEmail] = OutboxEmail.find_due(limit)
+    if len(emails) == 0:
+        return 0
+
+    sent: list[OutboxEmail] = []
+    failed: list[OutboxEmail] = []
+    try:
+        with mail.connect() as connection:
+            deliver_emails(connection, emails, sent, failed)
+    except (SMTPException, OSError) as e:  # connection-level failure
+        for email in emails:
+            if email not in sent and email not in failed:
+                email.mark_failed(repr(e))
+                failed.append(email)
+
+    cleanup_outbox(sent, failed)
+    report_failed_emails(failed)
+    return len(emails)
+
+
+def run_email_sender(sleep: Callable[[float], None]) -> None:  # pragma: no cover
+    """
+    Background loop for the outbox. `sleep` should cooperate with the server's
+    async mode (use `socketio.sleep`), so the loop doesn't block the worker
+    """
+    while True:  # noqa: WPS457
+        with app.app_context():
+            try:
+                while send_queued_emails() == OUTBOX_BATCH_SIZE:
+                    sleep(0)
+            except Exception as e:  # noqa: PIE786
+                logging.error("Outbox sending failed", exc_info=e)
+                db.session.rollback()
+        sleep(OUTBOX_INTERVAL)
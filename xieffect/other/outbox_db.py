@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import ClassVar, Self
+
+from sqlalchemy import select
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.sqltypes import String, Text
+
+from common import Base, db
+
+
+class OutboxEmail(Base):
+    __tablename__ = "email_outbox"
+    max_attempts: ClassVar[int] = 5
+    retry_delay: ClassVar[timedelta] = timedelta(minutes=1)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    receiver: Mapped[str] = mapped_column(String(100))
+    theme: Mapped[str] = mapped_column(String(200))
+    filename: Mapped[str] = mapped_column(String(100))
+    code: Mapped[str] = mapped_column(Text)
+
+    created: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    attempts: Mapped[int] = mapped_column(default=0)
+    next_attempt: Mapped[datetime] = mapped_column(default=datetime.utcnow, index=True)
+    last_error: Mapped[str | None] = mapped_column(Text)
+
+    @classmethod
+    def create(cls, receiver: str, code: str, filename: str, theme: str) -> Self:
+        return super().create(
+            receiver=receiver,
+            code=code,
+            filename=filename,
+            theme=theme,
+        )
+
+    @classmethod
+    def find_due(cls, limit: int) -> list[Self]:
+        return db.get_all(
+            select(cls)
+            .filter(cls.next_attempt <= datetime.utcnow())
+            .order_by(cls.next_attempt)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+    def is_exhausted(self) -> bool:
+        return self.attempts >= self.max_attempts
+
+    def mark_failed(self, error: str) -> None:
+        """Records the error & schedules the next attempt with exponential backoff"""
+        self.attempts += 1
+        self.last_error = error
+        self.next_attempt = datetime.utcnow() + self.retry_delay * 2 ** (
+            self.attempts - 1
+        )
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from cProfile import Profile
+from dataclasses import dataclass
+from datetime import datetime
+from os import remove, scandir
+from pathlib import Path
+from random import random
+from threading import Lock
+
+from flask import g, request  # noqa: WPS347
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+from common import absolute_path, app
+from common.consts import PROFILING_SAMPLE_RATE
+
+PROFILES_PATH: str = absolute_path("files/temp/profiles/")
+PROFILES_LIMIT: int = 200
+PROFILING_HEADER: str = "X-Profile"
+PROFILING_ARGUMENT: str = "profile"
+TOKEN_MAX_AGE: int = 60 * 60  # one hour
+
+serializer = URLSafeTimedSerializer(app.config["SECRET_KEY"], salt="profiler")
+profiling_slot = Lock()  # one profiled request per worker
+
+
+@dataclass()
+class ProfileEntry:
+    filename: str
+    size: int
+    created: datetime
+
+
+def generate_profiling_token() -> str:
+    return serializer.dumps(PROFILING_ARGUMENT)
+
+
+def check_profiling_token(token: str) -> bool:
+    try:
+        serializer.loads(token, max_age=TOKEN_MAX_AGE)
+    except BadSignature:
+        return False
+    return True
+
+
+def is_requested() -> bool:
+    token: str | None = request.headers.get(PROFILING_HEADER)
+    if token is None:
+        token = request.args.get(PROFILING_ARGUMENT)
+    return token is not None and check_profiling_token(token)
+
+
+def is_sampled() -> bool:
+    return PROFILING_SAMPLE_RATE > 0 and random() * 100 < PROFILING_SAMPLE_RATE
+
+
+def start_profiling() -> None:
+    """
+    Enables cProfile for the current request if a moderator asked for it
+    (with a profiling token in the header or in the query) or if the request
+    got sampled. Only costs a header lookup when neither is the case
+
+    cProfile works per OS thread, which greenlets of the worker share, so
+    other requests, served meanwhile, get into the profile too. Requests
+    are not profiled while another one is (to keep the first profile intact)
+    """
+    if is_requested():
+        g.profiling_reason = "requested"
+    elif is_sampled():
+        g.profiling_reason = "sampled"
+    else:
+        return
+    if not profiling_slot.acquire(blocking=False):
+        return
+    profiler = Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # another profiling tool is active (python 3.12+)
+        profiling_slot.release()
+        return
+    g.profiler = profiler
+
+
+def finish_profiling(_=None) -> None:
+    profiler: Profile | None = g.pop("profiler", None)
+    if profiler is None:
+        return
+    profiler.disable()
+    profiling_slot.release()
+
+    endpoint: str = (request.endpoint or "unknown").replace(".", "-")
+    timestamp: str = datetime.utcnow().strftime("%Y%m%d-%H%M%S-%f")
+    filename = f"{timestamp}-{request.method.lower()}-{endpoint}-{g.profiling_reason}"
+
+    Path(PROFILES_PATH).mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(f"{PROFILES_PATH}{filename}.prof")
+    remove_old_profiles()
+
+
+def list_profiles() -> list[ProfileEntry]:
+    """Lists stored profiles, the newest first"""
+    if not Path(PROFILES_PATH).exists():
+        return []
+    entries = [
+        ProfileEntry(
+            filename=entry.name,
+            size=entry.stat().st_size,
+            created=datetime.utcfromtimestamp(entry.stat().st_mtime),
+        )
+        for entry in scandir(PROFILES_PATH)
+        if entry.is_file() and entry.name.endswith(".prof")
+    ]
+    return sorted(entries, key=lambda entry: entry.filename, reverse=True)
+
+
+def remove_old_profiles() -> None:
+    for entry in list_profiles()[PROFILES_LIMIT:]:
+        remove(PROFILES_PATH + entry.filename)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from flask import Response, send_from_directory
+from flask_fullstack import counter_parser
+from flask_restx import Resource
+from pydantic import BaseModel
+
+from moderation import MUBController, permission_index
+from other.profiler import (
+    PROFILES_PATH,
+    generate_profiling_token,
+    list_profiles,
+    ProfileEntry,
+)
+
+monitoring_section = permission_index.add_section("monitoring")
+profiling = permission_index.add_permission(monitoring_section, "profiling")
+controller = MUBController("profiler")
+
+
+class ProfileModel(BaseModel):
+    filename: str
+    size: int
+    created: datetime
+
+
+@controller.route("/token/")
+class ProfilingTokenIssuer(Resource):
+    @controller.require_permission(profiling, use_moderator=False)
+    @controller.a_response()
+    def post(self) -> str:
+        """
+        Issues a short-lived token. Requests carrying it in the `X-Profile`
+        header (or in the `profile` query argument) are profiled,
+        one at a time per worker (others are served without profiling)
+        """
+        return generate_profiling_token()
+
+
+@controller.route("/")
+class ProfileLister(Resource):
+    @controller.require_permission(profiling, use_moderator=False)
+    @controller.argument_parser(counter_parser)
+    @controller.lister(20, ProfileModel)
+    def get(self, start: int, finish: int) -> list[ProfileEntry]:
+        return list_profiles()[start:finish]
+
+
+@controller.route("/<filename>/")
+class ProfileManager(Resource):
+    @controller.require_permission(profiling, use_moderator=False)
+    def get(self, filename: str) -> Response:
+        """Downloads the profile as cProfile stats (`.prof`)"""
+        return send_from_directory(PROFILES_PATH, filename, as_attachment=True)
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from os import getpid
+from socket import gethostname
+from time import perf_counter
+from traceback import format_exception
+from typing import Protocol, TypeVar
+
+from common import app, db
+from other.error_groups import error_groups
+from other.scheduler_db import JobRun, JobLease
+
+LEASE_DURATION: timedelta = timedelta(minutes=30)  # for jobs, stuck in a worker
+SCHEDULER_TICK: float = 60  # max seconds between checks for due jobs
+RUNS_KEPT: timedelta = timedelta(days=30)
+CRON_FIELDS: dict[str, tuple[int, int]] = {  # noqa: WPS407
+    "minute": (0, 59),
+    "hour": (0, 23),
+    "day": (1, 31),
+    "month": (1, 12),
+    "weekday": (0, 6),
+}
+CRON_SEARCH_LIMIT: timedelta = timedelta(days=366 * 4)
+
+JobFunction = TypeVar("JobFunction", bound=Callable[[], None])
+
+
+class Trigger(Protocol):
+    def next_time(self, after: datetime) -> datetime:
+        """:return: the first time to run the job after `after`"""
+
+
+class IntervalTrigger:
+    def __init__(self, seconds: float) -> None:
+        self.interval: timedelta = timedelta(seconds=seconds)
+
+    def next_time(self, after: datetime) -> datetime:
+        return after + self.interval
+
+    def __str__(self) -> str:
+        return f"every {self.interval.total_seconds():g}s"
+
+
+def parse_cron_field(field: str, lowest: int, highest: int) -> frozenset[int]:
+    """Supports ``*``, numbers, ranges (``1-5``), steps (``*/15``) & lists"""
+    values: set[int] = set()
+    for part in field.split(","):
+        bounds, _, step = part.partition("/")
+        if bounds == "*":
+            start, end = lowest, highest
+        elif "-" in bounds:
+            start, end = map(int, bounds.split("-"))
+        else:
+            start = int(bounds)
+            end = highest if step else start
+        if start < lowest or start > end or end > highest:
+            raise ValueError(f"Cron field {field} is out of {lowest}-{highest}")
+        values.update(range(start, end + 1, int(step or 1)))
+    return frozenset(values)
+
+
+class CronTrigger:
+    """
+    Five fields: minute, hour, day of month, month & day of week (0 is sunday),
+    in UTC. Unlike in cron, both day fields have to match, if both are set
+    """
+
+    def __init__(self, expression: str) -> None:
+        fields: list[str] = expression.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(f"Cron expression {expression} should have 5 fields")
+        self.expression: str = expression
+        self.fields: dict[str, frozenset[int]] = {
+            name: parse_cron_field(field, *bounds)
+            for field, (name, bounds) in zip(fields, CRON_FIELDS.items())
+        }
+        self.next_time(datetime(2000, 1, 1))  # noqa: WPS432  # fails if impossible
+
+    def misses_day(self, moment: datetime) -> bool:
+        return (
+            moment.month not in self.fields["month"]
+            or moment.day not in self.fields["day"]
+            or moment.isoweekday() % 7 not in self.fields["weekday"]
+        )
+
+    def next_time(self, after: datetime) -> datetime:
+        """Skips whole days & hours, that don't match, instead of each minute"""
+        moment: datetime = after.replace(second=0, microsecond=0)
+        moment += timedelta(minutes=1)
+        limit: datetime = moment + CRON_SEARCH_LIMIT
+        while moment < limit:
+            if self.misses_day(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.fields["hour"]:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.fields["minute"]:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"Cron expression {self.expression} never matches")
+
+    def __str__(self) -> str:
+        return self.expression
+
+
+@dataclass()
+class Job:
+    name: str
+    function: Callable[[], None]
+    trigger: Trigger
+    lease: timedelta
+    next_run: datetime
+
+    @property
+    def timing(self) -> str:
+        return str(self.trigger)
+
+    @property
+    def last_outcome(self) -> JobRun | None:
+        return JobRun.find_last(self.name)
+
+
+class Scheduler:
+    """
+    Runs periodic jobs on the server's own greenlets. Every worker schedules
+    all jobs, but a job is only run by the worker, that acquires its lease
+    for the period (see `JobLease.next_run`)
+    """
+
+    def __init__(self, holder: str) -> None:
+        self.holder: str = holder
+        self.jobs: dict[str, Job] = {}
+
+    def job(
+        self,
+        name: str,
+        trigger: Trigger,
+        lease: timedelta = LEASE_DURATION,
+    ) -> Callable[[JobFunction], JobFunction]:
+        """Registers the decorated function. It should commit its own changes"""
+
+        def job_wrapper(function: JobFunction) -> JobFunction:
+            next_run: datetime = trigger.next_time(datetime.utcnow())
+            self.jobs[name] = Job(name, function, trigger, lease, next_run)
+            return function
+
+        return job_wrapper
+
+    def list_jobs(self) -> list[Job]:
+        return sorted(self.jobs.values(), key=lambda job: job.name)
+
+    def run_job(
+        self,
+        job: Job,
+        manual: bool = False,
+        next_run: datetime | None = None,
+    ) -> JobRun | None:
+        """
+        Records the run with its duration, failures are also reported
+        as error groups (as from the ``job:<name>`` endpoint)
+
+        :param next_run: for scheduled runs, the start of the next period
+        :return: the run, None if the job is being run by another worker
+            or was already run in this period
+        """
+        acquired: bool = JobLease.acquire(job.name, self.holder, job.lease, next_run)
+        db.session.commit()
+        if not acquired:
+            return None
+
+        started: datetime = datetime.utcnow()
+        timer: float = perf_counter()
+        error: str | None = None
+        try:
+            job.function()
+            db.session.commit()
+        except Exception as e:  # noqa: PIE786
+            db.session.rollback()
+            error = "".join(format_exception(e))
+            error_groups.record(e, f"job:{job.name}")
+
+        run = JobRun.create(job.name, manual, started, perf_counter() - timer, error)
+        JobLease.release(job.name, self.holder)
+        db.session.commit()
+        return run
+
+    def run_pending(self, now: datetime) -> int:
+        """:return: the number of due jobs"""
+        due: list[Job] = [job for job in self.jobs.values() if job.next_run <= now]
+        for job in due:
+            job.next_run = job.trigger.next_time(now)
+            self.run_job(job, next_run=job.next_run)
+        return len(due)
+
+    def seconds_until_next(self, now: datetime) -> float:
+        next_run: datetime = min(
+            (job.next_run for job in self.jobs.values()),
+            default=now + timedelta(seconds=SCHEDULER_TICK),
+        )
+        return min(max((next_run - now).total_seconds(), 0), SCHEDULER_TICK)
+
+    def run(self, sleep: Callable[[float], None]) -> None:  # pragma: no cover
+        """`sleep` should be `socketio.sleep`, same as in `run_email_sender`"""
+        while True:  # noqa: WPS457
+            with app.app_context():
+                try:
+                    self.run_pending(datetime.utcnow())
+                except Exception as e:  # noqa: PIE786
+                    logging.error("Scheduler failed", exc_info=e)
+                    db.session.rollback()
+            sleep(self.seconds_until_next(datetime.utcnow()))
+
+
+scheduler = Scheduler(holder=f"{gethostname()}:{getpid()}")
+
+
+@scheduler.job("prune-job-runs", CronTrigger("15 3 * * *"))
+def prune_job_runs() -> None:
+    JobRun.delete_older(datetime.utcnow() - RUNS_KEPT)
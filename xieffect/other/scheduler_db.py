@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Self
+
+from pydantic_marshals.sqlalchemy import MappedModel
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.sqltypes import String, Text
+
+from common import Base, db
+
+
+class JobLease(Base):
+    """
+    Lock of a scheduled job, held by one worker until released or expired.
+    `next_run` is the job's shared schedule: workers schedule jobs on their own,
+    but only the first one to claim a period runs the job in it
+    """
+
+    __tablename__ = "scheduler_leases"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    holder: Mapped[str | None] = mapped_column(String(100))
+    expires: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    next_run: Mapped[datetime | None] = mapped_column()
+
+    @classmethod
+    def acquire(
+        cls,
+        name: str,
+        holder: str,
+        duration: timedelta,
+        next_run: datetime | None = None,
+    ) -> bool:
+        """
+        Conditional update, so that only one of the competing workers wins
+
+        :param next_run: if set, the lease is only acquired for a due period,
+            which is moved forward to `next_run` in the same update
+        """
+        now: datetime = datetime.utcnow()
+        dialect_insert = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+        db.session.execute(
+            dialect_insert[db.engine.dialect.name](cls)
+            .values(name=name, expires=now)
+            .on_conflict_do_nothing(index_elements=[cls.name])
+        )
+        stmt = update(cls).filter(cls.name == name, cls.expires <= now)
+        if next_run is not None:
+            stmt = stmt.filter(or_(cls.next_run.is_(None), cls.next_run <= now))
+            stmt = stmt.values(next_run=next_run)
+        acquired: str | None = db.get_first(
+            stmt.values(holder=holder, expires=now + duration).returning(cls.name)
+        )
+        return acquired is not None
+
+    @classmethod
+    def renew(cls, name: str, holder: str, duration: timedelta) -> bool:
+        """:return: False if the lease is not held by `holder` anymore"""
+        renewed: str | None = db.get_first(
+            update(cls)
+            .filter_by(name=name, holder=holder)
+            .values(expires=datetime.utcnow() + duration)
+            .returning(cls.name)
+        )
+        return renewed is not None
+
+    @classmethod
+    def release(cls, name: str, holder: str) -> None:
+        db.session.execute(
+            update(cls)
+            .filter_by(name=name, holder=holder)
+            .values(holder=None, expires=datetime.utcnow())
+        )
+
+
+class JobRun(Base):
+    __tablename__ = "scheduler_runs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    job: Mapped[str] = mapped_column(String(100), index=True)
+    manual: Mapped[bool] = mapped_column(default=False)
+    started: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    duration: Mapped[float] = mapped_column()  # seconds
+    error: Mapped[str | None] = mapped_column(Text)  # traceback, if failed
+
+    IndexModel = MappedModel.create(columns=[id, manual, started, duration, error])
+
+    @classmethod
+    def create(
+        cls,
+        job: str,
+        manual: bool,
+        started: datetime,
+        duration: float,
+        error: str | None,
+    ) -> Self:
+        return super().create(
+            job=job,
+            manual=manual,
+            started=started,
+            duration=duration,
+            error=error,
+        )
+
+    @classmethod
+    def find_by_job(cls, job: str, offset: int, limit: int) -> list[Self]:
+        """The most recent runs first"""
+        return db.get_paginated(
+            select(cls).filter_by(job=job).order_by(cls.id.desc()), offset, limit
+        )
+
+    @classmethod
+    def find_last(cls, job: str) -> Self | None:
+        return db.get_first(select(cls).filter_by(job=job).order_by(cls.id.desc()))
+
+    @classmethod
+    def delete_older(cls, before: datetime) -> None:
+        db.session.execute(delete(cls).filter(cls.started < before))
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from flask_fullstack import counter_parser, PydanticModel
+from flask_fullstack.restx.marshals import v2_model_to_ffs
+from flask_restx import Resource
+
+from moderation import MUBController, permission_index
+from other.profiler_mub import monitoring_section
+from other.scheduler import Job, scheduler
+from other.scheduler_db import JobRun
+
+scheduler_management = permission_index.add_permission(monitoring_section, "scheduler")
+controller = MUBController("scheduler")
+
+
+JobRunModel = v2_model_to_ffs(JobRun.IndexModel)
+
+
+class JobModel(PydanticModel):
+    name: str
+    timing: str
+    next_run: datetime
+    last_outcome: JobRunModel = None
+
+
+def convert_job(job: Job) -> JobModel:
+    last_outcome: JobRun | None = job.last_outcome
+    return JobModel(
+        name=job.name,
+        timing=job.timing,
+        next_run=job.next_run,
+        last_outcome=(
+            None if last_outcome is None else JobRunModel.convert(last_outcome)
+        ),
+    )
+
+
+def find_job(name: str) -> Job:
+    job: Job | None = scheduler.jobs.get(name)
+    if job is None:
+        controller.abort(404, "Job not found")
+    return job
+
+
+@controller.route("/")
+class JobLister(Resource):
+    @controller.require_permission(scheduler_management, use_moderator=False)
+    @controller.marshal_with(JobModel, as_list=True)
+    def get(self) -> list[JobModel]:
+        """Lists jobs with their next (in this worker) & last runs"""
+        return [convert_job(job) for job in scheduler.list_jobs()]
+
+
+@controller.route("/<name>/")
+class JobRunner(Resource):
+    @controller.doc_abort(404, "Job not found")
+    @controller.doc_abort(409, "Job is already running")
+    @controller.require_permission(scheduler_management, use_moderator=False)
+    @controller.marshal_with(JobRun.IndexModel)
+    def post(self, name: str) -> JobRun:
+        """Runs the job right away, unless another worker is running it"""
+        run: JobRun | None = scheduler.run_job(find_job(name), manual=True)
+        if run is None:
+            controller.abort(409, "Job is already running")
+        return run
+
+
+@controller.route("/<name>/runs/")
+class JobRunLister(Resource):
+    @controller.doc_abort(404, "Job not found")
+    @controller.require_permission(scheduler_management, use_moderator=False)
+    @controller.argument_parser(counter_parser)
+    @controller.lister(20, JobRun.IndexModel)
+    def get(self, name: str, start: int, finish: int) -> list[JobRun]:
+        """Lists runs of the job, the most recent first"""
+        return JobRun.find_by_job(find_job(name).name, start, finish - start)
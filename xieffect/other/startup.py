@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from time import perf_counter
+
+from flask import Flask
+
+Phase = Callable[[], None]
+
+
+class StartupPipeline:
+    """
+    Times startup phases & keeps non-critical ones for later, so that
+    the server starts accepting requests before they are done
+    """
+
+    def __init__(self) -> None:
+        self.started: float = perf_counter()
+        self.timings: dict[str, float] = {}  # milliseconds by phase
+        self.deferred: list[tuple[str, Phase]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started: float = perf_counter()
+        yield
+        self.timings[name] = (perf_counter() - started) * 1000
+
+    def defer(self, name: str, function: Phase) -> None:
+        self.deferred.append((name, function))
+
+    def run_deferred(self, app: Flask) -> None:
+        with app.app_context():
+            while self.deferred:
+                name, function = self.deferred.pop(0)
+                with self.phase(f"{name} (deferred)"):
+                    function()
+
+    def report(self) -> str:
+        total: float = (perf_counter() - self.started) * 1000
+        lines: list[str] = [
+            f"{name}: {duration:.0f}ms" for name, duration in self.timings.items()
+        ]
+        return "\n".join([f"Startup took {total:.0f}ms", *lines])
+
+
+startup = StartupPipeline()
@@ -0,0 +1,102 @@
+"""
+Durable queue for slow side effects, stored in the ``jobs`` table.
+Jobs are enqueued in the current transaction, so they are only run if
+the request (or event) commits. Workers run inside the server (see `wsgi`)
+or separately: ``flask --app manage queue work``
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from datetime import timedelta
+from time import sleep as time_sleep
+from typing import Any, TypeVar
+
+from flask import Blueprint
+
+from common import app, db
+from other.error_groups import error_groups
+from other.task_queue_db import QueuedJob
+
+QUEUE_BATCH_SIZE: int = 20
+QUEUE_INTERVAL: float = 2  # seconds between queue checks
+
+Handler = TypeVar("Handler", bound=Callable[..., None])
+
+handlers: dict[str, Callable[..., None]] = {}
+blueprint = Blueprint("queue", __name__)
+
+
+def handler(kind: str) -> Callable[[Handler], Handler]:
+    """
+    Registers the decorated function for jobs of this kind. It's called with
+    the payload as keyword arguments & should be safe to retry, as a job can
+    fail (or the worker can die) after some of the work is done
+    """
+
+    def handler_wrapper(function: Handler) -> Handler:
+        handlers[kind] = function
+        return function
+
+    return handler_wrapper
+
+
+def enqueue(
+    kind: str,
+    key: str | None = None,
+    delay: timedelta | None = None,
+    **payload: Any,
+) -> None:
+    """
+    :param key: idempotency key, the job is skipped if one with the key is pending
+    :param delay: postpones the first attempt
+    :param payload: handler's arguments, should be serializable to JSON
+    """
+    QueuedJob.enqueue(kind, payload, key, delay)
+
+
+def run_job(job: QueuedJob) -> None:
+    """Finished & exhausted jobs are deleted, failures are recorded as error groups"""
+    job_id: int = job.id
+    kind: str = job.kind
+    try:
+        handlers[kind](**job.payload)
+    except Exception as e:  # noqa: PIE786
+        db.session.rollback()
+        error_groups.record(e, f"queue:{kind}")
+        job = QueuedJob.find_by_id(job_id)
+        if job.is_exhausted():
+            job.delete()
+        else:
+            job.mark_failed(repr(e))
+    else:
+        job.delete()
+    db.session.commit()
+
+
+def work_queue(limit: int = QUEUE_BATCH_SIZE) -> int:
+    """:return: number of processed jobs"""
+    jobs: list[QueuedJob] = QueuedJob.claim_due(limit)
+    db.session.commit()  # claims are visible to other workers right away
+    for job in jobs:
+        run_job(job)
+    return len(jobs)
+
+
+def run_queue_worker(sleep: Callable[[float], None]) -> None:  # pragma: no cover
+    """Background loop, `sleep` is the same as in `run_email_sender`"""
+    while True:  # noqa: WPS457
+        with app.app_context():
+            try:
+                while work_queue() == QUEUE_BATCH_SIZE:
+                    sleep(0)
+            except Exception as e:  # noqa: PIE786
+                logging.error("Queue worker failed", exc_info=e)
+                db.session.rollback()
+        sleep(QUEUE_INTERVAL)
+
+
+@blueprint.cli.command("work")
+def work_cli() -> None:  # pragma: no cover
+    run_queue_worker(time_sleep)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, ClassVar, Self
+
+from sqlalchemy import JSON, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.sqltypes import String, Text
+
+from common import Base, db
+
+
+class QueuedJob(Base):
+    __tablename__ = "jobs"
+    max_attempts: ClassVar[int] = 5
+    retry_delay: ClassVar[timedelta] = timedelta(minutes=1)
+    lease: ClassVar[timedelta] = timedelta(minutes=10)  # until a claim is retried
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(100))
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON)
+    key: Mapped[str | None] = mapped_column(String(200), unique=True)
+
+    created: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    attempts: Mapped[int] = mapped_column(default=0)
+    next_attempt: Mapped[datetime] = mapped_column(default=datetime.utcnow, index=True)
+    last_error: Mapped[str | None] = mapped_column(Text)
+
+    @classmethod
+    def enqueue(
+        cls,
+        kind: str,
+        payload: dict[str, Any],
+        key: str | None,
+        delay: timedelta | None,
+    ) -> None:
+        """Jobs with the key of a pending job are skipped"""
+        dialect_insert = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+        db.session.execute(
+            dialect_insert[db.engine.dialect.name](cls)
+            .values(
+                kind=kind,
+                payload=payload,
+                key=key,
+                next_attempt=datetime.utcnow() + (delay or timedelta()),
+            )
+            .on_conflict_do_nothing(index_elements=[cls.key])
+        )
+
+    @classmethod
+    def claim_due(cls, limit: int) -> list[Self]:
+        """
+        Postgres skips rows, locked by other workers. SQLite has no row locks,
+        but the conditional update still makes sure each job is claimed once.
+        Claimed jobs are due again after the lease, in case the worker dies
+        """
+        now: datetime = datetime.utcnow()
+        ids: list[int] = db.get_all(
+            select(cls.id)
+            .filter(cls.next_attempt <= now)
+            .order_by(cls.next_attempt)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return db.get_all(
+            update(cls)
+            .filter(cls.id.in_(ids), cls.next_attempt <= now)
+            .values(next_attempt=now + cls.lease, attempts=cls.attempts + 1)
+            .returning(cls)
+        )
+
+    @classmethod
+    def find_by_id(cls, entry_id: int) -> Self | None:
+        return db.get_first(select(cls).filter_by(id=entry_id))
+
+    def is_exhausted(self) -> bool:
+        return self.attempts >= self.max_attempts
+
+    def mark_failed(self, error: str) -> None:
+        """Records the error & schedules the next attempt with exponential backoff"""
+        self.last_error = error
+        self.next_attempt = datetime.utcnow() + self.retry_delay * 2 ** (
+            self.attempts - 1
+        )
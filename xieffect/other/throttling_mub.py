@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from flask_restx import Resource
+from pydantic import BaseModel
+
+from common.throttling import limiter, RateLimitStats
+from moderation import MUBController, permission_index
+from other.profiler_mub import monitoring_section
+
+throttling_monitoring = permission_index.add_permission(
+    monitoring_section, "throttling"
+)
+controller = MUBController("throttling")
+
+
+class RateLimitStatsModel(BaseModel):
+    name: str
+    allowed: int
+    rejected: int
+
+
+@controller.route("/")
+class RateLimitStatsResource(Resource):
+    @controller.require_permission(throttling_monitoring, use_moderator=False)
+    @controller.marshal_with(RateLimitStatsModel, as_list=True)
+    def get(self) -> list[RateLimitStats]:
+        """Allowed & rejected requests per rate limit since the start"""
+        return sorted(limiter.stats.values(), key=lambda stats: stats.name)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from pathlib import Path
+from time import perf_counter
+
+from benchmarks.imports import group_by_package, parse_importtime, profile_imports
+from benchmarks.reports import (
+    format_report,
+    percentile,
+    read_baseline,
+    write_baseline,
+    ScenarioResult,
+)
+from benchmarks.sockets import LoadReport, LoadStats
+
+
+def test_percentiles():
+    samples: list[float] = [float(sample) for sample in range(1, 101)]
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 99) == 99
+    assert percentile([5.0], 90) == 5
+
+    result = ScenarioResult.from_samples("test", samples[::-1], queries=3)
+    assert (result.p50, result.p90, result.p99) == (50, 90, 99)
+
+
+def test_baseline_comparison(tmp_path: Path):
+    baseline = [
+        ScenarioResult("fast", p50=1, p90=2, p99=3, queries=2),
+        ScenarioResult("slow", p50=10, p90=20, p99=30, queries=5),
+    ]
+    path = tmp_path / "sqlite.json"
+    write_baseline(path, baseline)
+    assert read_baseline(path) == {result.name: result for result in baseline}
+    assert not read_baseline(tmp_path / "missing.json")
+
+    results = [
+        ScenarioResult("fast", p50=1, p90=2.4, p99=3, queries=2),
+        ScenarioResult("slow", p50=10, p90=30, p99=40, queries=6),
+        ScenarioResult("new", p50=1, p90=1, p99=1, queries=1),
+    ]
+    rows, regressed = format_report(results, read_baseline(path), tolerance=0.25)
+    assert regressed
+    assert "REGRESSION" not in rows[1]
+    assert "p90 20.0ms -> 30.0ms" in rows[2]
+    assert "queries 5 -> 6" in rows[2]
+    assert "REGRESSION" not in rows[3]
+
+
+def test_socketio_report_check():
+    stats = LoadStats()
+    stats.acks["send-message"].extend(
+        10.0 if index < 9 else 900.0 for index in range(11)
+    )
+    stats.record_broadcast("load 0/1", perf_counter(), receivers=3)
+    for _ in range(2):
+        stats.record_delivery("load 0/1")
+    stats.record_delivery("unknown")
+
+    report = LoadReport.from_stats(stats, clients=4, chat_clients=4, duration=1)
+    assert report.acks["send-message"]["count"] == 11
+    assert (report.expected_deliveries, report.dropped_deliveries) == (3, 1)
+    assert report.fanout["count"] == 2
+
+    failures = report.check(max_ack_p90=500, max_fanout_p90=500)
+    assert len(failures) == 2
+    assert failures[0].startswith("send-message ack p90 900.0ms")
+    assert not report.check(max_ack_p90=1000, max_fanout_p90=500, max_loss_rate=0.5)
+
+
+def test_importtime_parsing():
+    output: str = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |     sqlalchemy.sql",
+            "import time:        50 |        150 |   sqlalchemy",
+            "import time:       300 |        300 |   flask",
+            "import time:        20 |        470 | common",
+            "Traceback (most recent call last):",
+        ]
+    )
+    timings = parse_importtime(output)
+    assert [timing.module for timing in timings] == [
+        "sqlalchemy.sql",
+        "sqlalchemy",
+        "flask",
+        "common",
+    ]
+    assert (timings[0].depth, timings[3].depth) == (2, 0)
+    assert timings[3].cumulative == 470
+    assert group_by_package(timings) == {"flask": 300, "sqlalchemy": 150, "common": 20}
+
+
+def test_workers_skip_benchmarks():
+    """Benchmark commands are only registered by `benchmarks.app`"""
+    assert "benchmarks" not in group_by_package(profile_imports("api"))
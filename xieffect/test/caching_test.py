@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from itertools import count
+from typing import Any
+
+from pytest import fixture, mark
+from pytest_mock import MockerFixture
+from sqlalchemy import update
+
+from common import db
+from common.caching import Cache, cache, MemoryInvalidations, RedisInvalidations
+from users.users_db import User
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, Any] = {}
+
+    def mget(self, keys: list[str]) -> list[Any]:
+        return [self.values.get(key) for key in keys]
+
+    def pipeline(self) -> FakeRedis:
+        return self
+
+    def set(self, key: str, value: Any, ex: int) -> None:  # noqa: A003 U100
+        self.values[key] = str(value).encode("utf-8")
+
+    def execute(self) -> None:
+        pass  # commands are executed right away
+
+
+@fixture
+def ticking_time(mocker: MockerFixture) -> None:
+    """Not for tests with the global `cache`, it holds invalidations in real time"""
+    mocker.patch("common.caching.time", side_effect=count(1000))
+
+
+@mark.parametrize(
+    "invalidations",
+    [
+        MemoryInvalidations(ttl=60),
+        RedisInvalidations(FakeRedis(), ttl=60),
+    ],
+    ids=["memory", "redis"],
+)
+def test_tagged_cache(invalidations, ticking_time: None):  # noqa: U100
+    tagged_cache = Cache(invalidations, ttl=60, max_entries=2)
+    created: list[str] = []
+
+    def get(key: str, *tags: str) -> str:
+        return tagged_cache.get_or_create(key, tags, lambda: created.append(key))
+
+    get("roles", "roles:community:1")
+    get("roles", "roles:community:1")
+    assert created == ["roles"]
+
+    tagged_cache.invalidate(["roles:community:2"])
+    get("roles", "roles:community:1")
+    assert created == ["roles"]
+
+    tagged_cache.invalidate(["roles:community:1"])
+    get("roles", "roles:community:1")
+    assert created == ["roles", "roles"]
+
+    get("community", "community:1")
+    get("profile", "users:1")  # least recently used "roles" is evicted
+    get("roles", "roles:community:1")
+    assert created == ["roles", "roles", "community", "profile", "roles"]
+    assert tagged_cache.stats == {"hits": 2, "misses": 5}
+
+
+def test_cache_ttl(ticking_time: None):  # noqa: U100
+    tagged_cache = Cache(MemoryInvalidations(ttl=2), ttl=2)
+    created: list[int] = []
+
+    def create() -> None:
+        created.append(1)
+
+    for _ in range(4):  # each call to time() is a second later
+        tagged_cache.get_or_create("key", (), create)
+    assert len(created) == 2
+
+
+def test_invalidations_limit():
+    invalidations = MemoryInvalidations(ttl=60, max_tags=2)
+    for now, tag in enumerate("abc", start=1):
+        invalidations.invalidate([tag], now)
+    assert list(invalidations.times) == ["b", "c"]
+    assert invalidations.latest(("a",)) == 1  # evicted, but still stale
+    assert invalidations.latest(("b", "c")) == 3
+    assert invalidations.latest(()) == 0
+
+    invalidations.invalidate(["b"], 63)  # "c" is older than any entry now
+    assert list(invalidations.times) == ["b"]
+    assert invalidations.latest(("c",)) == 1
+
+
+def test_commit_invalidation(test_user_id: int):
+    user_tag: str = f"users:{test_user_id}"
+    created: list[str] = []
+
+    def get(*tags: str) -> None:
+        cache.get_or_create(f"test:{tags}", tags, lambda: created.append(tags))
+
+    get(user_tag)
+    user: User = User.find_by_id(test_user_id)
+    theme: str = user.theme
+    user.theme = "dark"
+    db.session.flush()
+    get(user_tag)  # not committed yet
+    assert len(created) == 1
+
+    db.session.commit()
+    get(user_tag)
+    assert len(created) == 2
+
+    get("users")
+    db.session.execute(  # bulk statements invalidate the whole table
+        update(User).filter_by(id=test_user_id).values(theme="light")
+    )
+    db.session.rollback()  # anything cached during the transaction is dropped
+    get("users")
+    assert len(created) == 4
+
+    User.find_by_id(test_user_id).theme = theme
+    db.session.commit()
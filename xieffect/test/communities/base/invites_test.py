@@ -10,7 +10,12 @@ from pydantic_marshals.contains import assert_contains
 from pytest import mark
 from pytest_mock import MockerFixture
 
+from common import db
 from communities.base.invitations_db import Invitation
+from communities.base.invitations_sweeper import (
+    sweep_all_invitations,
+    sweep_invitations,
+)
 from communities.base.meta_db import Community
 from test.communities.conftest import COMMUNITY_DATA, assert_create_community
 from test.conftest import delete_by_id
@@ -345,3 +350,39 @@ def test_limit_invitations(
         expected_code=400,
         expected_message="Quantity exceeded",
     )
+
+
+def test_invitation_code_decoding():
+    assert Invitation.decode_code("hey") is None  # bad signature
+    assert Invitation.decode_code(Invitation.serializer.dumps(5)) is None
+    assert Invitation.decode_code(Invitation.serializer.dumps([1])) is None
+    assert Invitation.decode_code(Invitation.serializer.dumps((1, 2))) == (1, 2)
+
+
+def test_invitation_sweeper(client: FlaskTestClient, test_community: int):
+    sweep_all_invitations()  # leftovers from other tests
+    total: int = Invitation.get_count_by_community(test_community)
+    invite_tester = InvitesTester(client, {"community_id": test_community})
+
+    expired_id: int = Invitation.create(test_community, None, -1).id
+    used_up_id: int = Invitation.create(test_community, 0, None).id
+    valid_id: int = Invitation.create(test_community, 1, None).id
+    db.session.commit()
+    assert Invitation.get_count_by_community(test_community) == total + 3
+
+    for invitation_id in (expired_id, used_up_id):
+        assert sweep_invitations(limit=1) == 1
+        delete_data = {"community_id": test_community, "invitation_id": invitation_id}
+        invite_tester.sio1.assert_only_received("delete_invite", delete_data)
+        invite_tester.sio2.assert_only_received("delete_invite", delete_data)
+        invite_tester.assert_nop()
+
+    assert sweep_invitations() == 0
+    Invitation.create(test_community, None, -1)
+    Invitation.create(test_community, 0, None)
+    db.session.commit()
+    sweep_all_invitations(batch_size=2)  # the first batch is full
+    assert Invitation.get_count_by_community(test_community) == total + 1
+    Invitation.find_by_id(valid_id).delete()
+    db.session.commit()
+    assert Invitation.get_count_by_community(test_community) == total
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from benchmarks.redemption import redeem_concurrently, redeem_invitation, redeem_invite
+from common import db
+from communities.base.invitations_db import Invitation
+from test.conftest import delete_by_id
+from users.invites_db import Invite
+
+LIMIT: int = 5
+ATTEMPTS: int = 40
+WORKERS: int = 8
+
+
+def test_concurrent_invite_redemption():
+    invite_id: int = Invite.create(name="concurrent", limit=LIMIT).id
+    db.session.commit()
+
+    report = redeem_concurrently(
+        "invite", redeem_invite(invite_id), LIMIT, ATTEMPTS, WORKERS
+    )
+    assert report.redeemed == LIMIT
+    assert report.throughput > 0
+
+    db.session.expire_all()
+    assert Invite.find_by_id(invite_id).accepted == LIMIT
+    delete_by_id(invite_id, Invite)
+
+
+def test_concurrent_invitation_redemption(community_id: int):
+    invitation_id: int = Invitation.create(community_id, LIMIT, None).id
+    db.session.commit()
+
+    report = redeem_concurrently(
+        "invitation", redeem_invitation(invitation_id), LIMIT, ATTEMPTS, WORKERS
+    )
+    assert report.redeemed == LIMIT
+    assert not report.over_redeemed
+
+    db.session.expire_all()
+    assert Invitation.find_by_id(invitation_id) is None  # deleted when used up
@@ -176,6 +176,9 @@ def test_update_role(
             data.get("permissions", PermissionType.get_all_field_names())
         ),
     }
+    roles_url: str = f"/communities/{test_community}/roles/"
+    old_etag: str = client.get(roles_url, get_json=False).headers["ETag"]
+
     socketio_client.assert_emit_ack(
         event_name="update_role",
         data={**data, **role_ids},
@@ -185,7 +188,9 @@ def test_update_role(
         "update_role",
         {**expected_data, "id": role_ids["role_id"]},  # TODO add community_id?
     )
-    client.get(f"/communities/{test_community}/roles/", expected_json=[expected_data])
+    client.get(  # changes to permissions only should be noticed too
+        roles_url, headers={"If-None-Match": old_etag}, expected_json=[expected_data]
+    )
 
 
 def test_delete_role(
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from common import db
+from communities.tasks.answers_db import normalize_answer, Submission
+from communities.tasks.tests_db import Question, QuestionKind, Test
+from other.task_queue import work_queue
+from test.conftest import delete_by_id, FlaskTestClient
+
+
+def test_normalize_answer():
+    assert normalize_answer(QuestionKind.SIMPLE, "  New   York ") == "new york"
+    assert normalize_answer(QuestionKind.CHOICE, "b, A,,") == frozenset(("a", "b"))
+
+
+def test_answers_grading(
+    client: FlaskTestClient,
+    test_community: int,
+    test_id: int,
+    test_user_id: int,
+):
+    answers_link: str = (
+        f"/communities/{test_community}/tasks/student/{test_id}/answers/"
+    )
+    test_link: str = f"/communities/{test_community}/tests/{test_id}/"
+    simple: Question = Question.create("Capital", QuestionKind.SIMPLE, test_id, "Paris")
+    choice: Question = Question.create("Primes", QuestionKind.CHOICE, test_id, "2,3")
+    detailed: Question = Question.create("Essay", QuestionKind.DETAILED, test_id)
+    answers: list[dict] = [
+        {"question-id": simple.id, "content": " paris"},
+        {"question-id": choice.id, "content": "3, 4"},
+        {"question-id": detailed.id, "content": "Text"},
+    ]
+
+    client.put(answers_link, json={"answers": answers}, expected_status=409)
+    Test.find_by_id(test_id).opened = datetime.utcnow() - timedelta(hours=1)
+    db.session.commit()
+
+    client.put(
+        answers_link,
+        json={"answers": [{"question-id": -1, "content": "Paris"}]},
+        expected_status=404,
+        expected_a=Question.not_found_text,
+    )
+    client.put(
+        answers_link,
+        json={"answers": answers},
+        expected_json={"user-id": test_user_id, "answers": answers},
+    )
+
+    client.post(f"{test_link}grading/")
+    assert work_queue() == 1
+    client.get(
+        answers_link,
+        expected_json={
+            "score": 1,
+            "answers": [
+                {"question-id": simple.id, "correct": True},
+                {"question-id": choice.id, "correct": False},
+                {"question-id": detailed.id},
+            ],
+        },
+    )
+    client.get(
+        f"{test_link}statistics/",
+        expected_json={
+            "submissions": 1,
+            "graded": 1,
+            "questions": [
+                {"question-id": simple.id, "answers": 1, "correct": 1},
+                {"question-id": choice.id, "answers": 1, "correct": 0},
+                {"question-id": detailed.id, "answers": 1, "correct": 0},
+            ],
+        },
+    )
+    submissions = list(client.paginate(f"{test_link}submissions/"))
+    assert [submission["score"] for submission in submissions] == [1]
+
+    Submission.find_by_ids(test_id, test_user_id).delete()
+    for question in (simple, choice, detailed):
+        delete_by_id(question.id, Question)
@@ -129,3 +129,54 @@ def test_delete_question(
         f"/communities/{test_community}/tests/{test_id}/",
         expected_json={"questions": []},
     )
+
+
+def test_edit_questions(
+    client: FlaskTestClient,
+    socketio_client: SocketIOTestClient,
+    test_ids: dict[str, int],
+    question_id: int,
+):
+    created: list[dict[str, str]] = [
+        {"text": f"Question {index}", "kind": "simple"} for index in range(3)
+    ]
+    questions: list[dict] = socketio_client.assert_emit_ack(
+        event_name="edit_questions",
+        data={
+            **test_ids,
+            "created": created,
+            "updated": [{"question_id": question_id, "text": "update"}],
+        },
+        expected_data={**test_ids, "questions": list},
+    )["questions"]
+    assert [question["text"] for question in questions] == [
+        "update",
+        *(question["text"] for question in created),
+    ]
+
+    order: list[int] = [question["id"] for question in reversed(questions)]
+    test_link: str = (
+        f"/communities/{test_ids['community_id']}/tests/{test_ids['test_id']}/"
+    )
+    reordered: dict = client.put(
+        f"{test_link}questions/",
+        json={"order": order, "updated": [{"question-id": order[0], "kind": "choice"}]},
+        expected_json={"questions": [{"id": question_id} for question_id in order]},
+    )
+    assert reordered["questions"][0]["kind"] == "choice"
+    client.get(test_link, expected_json={"questions": reordered["questions"]})
+
+    socketio_client.assert_emit_ack(
+        event_name="edit_questions",
+        data={**test_ids, "order": order[1:]},
+        expected_code=400,
+        expected_message="Order should list every question of the test once",
+    )
+    client.put(
+        f"{test_link}questions/",
+        json={"updated": [{"question-id": -1, "text": "update"}]},
+        expected_status=404,
+        expected_a=Question.not_found_text,
+    )
+    for question in questions[1:]:
+        delete_by_id(question["id"], Question)
@@ -3,11 +3,15 @@ from __future__ import annotations
 from collections.abc import Callable
 from datetime import datetime, timedelta
 
+from flask_fullstack import SocketIOTestClient
 from pytest import mark, fixture, param
 
 from common import db
 from communities.base.meta_db import Participant
 from communities.tasks.tasks_db import Task
+from communities.tasks.tasks_sio import TasksEventSpace
+from communities.tasks.tasks_timers import TaskTimers, TIMERS_LEASE_NAME
+from other.scheduler_db import JobLease
 from test.conftest import FlaskTestClient
 
 
@@ -79,3 +83,36 @@ def test_student_task_getting(
         expected_a=expected_a,
         expected_json=expected_json,
     )
+
+
+def test_task_timers(student: FlaskTestClient, test_community: int, task_id: int):
+    sio_student = SocketIOTestClient(student)
+    room_data: dict[str, int] = {"community_id": test_community}
+    sio_student.assert_emit_success("open_student_tasks", room_data)
+    event_data: dict[str, int] = dict(room_data, task_id=task_id)
+    notify = TasksEventSpace.notify_students
+
+    timers = TaskTimers(holder="test-timers")
+    now: datetime = datetime.utcnow()
+    task: Task = Task.find_by_id(task_id)
+    task.opened = now + timedelta(minutes=1)
+    task.closed = now + timedelta(minutes=2)
+    db.session.commit()
+    timers.tick(now, notify)
+    assert len(timers.timers) == 2
+    assert timers.seconds_until_next(now) == 30  # reloaded before the opening
+
+    task.closed = now + timedelta(minutes=3)
+    timers.schedule(task)
+    db.session.commit()
+
+    timers.tick(now + timedelta(minutes=2), notify)  # the old closing is skipped
+    sio_student.assert_only_received("task_opened", event_data)
+    timers.tick(now + timedelta(minutes=4), notify)
+    sio_student.assert_only_received("task_closed", event_data)
+    assert timers.seconds_until_next(now) == 30
+
+    assert not TaskTimers(holder="other-timers").lead()  # only one worker fires
+    JobLease.release(TIMERS_LEASE_NAME, "test-timers")
+    db.session.commit()
+    sio_student.assert_emit_success("close_student_tasks", room_data)
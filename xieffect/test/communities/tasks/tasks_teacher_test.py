@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 
 import pytest
 from flask_fullstack import dict_cut, SocketIOTestClient
 
 from communities.base.meta_db import Community
+from communities.tasks.task_counters_db import TaskCounter
 from communities.tasks.tasks_db import Task
+from communities.tasks.tests_db import Test
 from test.conftest import delete_by_id, FlaskTestClient
 from users.users_db import User
 
@@ -107,6 +109,65 @@ def test_delete_task(
     )
 
 
+def test_tasks_summary(
+    client: FlaskTestClient,
+    socketio_client: SocketIOTestClient,
+    test_community: int,
+):
+    summary_link: str = f"/communities/{test_community}/tasks/summary/"
+    opened: datetime = datetime.utcnow() - timedelta(hours=1)
+    closed: datetime = datetime.utcnow() + timedelta(hours=1)
+    base_data: dict[str, Any] = {
+        "community_id": test_community,
+        "page_id": 1,
+        "name": "test",
+    }
+
+    task_id: int = socketio_client.assert_emit_ack(
+        event_name="new_task", data=base_data
+    )["id"]
+    test_id: int = socketio_client.assert_emit_ack(
+        event_name="new_test",
+        data=dict(base_data, opened=opened.isoformat(), closed=closed.isoformat()),
+    )["id"]
+    client.get(
+        summary_link,
+        expected_json={
+            "tasks": {"upcoming": 1, "active": 0, "closed": 0},
+            "tests": {"upcoming": 0, "active": 1, "closed": 0},
+        },
+    )
+
+    socketio_client.assert_emit_ack(
+        event_name="update_task",
+        data=dict(base_data, task_id=task_id, opened=opened.isoformat()),
+    )
+    assert TaskCounter.recount_due(limit=10, now=closed + timedelta(seconds=1)) == 1
+    client.get(
+        summary_link,
+        expected_json={
+            "tasks": {"upcoming": 0, "active": 1, "closed": 0},
+            "tests": {"upcoming": 0, "active": 0, "closed": 1},
+        },
+    )
+
+    socketio_client.assert_emit_success(
+        event_name="delete_task",
+        data={"community_id": test_community, "task_id": task_id},
+    )
+    mismatches = TaskCounter.recompute(now=closed + timedelta(seconds=1))
+    assert test_community not in {community_id for community_id, _, _ in mismatches}
+    client.get(
+        summary_link,
+        expected_json={
+            "tasks": {"upcoming": 0, "active": 0, "closed": 0},
+            "tests": {"upcoming": 0, "active": 0, "closed": 1},
+        },
+    )
+    delete_by_id(task_id, Task)
+    delete_by_id(test_id, Test)
+
+
 @pytest.mark.parametrize(
     ("entry_filter", "entry_order", "count"),
     [
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import zlib
+
+from flask import Response
+from pytest import importorskip
+
+from common.compression import compress_response, GZIP_WBITS
+from common.consts import COMPRESSION_MIN_SIZE
+from wsgi import application as app
+
+GZIP_HEADERS = {"Accept-Encoding": "gzip"}  # noqa: WPS407
+LARGE_BODY: bytes = b'{"a": "Success"}' * COMPRESSION_MIN_SIZE
+
+
+def decompress(data: bytes) -> bytes:
+    return zlib.decompress(data, GZIP_WBITS)
+
+
+def test_compression():
+    with app.test_request_context(headers=GZIP_HEADERS):
+        response = compress_response(
+            Response(LARGE_BODY, mimetype="application/json", headers={"ETag": '"v1"'})
+        )
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.get_etag() == ("v1", True)
+    assert int(response.headers["Content-Length"]) < len(LARGE_BODY)
+    assert decompress(response.get_data()) == LARGE_BODY
+
+
+def test_compression_skipped():
+    with app.test_request_context(headers=GZIP_HEADERS):
+        responses = [
+            compress_response(Response(b"[]", mimetype="application/json")),
+            compress_response(Response(LARGE_BODY, mimetype="image/webp")),
+            compress_response(Response(status=304, mimetype="application/json")),
+            compress_response(
+                Response(LARGE_BODY, headers={"Content-Encoding": "gzip"})
+            ),
+        ]
+    with app.test_request_context():  # no Accept-Encoding
+        responses.append(compress_response(Response(LARGE_BODY, mimetype="text/csv")))
+
+    for response in responses:
+        assert response.headers.get("Content-Encoding") in {None, "gzip"}
+        assert response.get_data() in {b"[]", LARGE_BODY, b""}
+
+
+def test_streamed_compression():
+    chunks: list[bytes] = [f"line {index}\n".encode() for index in range(100)]
+    with app.test_request_context(headers=GZIP_HEADERS):
+        response = compress_response(
+            Response(
+                iter(chunks), mimetype="text/plain", headers={"Content-Length": "1"}
+            )
+        )
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Content-Length" not in response.headers
+        assert decompress(b"".join(response.response)) == b"".join(chunks)
+
+
+def test_brotli_compression():
+    brotli = importorskip("brotli")
+    with app.test_request_context(headers={"Accept-Encoding": "gzip, br"}):
+        response = compress_response(Response(LARGE_BODY, mimetype="application/json"))
+        streamed = compress_response(
+            Response(iter([LARGE_BODY]), mimetype="text/plain")
+        )
+        assert (response.content_encoding, streamed.content_encoding) == ("br", "br")
+        assert brotli.decompress(response.get_data()) == LARGE_BODY
+        assert brotli.decompress(b"".join(streamed.response)) == LARGE_BODY
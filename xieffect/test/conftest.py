@@ -13,11 +13,13 @@ from pydantic import constr
 from pydantic_marshals.contains import TypeChecker
 from pytest import fixture
 from pytest_mock import MockerFixture
+from sqlalchemy import delete
 from werkzeug.datastructures import FileStorage
 from werkzeug.test import TestResponse
 
 from common import mail, mail_initialized, Base, db, open_file
 from communities.base.discussion_db import Discussion
+from other.outbox_db import OutboxEmail
 from pages.pages_db import Page
 from users.users_db import User
 from vault.files_db import File, FILES_PATH
@@ -133,11 +135,17 @@ def socketio_client(client: FlaskTestClient) -> SocketIOTestClient:  # noqa: WPS
 
 @fixture
 def mock_mail(mocker: MockerFixture):
+    """Emails are only queued, use `send_queued_emails` to deliver them here"""
     with mail.record_messages() as outbox:
         if not mail_initialized:
             mocker.patch("other.emailer.mail_initialized", side_effect=True)
-            mocker.patch("common._core.mail.send", lambda params: outbox.append(params))
+            mocker.patch(
+                "flask_mail.Connection.send",
+                lambda _, message: outbox.append(message),
+            )
         yield outbox
+    db.session.execute(delete(OutboxEmail))
+    db.session.commit()
 
 
 @fixture(scope="session")
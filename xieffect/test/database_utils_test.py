@@ -5,6 +5,7 @@ from os.path import exists
 
 from common import db
 from other.database_cli import remove_stale
+from other.task_queue import work_queue
 from test.conftest import FlaskTestClient
 from vault.files_db import File, FILES_PATH
 
@@ -20,6 +21,7 @@ def test_remove_stale(test_file_id: int):
 
     remove_stale()
     assert File.find_first_by_kwargs(id=file_id) is None
+    work_queue()
     assert not exists(FILES_PATH + filename)
 
 
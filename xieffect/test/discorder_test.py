@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import loads as load_json
+from threading import Thread
+
+from pytest import fixture
+
+from other.discorder import WebhookDispatcher, WebhookMessage, WebhookURLs
+
+
+class WebhookStub(ThreadingHTTPServer):
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), WebhookStubHandler)
+        self.received: list[tuple[str, str]] = []
+        self.rate_limits: int = 0  # number of next requests to reject
+
+
+class WebhookStubHandler(BaseHTTPRequestHandler):
+    server: WebhookStub
+
+    def do_POST(self) -> None:  # noqa: N802 (http.server hook)
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.server.rate_limits > 0:
+            self.server.rate_limits -= 1
+            self.send_response(429)
+            self.send_header("Retry-After", "0.2")
+        else:
+            webhook_id = self.path.strip("/").partition("?")[0]
+            self.server.received.append((webhook_id, load_json(body)["content"]))
+            self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *_) -> None:
+        pass
+
+
+@fixture
+def webhook_stub() -> Iterator[WebhookStub]:
+    server = WebhookStub()
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@fixture
+def dispatcher(webhook_stub: WebhookStub) -> WebhookDispatcher:
+    host, port = webhook_stub.server_address
+    return WebhookDispatcher(base_url=f"http://{host}:{port}/", limit=3)
+
+
+def test_coalescing(webhook_stub: WebhookStub, dispatcher: WebhookDispatcher):
+    for _ in range(3):
+        assert dispatcher.submit(WebhookMessage(WebhookURLs.ERRORS, "Error"))
+    assert dispatcher.submit(WebhookMessage(WebhookURLs.STATUS, "Status"))
+
+    dispatcher.drain(timeout=5)
+    assert dispatcher.is_empty()
+    assert sorted(webhook_stub.received) == sorted(
+        [
+            (WebhookURLs.ERRORS.value, "Error\n(repeated 3 times)"),
+            (WebhookURLs.STATUS.value, "Status"),
+        ]
+    )
+
+
+def test_queue_limit(webhook_stub: WebhookStub, dispatcher: WebhookDispatcher):
+    for i in range(3):
+        assert dispatcher.submit(WebhookMessage(WebhookURLs.ERRORS, f"Error {i}"))
+    assert not dispatcher.submit(WebhookMessage(WebhookURLs.ERRORS, "Dropped"))
+    assert dispatcher.submit(WebhookMessage(WebhookURLs.ERRORS, "Error 0"))
+
+    dispatcher.drain(timeout=5)
+    assert [content for _, content in webhook_stub.received] == [
+        "Error 0\n(repeated 2 times)",
+        "Error 1",
+        "Error 2",
+    ]
+
+
+def test_retry_after(webhook_stub: WebhookStub, dispatcher: WebhookDispatcher):
+    webhook_stub.rate_limits = 1
+    dispatcher.submit(WebhookMessage(WebhookURLs.ERRORS, "Error"))
+
+    assert dispatcher.send_ready() > 0  # postponed for Retry-After
+    assert not dispatcher.is_empty()
+    assert len(webhook_stub.received) == 0
+
+    dispatcher.submit(WebhookMessage(WebhookURLs.ERRORS, "Error"))
+    dispatcher.drain(timeout=5)
+    assert webhook_stub.received == [
+        (WebhookURLs.ERRORS.value, "Error\n(repeated 2 times)")
+    ]
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from os import utime
+from pathlib import Path
+
+from pytest import fixture
+from pytest_mock import MockerFixture
+
+from other.email_templates import TemplateRegistry
+
+FILENAME = "test-email.html"
+TEMPLATE = """<html>
+<head><style>p { color: red; }</style></head>
+<body>
+<p>Hello!</p>
+<a href="https://xieffect.ru/confirm/&code/">Confirm</a>
+</body>
+</html>"""
+
+
+@fixture
+def registry(tmp_path: Path) -> TemplateRegistry:
+    (tmp_path / FILENAME).write_text(TEMPLATE, encoding="utf-8")
+    return TemplateRegistry(str(tmp_path))
+
+
+def test_template_rendering(registry: TemplateRegistry):
+    message = registry.get(FILENAME).render("test@test.test", "<code>", "Theme")
+    assert message.subject == "Theme"
+    assert message.recipients == ["test@test.test"]
+    assert 'href="https://xieffect.ru/confirm/&lt;code&gt;/"' in message.html
+    assert "&code" not in message.html
+
+    assert "Hello!" in message.body
+    assert "https://xieffect.ru/confirm/<code>/" in message.body
+    assert "color" not in message.body
+    assert "<p>" not in message.body
+
+
+def test_bulk_rendering(registry: TemplateRegistry, mocker: MockerFixture):
+    read_text = mocker.spy(Path, "read_text")
+    recipients = [(f"{i}@test.test", f"code-{i}") for i in range(10)]
+
+    messages = list(registry.render_bulk(FILENAME, "Theme", recipients))
+    assert len(messages) == len(recipients)
+    for message, (receiver, code) in zip(messages, recipients):
+        assert message.recipients == [receiver]
+        assert f"/confirm/{code}/" in message.html
+        assert f"/confirm/{code}/" in message.body
+    assert read_text.call_count == 1
+
+
+def test_template_reloading(registry: TemplateRegistry, tmp_path: Path):
+    assert "Hello!" in registry.get(FILENAME).render_html("code")
+
+    path = tmp_path / FILENAME
+    path.write_text(TEMPLATE.replace("Hello!", "Bye!"), encoding="utf-8")
+    stats = path.stat()
+    utime(path, (stats.st_atime, stats.st_mtime + 1))
+
+    assert "Hello!" in registry.get(FILENAME).render_html("code")
+    assert "Bye!" in registry.get(FILENAME, reload_changed=True).render_html("code")
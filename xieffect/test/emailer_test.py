@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import socket
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import Envelope, Session
+from pytest import fixture
+from pytest_mock import MockerFixture
+
+from common import app, db, mail
+from other.emailer import EmailType, send_code_email
+from other.outbox import send_queued_emails
+from other.outbox_db import OutboxEmail
+
+
+class RecordingHandler:
+    def __init__(self) -> None:
+        self.envelopes: list[Envelope] = []
+        self.sessions: set[int] = set()
+
+    async def handle_DATA(  # noqa: N802 (aiosmtpd hook)
+        self, _, session: Session, envelope: Envelope
+    ) -> str:
+        self.envelopes.append(envelope)
+        self.sessions.add(id(session))
+        return "250 Message accepted for delivery"
+
+
+def find_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@fixture
+def smtp_server(mocker: MockerFixture) -> RecordingHandler:
+    handler = RecordingHandler()
+    port: int = find_free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+
+    config = {
+        "MAIL_SERVER": "127.0.0.1",
+        "MAIL_PORT": port,
+        "MAIL_DEFAULT_SENDER": "test@xieffect.ru",
+        "MAIL_SUPPRESS_SEND": False,
+    }
+    mocker.patch.dict(app.extensions, {"mail": mail.init_mail(config)})
+    mocker.patch("other.emailer.mail_initialized", new=True)
+
+    yield handler
+    controller.stop()
+
+
+def test_outbox_batch_sending(smtp_server: RecordingHandler):
+    receivers: list[str] = [f"{i}@outbox.test" for i in range(5)]
+    for receiver in receivers:
+        send_code_email(receiver, EmailType.CONFIRM)
+    db.session.commit()
+
+    assert len(smtp_server.envelopes) == 0
+    assert send_queued_emails() == len(receivers)
+    assert send_queued_emails() == 0
+
+    assert len(smtp_server.sessions) == 1  # one connection for the whole batch
+    assert sorted(envelope.rcpt_tos[0] for envelope in smtp_server.envelopes) == sorted(
+        receivers
+    )
+    for receiver in receivers:
+        assert OutboxEmail.find_first_by_kwargs(receiver=receiver) is None
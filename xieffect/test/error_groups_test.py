@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from pytest import fixture, raises
+
+from other.error_groups import error_groups, ErrorAggregator, ErrorGroup
+from test.conftest import FlaskTestClient
+
+
+def fail(error_type: type[Exception] = ValueError) -> Exception:
+    with raises(error_type) as error_info:
+        raise error_type("Something went wrong")
+    return error_info.value
+
+
+@fixture
+def reports() -> list[tuple[str, int]]:
+    return []
+
+
+@fixture
+def aggregator(reports: list[tuple[str, int]]) -> ErrorAggregator:
+    def report(group: ErrorGroup, occurrences: int) -> None:
+        reports.append((group.fingerprint, occurrences))
+
+    return ErrorAggregator(report=report, window=timedelta(minutes=5), limit=2)
+
+
+def test_error_grouping(aggregator: ErrorAggregator, reports: list):
+    groups = [aggregator.record(fail(), "endpoint") for _ in range(3)]
+    group: ErrorGroup = groups[0]
+    assert all(other is group for other in groups)
+    assert group.count == 3
+    assert "ValueError: Something went wrong" in group.traceback
+    assert reports == [(group.fingerprint, 1)]
+
+    assert aggregator.record(fail(KeyError), "endpoint") is not group
+    assert aggregator.record(fail(), "other-endpoint") is not group
+    assert len(aggregator.groups) == 2  # the oldest group is forgotten
+    assert len(reports) == 3
+
+
+def test_window_summary(aggregator: ErrorAggregator, reports: list):
+    group: ErrorGroup = aggregator.record(fail(), "endpoint")
+    aggregator.record(fail(), "endpoint")
+    aggregator.record(fail(), "endpoint")
+    assert aggregator.flush() == 0  # the window is not over yet
+
+    group.window_start -= timedelta(minutes=10)
+    assert aggregator.flush() == 1
+    assert aggregator.flush() == 0
+    assert reports == [(group.fingerprint, 1), (group.fingerprint, 2)]
+
+    group.window_start -= timedelta(minutes=10)
+    aggregator.record(fail(), "endpoint")  # quiet window, reported right away
+    assert reports[-1] == (group.fingerprint, 1)
+    assert group.count == 4
+
+
+def test_error_groups_mub(client: FlaskTestClient, mod_client: FlaskTestClient):
+    group: ErrorGroup = error_groups.record(fail(), "error-groups-test")
+
+    base_url = "/mub/errors/"
+    client.get(base_url, expected_status=403, expected_a="Permission denied")
+    groups = list(mod_client.paginate(base_url))
+    assert groups[0]["fingerprint"] == group.fingerprint
+    assert groups[0]["count"] == group.count
+
+    result = mod_client.get(f"{base_url}{group.fingerprint}/")
+    assert result["traceback"] == group.traceback
+    mod_client.get(f"{base_url}unknown/", expected_status=404)
+
+
+def test_http_errors_skipped(client: FlaskTestClient):
+    groups_before = len(error_groups.groups)
+    client.get("/this/does/not/exist/", expected_status=404, get_json=False)
+    client.post("/signup/", expected_status=400, get_json=False)
+    assert len(error_groups.groups) == groups_before
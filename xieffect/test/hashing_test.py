@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.hash import pbkdf2_sha256
+
+from common import db
+from common.consts import PASSWORD_HASH_ROUNDS
+from other.hashing import hash_password, HashingPool, verify_password
+from test.conftest import FlaskTestClient
+from users.users_db import User
+
+
+def test_hashing_pool():
+    pool = HashingPool(workers=2)
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(lambda i: pool.run(str, i), range(8)))
+
+    assert results == [str(i) for i in range(8)]
+    assert pool.stats.total == 8
+    assert pool.stats.pending == 0
+    assert 1 <= pool.stats.max_pending <= 4
+
+
+def test_password_hashing():
+    hashed: str = hash_password("password")
+    assert pbkdf2_sha256.from_string(hashed).rounds == PASSWORD_HASH_ROUNDS
+    assert verify_password("password", hashed) == (True, None)
+    assert verify_password("wrong", hashed) == (False, None)
+
+
+def test_rehash_on_login(
+    base_client: FlaskTestClient,
+    base_user_data: tuple[str, str],
+    base_user_id: int,
+):
+    email, password = base_user_data
+    user: User = User.find_by_id(base_user_id)
+    user.password = pbkdf2_sha256.using(rounds=1000).hash(password)
+    db.session.commit()
+
+    wrong_credentials = {"email": email, "password": "wrong"}  # noqa: S105
+    base_client.post("/signin/", json=wrong_credentials)
+    assert pbkdf2_sha256.from_string(user.password).rounds == 1000
+
+    base_client.post("/signin/", json={"email": email, "password": password})
+    user = User.find_by_id(base_user_id)
+    assert pbkdf2_sha256.from_string(user.password).rounds == PASSWORD_HASH_ROUNDS
+    assert User.verify_hash(password, user.password)
+    base_client.post("/signout/")
+
+
+def test_hashing_mub(client: FlaskTestClient, mod_client: FlaskTestClient):
+    url = "/mub/hashing/"
+    client.get(url, expected_status=403, expected_a="Permission denied")
+    stats = mod_client.get(url)
+    assert stats["total"] > 0
+    assert stats["pending"] == 0
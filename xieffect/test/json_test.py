@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic_marshals.base import PatchDefault
+
+from common import dump_json_bytes, output_json, SocketJSON
+from common._json import FastJSONProvider  # noqa: WPS436 WPS450
+from communities.tasks.tests_db import QuestionKind
+from wsgi import application as app
+
+
+def test_fast_json():
+    data = {
+        "patch": PatchDefault,
+        "created": datetime(2023, 9, 1, 12, 30),
+        1: "key",
+    }
+    assert dump_json_bytes(data) == (
+        b'{"patch":null,"created":"2023-09-01T12:30:00","1":"key"}'
+    )
+
+    data["kind"] = [QuestionKind.CHOICE]
+    socket_json = SocketJSON()
+    assert socket_json.loads(socket_json.dumps(data)) == {
+        "patch": None,
+        "created": "2023-09-01T12:30:00",
+        "kind": ["choice"],
+        "1": "key",
+    }
+
+
+def test_json_provider():
+    assert isinstance(app.json, FastJSONProvider)
+    assert app.json.loads(app.json.dumps({"text": "тест"})) == {"text": "тест"}
+    assert app.json.dumps([1], indent=2) == "[\n  1\n]"
+
+    with app.test_request_context():
+        response = output_json({"a": "Success"}, 201, {"X-Test": "yes"})
+    assert response.status_code == 201
+    assert response.headers["X-Test"] == "yes"
+    assert response.get_data() == b'{"a":"Success"}'
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from gzip import decompress
 from typing import Any
 
 from flask_mail import Message
@@ -9,6 +10,7 @@ from pytest import mark, param
 from pytest_mock import MockerFixture
 
 from other.emailer import EmailType
+from other.outbox import send_queued_emails
 from test.conftest import (
     BASIC_PASS,
     TEST_EMAIL,
@@ -51,6 +53,26 @@ def test_sio_docs(base_client: FlaskTestClient):
     )
 
 
+@mark.order(2)
+@mark.parametrize("path", ["/swagger.json", "/asyncapi.json"])
+def test_cached_docs(base_client: FlaskTestClient, path: str):
+    response = base_client.get(path, get_json=False)
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+    compressed = base_client.get(
+        path, get_json=False, headers={"Accept-Encoding": "gzip"}
+    )
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert decompress(compressed.data) == response.data
+
+    base_client.get(
+        path,
+        get_json=False,
+        headers={"If-None-Match": response.headers["ETag"]},
+        expected_status=304,
+    )
+
+
 @mark.order(10)
 def test_login(base_client: FlaskTestClient):
     base_client.post(
@@ -99,6 +121,7 @@ def test_signup_fails(
         expected_status=status,
         expected_a=message,
     )
+    assert send_queued_emails() == 0
     assert len(mock_mail) == 0
 
 
@@ -118,6 +141,8 @@ def test_signup(base_client: FlaskTestClient, mock_mail):
     )
 
     # Check the email
+    assert len(mock_mail) == 0
+    assert send_queued_emails() == 1
     assert len(mock_mail) == 1
     message: Message = mock_mail.pop()
     assert message.subject == EmailType.CONFIRM.theme
@@ -184,6 +209,7 @@ def test_signup_invites(
         expected_a="Invite code limit exceeded",
         expected_headers={"Set-Cookie": None},
     )
+    assert send_queued_emails() == 1
     assert len(mock_mail) == 1
 
     # Checking invite constraint
@@ -216,6 +242,7 @@ def test_password_reset(base_client: FlaskTestClient, mock_mail):
         expected_a=False,
     )
 
+    assert send_queued_emails() == 2
     assert len(mock_mail) == 2
     mail_message: Message = mock_mail[-1]
     assert mail_message.subject == EmailType.PASSWORD.theme
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from pytest_mock import MockerFixture
+
+from other.profiler import profiling_slot
+from test.conftest import FlaskTestClient
+
+
+def test_requested_profiling(client: FlaskTestClient, mod_client: FlaskTestClient):
+    base_url = "/mub/profiler/"
+    client.post(
+        f"{base_url}token/", expected_status=403, expected_a="Permission denied"
+    )
+    token: str = mod_client.post(f"{base_url}token/", expected_a=str)["a"]
+
+    profiles_before = list(mod_client.paginate(base_url))
+    client.get("/home/", headers={"X-Profile": "invalid"})
+    assert list(mod_client.paginate(base_url)) == profiles_before
+
+    client.get("/home/", headers={"X-Profile": token})
+    client.get("/home/", query_string={"profile": token})
+    profiles = list(mod_client.paginate(base_url))
+    assert len(profiles) == len(profiles_before) + 2
+    assert profiles[0]["filename"].endswith("-requested.prof")
+
+    response = mod_client.get(f"{base_url}{profiles[0]['filename']}/", get_json=False)
+    assert len(response.data) == profiles[0]["size"]
+
+
+def test_one_profile_at_a_time(client: FlaskTestClient, mod_client: FlaskTestClient):
+    base_url = "/mub/profiler/"
+    token: str = mod_client.post(f"{base_url}token/", expected_a=str)["a"]
+    profiles_before = list(mod_client.paginate(base_url))
+
+    with profiling_slot:  # as if another request was being profiled
+        client.get("/home/", headers={"X-Profile": token})
+    assert list(mod_client.paginate(base_url)) == profiles_before
+
+    client.get("/home/", headers={"X-Profile": token})
+    assert len(list(mod_client.paginate(base_url))) == len(profiles_before) + 1
+
+
+def test_sampled_profiling(
+    client: FlaskTestClient, mod_client: FlaskTestClient, mocker: MockerFixture
+):
+    base_url = "/mub/profiler/"
+    profiles_before = list(mod_client.paginate(base_url))
+
+    mocker.patch("other.profiler.PROFILING_SAMPLE_RATE", 100)
+    client.get("/home/")
+    mocker.patch("other.profiler.PROFILING_SAMPLE_RATE", 0)
+
+    profiles = list(mod_client.paginate(base_url))
+    assert len(profiles) > len(profiles_before)
+    assert any(profile["filename"].endswith("-sampled.prof") for profile in profiles)
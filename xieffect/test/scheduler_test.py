@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from pytest import mark, raises
+
+from common import db
+from other.database_cli import purge_blocked_tokens
+from other.scheduler import CronTrigger, IntervalTrigger, Scheduler
+from other.scheduler_db import JobLease, JobRun
+from test.conftest import FlaskTestClient
+from users.users_db import BlockedToken
+
+
+@mark.parametrize(
+    ("expression", "after", "expected"),
+    [
+        ("0 3 * * *", datetime(2026, 1, 1, 2, 59, 30), datetime(2026, 1, 1, 3, 0)),
+        ("0 3 * * *", datetime(2026, 1, 1, 3, 0), datetime(2026, 1, 2, 3, 0)),
+        ("*/15 * * * *", datetime(2026, 1, 1, 10, 16), datetime(2026, 1, 1, 10, 30)),
+        ("0 9-17/4 * * 1-5", datetime(2026, 1, 2, 18), datetime(2026, 1, 5, 9, 0)),
+        ("30 0 29 2 *", datetime(2026, 3, 1), datetime(2028, 2, 29, 0, 30)),
+        ("5,10 0 1 * 0", datetime(2026, 1, 1), datetime(2026, 2, 1, 0, 5)),
+    ],
+)
+def test_cron_trigger(expression: str, after: datetime, expected: datetime):
+    assert CronTrigger(expression).next_time(after) == expected
+
+
+@mark.parametrize(
+    "expression",
+    ["* * * *", "60 * * * *", "* * 0 * *", "5-1 * * * *", "0 0 31 2 *"],
+)
+def test_invalid_cron(expression: str):
+    with raises(ValueError):
+        CronTrigger(expression)
+
+
+def test_job_runs():
+    test_scheduler = Scheduler(holder="test-holder")
+    calls: list[str] = []
+
+    @test_scheduler.job("test-job", IntervalTrigger(60))
+    def test_job() -> None:
+        calls.append("test-job")
+
+    @test_scheduler.job("test-failing-job", CronTrigger("0 0 * * *"))
+    def test_failing_job() -> None:
+        raise RuntimeError("Job failed")
+
+    assert test_scheduler.run_pending(datetime.utcnow()) == 0
+    assert 0 < test_scheduler.seconds_until_next(datetime.utcnow()) <= 60
+    job, failing_job = test_scheduler.jobs.values()
+    assert (job.timing, failing_job.timing) == ("every 60s", "0 0 * * *")
+
+    assert test_scheduler.run_pending(job.next_run) == 1
+    assert calls == ["test-job"]
+    assert job.last_outcome.error is None
+    assert not job.last_outcome.manual
+
+    run: JobRun = test_scheduler.run_job(failing_job, manual=True)
+    assert run.manual
+    assert "RuntimeError: Job failed" in run.error
+
+    assert JobLease.acquire(job.name, "other-holder", timedelta(minutes=1))
+    db.session.commit()
+    assert test_scheduler.run_job(job) is None  # another worker is running it
+    assert calls == ["test-job"]
+    JobLease.release(job.name, "other-holder")
+    db.session.commit()
+
+
+def test_job_runs_once_per_period():
+    schedulers = Scheduler(holder="first-holder"), Scheduler(holder="second-holder")
+    calls: list[str] = []
+
+    def test_shared_job() -> None:
+        calls.append("test-shared-job")
+
+    for test_scheduler in schedulers:
+        test_scheduler.job("test-shared-job", IntervalTrigger(60))(test_shared_job)
+    first_job, second_job = (
+        test_scheduler.jobs["test-shared-job"] for test_scheduler in schedulers
+    )
+    assert schedulers[0].run_pending(first_job.next_run) == 1
+    assert len(calls) == 1
+
+    # the first run has finished & released the lease, but the period is taken
+    assert schedulers[1].run_job(second_job, next_run=second_job.next_run) is None
+    assert len(calls) == 1
+
+    assert schedulers[1].run_job(second_job, manual=True) is not None
+    assert len(calls) == 2
+    JobLease.delete_by_kwargs(name="test-shared-job")
+    db.session.commit()
+
+
+def test_scheduler_mub(client: FlaskTestClient, mod_client: FlaskTestClient):
+    base_url = "/mub/scheduler/"
+    client.get(base_url, expected_status=403, expected_a="Permission denied")
+    jobs = mod_client.get(base_url)
+    assert "prune-job-runs" in {job["name"] for job in jobs}
+
+    run = mod_client.post(f"{base_url}prune-job-runs/")
+    assert run["manual"]
+    assert "error" not in run  # None fields are skipped
+    runs = list(mod_client.paginate(f"{base_url}prune-job-runs/runs/"))
+    assert runs[0]["id"] == run["id"]
+
+    mod_client.post(f"{base_url}unknown/", expected_status=404)
+
+
+def test_blocked_tokens_purge():
+    expired_id: int = BlockedToken.create(
+        jti="expired", expires=datetime.utcnow() - timedelta(days=1)
+    ).id
+    valid_id: int = BlockedToken.create(
+        jti="valid", expires=datetime.utcnow() + timedelta(days=1)
+    ).id
+    db.session.commit()
+
+    purge_blocked_tokens()
+    db.session.commit()
+    assert BlockedToken.find_first_by_kwargs(id=expired_id) is None
+    BlockedToken.find_first_by_kwargs(id=valid_id).delete()
+    db.session.commit()
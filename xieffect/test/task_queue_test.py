@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from common import db
+from other.task_queue import enqueue, handler, work_queue
+from other.task_queue_db import QueuedJob
+
+calls: list[dict] = []
+
+
+@handler("test-job")
+def run_test_job(**payload) -> None:
+    calls.append(payload)
+
+
+@handler("test-failing-job")
+def run_test_failing_job() -> None:
+    raise RuntimeError("Job failed")
+
+
+def find_job(key: str) -> QueuedJob | None:
+    return db.get_first(select(QueuedJob).filter_by(key=key))
+
+
+def test_job_queue():
+    calls.clear()
+    enqueue("test-job", key="test-job-1", value=1)
+    enqueue("test-job", key="test-job-1", value=2)  # skipped, same key
+    enqueue("test-job", delay=timedelta(hours=1), value=3)
+    db.session.commit()
+
+    work_queue()
+    assert calls == [{"value": 1}]
+    assert find_job("test-job-1") is None
+
+    enqueue("test-job", key="test-job-1", value=4)  # not pending anymore
+    db.session.commit()
+    work_queue()
+    assert calls == [{"value": 1}, {"value": 4}]
+
+
+def test_job_retries():
+    enqueue("test-failing-job", key="test-failing-job")
+    db.session.commit()
+
+    work_queue()
+    job: QueuedJob = find_job("test-failing-job")
+    assert job.attempts == 1
+    assert "Job failed" in job.last_error
+    assert job.next_attempt > datetime.utcnow()
+
+    job.next_attempt = datetime.utcnow()
+    job.attempts = QueuedJob.max_attempts - 1
+    db.session.commit()
+    work_queue()
+    assert find_job("test-failing-job") is None  # exhausted
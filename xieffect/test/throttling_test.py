@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+from pytest import fixture, mark
+from pytest_mock import MockerFixture
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from common import app
+from common.throttling import limiter, MemoryBackend, RateLimit, RateLimiter
+from common.throttling_db import DatabaseBackend
+from test.conftest import FlaskTestClient
+
+
+@fixture
+def rate_limit() -> RateLimit:
+    return RateLimit("test", capacity=3, period=30)
+
+
+@mark.parametrize(
+    "backend",
+    [
+        MemoryBackend(),
+        DatabaseBackend(),
+    ],
+    ids=["memory", "database"],
+)
+def test_token_bucket(backend, rate_limit: RateLimit):
+    bucket, other_bucket = f"test:{uuid4()}", f"test:{uuid4()}"
+    now: float = 1000.0
+    for _ in range(rate_limit.capacity):
+        assert backend.consume(bucket, rate_limit, now) == 0
+    assert backend.consume(bucket, rate_limit, now) == 10  # one per 10s
+    assert backend.consume(other_bucket, rate_limit, now) == 0
+
+    assert backend.consume(bucket, rate_limit, now + 5) == 5
+    assert backend.consume(bucket, rate_limit, now + 10) == 0
+
+
+def test_memory_pruning(rate_limit: RateLimit):
+    backend = MemoryBackend(max_buckets=2)
+    backend.consume("test:first", rate_limit, 0)
+    backend.consume("test:second", rate_limit, 15)
+    backend.consume("test:third", rate_limit, 20)  # first one is full again
+    assert set(backend.buckets.keys()) == {"test:second", "test:third"}
+
+
+def test_rejected_check_keeps_tokens():
+    checker = RateLimiter(MemoryBackend())
+    loose = RateLimit("loose", capacity=3, period=30, key=lambda _: "key")
+    strict = RateLimit("strict", capacity=1, period=30, key=lambda _: "key")
+
+    assert checker.check((loose, strict), {}) == 0
+    assert checker.check((loose, strict), {}) > 0
+    assert checker.check((loose,), {}) == 0
+    assert checker.check((loose,), {}) == 0  # the rejected check took nothing
+    assert checker.check((loose,), {}) > 0
+    assert checker.stats["loose"].allowed == 3
+    assert checker.stats["strict"].rejected == 1
+
+
+@fixture
+def enabled_limiter(mocker: MockerFixture) -> None:
+    mocker.patch.object(limiter, "enabled", new=True)
+    mocker.patch.object(limiter, "backend", new=MemoryBackend())
+
+
+def test_signin_throttling(
+    base_client: FlaskTestClient,
+    mod_client: FlaskTestClient,
+    enabled_limiter: None,  # noqa: U100
+):
+    credentials = {"email": "throttled@test.test", "password": "wrong"}  # noqa: S105
+    for _ in range(5):
+        base_client.post("/signin/", json=credentials, expected_a="User doesn't exist")
+
+    response = base_client.post(
+        "/signin/",
+        json=credentials,
+        expected_status=429,
+        expected_a="Too many requests",
+        get_json=False,
+    )
+    assert int(response.headers["Retry-After"]) > 0
+
+    other_credentials = dict(credentials, email="other@test.test")
+    base_client.post("/signin/", json=other_credentials)
+
+    stats = {stats["name"]: stats for stats in mod_client.get("/mub/throttling/")}
+    assert stats["signin-email"]["rejected"] == 1
+    assert stats["signin-ip"]["allowed"] == 6  # rejected requests take no tokens
+
+
+def sign_in_from(client: FlaskTestClient, index: int, address: str, **kwargs) -> None:
+    client.post(
+        "/signin/",
+        json={"email": f"{index}@proxy.test", "password": "wrong"},  # noqa: S105
+        headers={"X-Forwarded-For": address},
+        **kwargs,
+    )
+
+
+def test_spoofed_forwarded_for(
+    base_client: FlaskTestClient,
+    enabled_limiter: None,  # noqa: U100
+):
+    """Without trusted proxies (default), the header is ignored"""
+    for index in range(20):
+        sign_in_from(
+            base_client, index, f"10.0.1.{index}", expected_a="User doesn't exist"
+        )
+    sign_in_from(
+        base_client,
+        20,
+        "10.0.1.20",
+        expected_status=429,
+        expected_a="Too many requests",
+    )
+
+
+@fixture
+def trusted_proxy(mocker: MockerFixture) -> None:
+    mocker.patch.object(app, "wsgi_app", new=ProxyFix(app.wsgi_app, x_for=1))
+
+
+def test_throttling_behind_proxy(
+    base_client: FlaskTestClient,
+    enabled_limiter: None,  # noqa: U100
+    trusted_proxy: None,  # noqa: U100
+):
+    for index in range(20):
+        sign_in_from(base_client, index, "10.0.0.1", expected_a="User doesn't exist")
+    sign_in_from(
+        base_client, 20, "10.0.0.1", expected_status=429, expected_a="Too many requests"
+    )
+    sign_in_from(base_client, 21, "10.0.0.2", expected_a="User doesn't exist")
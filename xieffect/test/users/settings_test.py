@@ -6,6 +6,7 @@ from flask_mail import Message
 from pytest import mark, param
 
 from other.emailer import EmailType
+from other.outbox import send_queued_emails
 from test.conftest import FlaskTestClient
 from test.vault_test import upload
 from vault.files_db import File
@@ -112,9 +113,33 @@ def test_changing_email_fails(
 ):
     data = {"new-email": email, "password": password}
     client.post("/users/me/email/", expected_a=message, json=data)
+    assert send_queued_emails() == 0
     assert len(mock_mail) == 0
 
 
+@mark.order(108)
+def test_conditional_settings(client: FlaskTestClient, test_user_id: int):
+    theme: str = client.get("/users/me/profile/")["theme"]
+    paths = ("/users/me/profile/", f"/users/{test_user_id}/profile/")
+    for index, path in enumerate(paths):
+        response = client.get(path, get_json=False)
+        etag: str = response.headers["ETag"]
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+        headers = {"If-None-Match": etag}
+        not_modified = client.get(
+            path, headers=headers, expected_status=304, get_json=False
+        )
+        assert not_modified.headers["ETag"] == etag
+        assert not_modified.get_data() == b""
+
+        client.post("/users/me/profile/", json={"theme": f"theme-{index}"})
+        response = client.get(path, headers=headers, get_json=False)
+        assert response.headers["ETag"] != etag
+
+    client.post("/users/me/profile/", json={"theme": theme})
+
+
 @mark.order(109)
 def test_changing_email(client: FlaskTestClient, mock_mail):
     new_mail: str = "new@test.email"
@@ -123,6 +148,8 @@ def test_changing_email(client: FlaskTestClient, mock_mail):
     client.post("/users/me/email/", expected_a="Success", json=data)
     client.get("/users/me/profile/", expected_json={"email": new_mail})
 
+    assert len(mock_mail) == 0
+    assert send_queued_emails() == 1
     assert len(mock_mail) == 1
     mail_message: Message = mock_mail[0]
     assert mail_message.subject == EmailType.CHANGE.theme
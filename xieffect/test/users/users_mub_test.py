@@ -8,7 +8,10 @@ from pytest import mark, param
 from pytest_mock import MockerFixture
 
 from common import TEST_EMAIL
-from other.emailer import EmailType, WebhookURLs
+from other.discorder import WebhookURLs
+from other.emailer import EmailType
+from other.outbox import send_queued_emails
+from other.outbox_db import OutboxEmail
 from test.conftest import FlaskTestClient, delete_by_id
 from users.users_db import User
 from wsgi import Invite
@@ -121,6 +124,8 @@ def test_mub_emailer(
     if status == 200:  # Check successful sending
         mod_client.post(url, json=data, expected_a=str)
 
+        assert len(mock_mail) == 0
+        assert send_queued_emails() == 1
         assert len(mock_mail) == 1
         mail_message: Message = mock_mail[0]
         assert mail_message.subject == email_type.theme
@@ -138,14 +143,25 @@ def test_smtp_data_error(mod_client: FlaskTestClient, mocker: MockerFixture, moc
         "tester-email": "test@test.test",
     }
     mocker.patch(
-        "common._core.mail.send",
+        "flask_mail.Connection.send",
         side_effect=SMTPDataError(554, "No SMTP service here"),
     )
-    mock_discorder = mocker.patch("other.emailer.send_discord_message")
+    mock_discorder = mocker.patch("other.outbox.send_discord_message")
     mock_discorder.side_effect = lambda *_: None
 
     mod_client.post("/mub/emailer/send/", json=data)
+    assert send_queued_emails() == 1
     assert len(mock_mail) == 0
 
-    message = "Email for test@test.test not sent:\n```(554, 'No SMTP service here')```"
+    message = (
+        "1 email(s) not sent:\n"
+        "```test@test.test (attempt 1): "
+        "SMTPDataError(554, 'No SMTP service here')```"
+    )
     mock_discorder.assert_called_with(WebhookURLs.MAILBT, message)
+
+    # Failed email is kept for a retry later on
+    assert send_queued_emails() == 0
+    email: OutboxEmail = OutboxEmail.find_first_by_kwargs(receiver="test@test.test")
+    assert email is not None
+    assert email.attempts == 1
@@ -7,6 +7,7 @@ from typing import TypeVar
 from pytest import mark
 
 from common import open_file
+from other.task_queue import work_queue
 from test.conftest import BASIC_PASS, login, FlaskTestClient, create_file
 from vault.files_db import FILES_PATH
 
@@ -94,4 +95,6 @@ def test_files_normal(
             assert exists(FILES_PATH + filename)
         else:
             mod_client.delete(f"/mub/files/{file_id}/", expected_a=True)
+            assert exists(FILES_PATH + filename)  # removed by the queue
+            work_queue()
             assert not exists(FILES_PATH + filename)
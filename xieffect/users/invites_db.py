@@ -5,7 +5,7 @@ from typing import Self, ClassVar
 
 from itsdangerous.url_safe import URLSafeSerializer
 from pydantic_marshals.sqlalchemy import MappedModel
-from sqlalchemy import select
+from sqlalchemy import or_, select, update
 from sqlalchemy.orm import relationship, mapped_column, Mapped
 from sqlalchemy.sql.sqltypes import Integer, String
 
@@ -52,5 +52,21 @@ class Invite(Base):
     def find_global(cls, offset: int, limit: int) -> list[Self]:
         return db.get_paginated(select(cls), offset, limit)
 
+    def redeem(self) -> bool:
+        """
+        Counts a signup with ``UPDATE ... WHERE accepted < limit``, so that
+        concurrent signups can't exceed the limit (negative means no limit)
+        """
+        accepted: int | None = db.get_first(
+            update(Invite)
+            .filter(
+                Invite.id == self.id,
+                or_(Invite.limit < 0, Invite.accepted < Invite.limit),
+            )
+            .values(accepted=Invite.accepted + 1)
+            .returning(Invite.accepted)
+        )
+        return accepted is not None
+
     def generate_code(self, user_id: int) -> str | bytes:
         return self.serializer.dumps((self.id, user_id))
@@ -33,6 +33,7 @@ class UserFinder(Resource):
 class ProfileViewer(Resource):
     @controller.jwt_authorizer(User, check_only=True)
     @controller.database_searcher(User, result_field_name="profile_viewer")
+    @controller.conditional(lambda profile_viewer: profile_viewer.changed)
     @controller.marshal_with(User.ProfileData)
     def get(self, profile_viewer: User):
         """Get profile"""
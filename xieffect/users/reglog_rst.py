@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from datetime import datetime
+
 from flask import current_app
 from flask_fullstack import password_parser, RequestParser
 from flask_jwt_extended import get_jwt
@@ -7,12 +9,26 @@ from flask_restx import Resource
 from itsdangerous import BadSignature
 
 from common import ResourceController
+from common.throttling import email_key, RateLimit
 from other.emailer import create_email_confirmer, EmailType, send_code_email
 from users.invites_db import Invite
 from users.users_db import BlockedToken, User
 
 controller = ResourceController("reglog", path="/")
 
+signup_limits = (
+    RateLimit("signup-ip", capacity=5, period=10 * 60),
+    RateLimit("signup-email", capacity=3, period=10 * 60, key=email_key),
+)
+signin_limits = (
+    RateLimit("signin-ip", capacity=20, period=60),
+    RateLimit("signin-email", capacity=5, period=5 * 60, key=email_key),
+)
+password_reset_limits = (
+    RateLimit("password-reset-ip", capacity=5, period=10 * 60),
+    RateLimit("password-reset-email", capacity=2, period=10 * 60, key=email_key),
+)
+
 
 class AuthModel(User.CommunityModel):
     a: str = "Success"
@@ -50,6 +66,7 @@ class UserRegistration(Resource):
     @controller.doc_abort("200 ", "Invite code limit exceeded")
     @controller.doc_abort(400, "Malformed code (BadSignature)")
     @controller.doc_abort(404, "Invite not found")
+    @controller.throttle(*signup_limits)
     @controller.argument_parser(parser)
     @controller.marshal_with_authorization(AuthModel)
     def post(self, email: str, username: str, password: str, code: str):
@@ -61,7 +78,7 @@ class UserRegistration(Resource):
 
         if invite is None:
             return {"a": "Invite not found"}, 404
-        if invite.limit == invite.accepted:
+        if invite.limit == invite.accepted:  # fast path, `redeem` below is atomic
             return {"a": "Invite code limit exceeded"}
 
         user = User.create(
@@ -72,7 +89,9 @@ class UserRegistration(Resource):
         )
         if user is None:
             return {"a": "Email already in use"}
-        invite.accepted += 1
+        if not invite.redeem():  # the last place was taken meanwhile
+            user.delete()
+            return {"a": "Invite code limit exceeded"}
         send_code_email(email, EmailType.CONFIRM)
         return user, user
 
@@ -89,6 +108,7 @@ class UserLogin(Resource):
 
     @controller.doc_abort("200 ", "User doesn't exist")
     @controller.doc_abort(" 200", "Wrong password")
+    @controller.throttle(*signin_limits)
     @controller.argument_parser(parser)
     @controller.marshal_with_authorization(AuthModel)
     def post(self, email: str, password: str) -> tuple[User, User] | dict:
@@ -97,7 +117,7 @@ class UserLogin(Resource):
         if user is None:
             return {"a": "User doesn't exist"}
 
-        if User.verify_hash(password, user.password):
+        if user.check_password(password):
             return user, user
         return {"a": "Wrong password"}
 
@@ -118,7 +138,10 @@ class UserLogout(Resource):
     @controller.removes_authorization()
     def post(self) -> dict:
         """Logs the user out, blocks the token"""
-        BlockedToken.create(jti=get_jwt()["jti"])
+        token: dict = get_jwt()
+        BlockedToken.create(
+            jti=token["jti"], expires=datetime.utcfromtimestamp(token["exp"])
+        )
         return {"a": True}
 
 
@@ -127,6 +150,7 @@ class PasswordResetSender(Resource):
     parser: RequestParser = RequestParser()
     parser.add_argument("email", required=True, help="User's email")
 
+    @controller.throttle(*password_reset_limits)
     @controller.argument_parser(parser)
     @controller.a_response()
     def post(self, email: str) -> bool:
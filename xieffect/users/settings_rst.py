@@ -4,12 +4,23 @@ from flask_fullstack import password_parser, RequestParser
 from flask_restx import Resource, inputs
 
 from common import ResourceController
+from common.throttling import RateLimit, user_key
 from other.emailer import create_email_confirmer, EmailType, send_code_email
 from users.users_db import User
 from vault.files_db import File
 
 controller = ResourceController("settings", path="/users/me/")
 
+# Placed after the authorizer, as user limits need the user
+email_change_limits = (
+    RateLimit("email-change-ip", capacity=10, period=10 * 60),
+    RateLimit("email-change-user", capacity=3, period=10 * 60, key=user_key),
+)
+password_change_limits = (
+    RateLimit("password-change-ip", capacity=10, period=10 * 60),
+    RateLimit("password-change-user", capacity=5, period=10 * 60, key=user_key),
+)
+
 
 @controller.route("/profile/")
 class Settings(Resource):
@@ -23,6 +34,7 @@ class Settings(Resource):
     parser.add_argument("theme", type=str, required=False)
 
     @controller.jwt_authorizer(User)
+    @controller.conditional(lambda user: (user.id, user.changed))
     @controller.marshal_with(User.ProfileData)
     def get(self, user: User) -> User:
         """Loads user's own full settings"""
@@ -82,12 +94,13 @@ class EmailChanger(Resource):
     @controller.doc_abort("200 ", "Wrong password")
     @controller.doc_abort(" 200", "Email in use")
     @controller.jwt_authorizer(User)
+    @controller.throttle(*email_change_limits)
     @controller.argument_parser(parser)
     @controller.a_response()
     def post(self, user: User, password: str, new_email: str) -> str:
         """Verifies user's password and changes user's email to a new one"""
 
-        if not User.verify_hash(password, user.password):
+        if not user.check_password(password):
             return "Wrong password"
 
         if User.find_by_email_address(new_email):
@@ -116,12 +129,13 @@ class PasswordChanger(Resource):
     @controller.doc_abort(200, "Success")
     @controller.doc_abort("200 ", "Wrong password")
     @controller.jwt_authorizer(User)
+    @controller.throttle(*password_change_limits)
     @controller.argument_parser(parser)
     @controller.a_response()
     def post(self, user: User, password: str, new_password: str) -> str:
         """Verifies user's password and changes it to a new one"""
 
-        if User.verify_hash(password, user.password):
+        if user.check_password(password):
             user.change_password(new_password)
             return "Success"
         return "Wrong password"
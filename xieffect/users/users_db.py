@@ -1,18 +1,20 @@
 from __future__ import annotations
 
-from datetime import date
-from typing import Self
+from datetime import date, datetime
+from typing import Any, Self
 
 from flask_fullstack import UserRole, Identifiable
-from passlib.hash import pbkdf2_sha256
 from pydantic_marshals.sqlalchemy import MappedModel
-from sqlalchemy import select, ForeignKey
+from sqlalchemy import delete, select, ForeignKey
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 from sqlalchemy.sql.sqltypes import String
 
 from common import Base, db
-from common.abstract import SoftDeletable
+from common.abstract import SoftDeletable, Versioned
 from communities.base.meta_db import Community, Participant
+from other.hashing import hash_password, verify_password
 from users.invites_db import Invite
 from vault.files_db import File
 
@@ -22,24 +24,37 @@ class BlockedToken(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, unique=True)
     jti: Mapped[str] = mapped_column(String(36))
+    expires: Mapped[datetime | None] = mapped_column(index=True)  # of the token
 
     @classmethod
     def find_by_jti(cls, jti: str) -> BlockedToken:
         return db.get_first(select(cls).filter_by(jti=jti))
 
+    @classmethod
+    def delete_expired(cls) -> None:
+        """Expired tokens are rejected anyway, no need to keep them blocked"""
+        db.session.execute(delete(cls).filter(cls.expires < datetime.utcnow()))
+
 
-class User(SoftDeletable, UserRole, Identifiable):
+class User(SoftDeletable, Versioned, UserRole, Identifiable):  # noqa: WPS215
     __tablename__ = "users"
     not_found_text = "User does not exist"
     unauthorized_error = (401, not_found_text)
 
     @staticmethod
     def generate_hash(password) -> str:
-        return pbkdf2_sha256.hash(password)
+        return hash_password(password)
 
     @staticmethod
     def verify_hash(password, hashed) -> bool:
-        return pbkdf2_sha256.verify(password, hashed)
+        return verify_password(password, hashed)[0]
+
+    def check_password(self, password: str) -> bool:
+        """Also rehashes the password if hashing parameters have changed"""
+        valid, new_hash = verify_password(password, self.password)
+        if new_hash is not None:
+            self.password = new_hash
+        return valid
 
     # Vital:
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -173,3 +188,26 @@ class User(SoftDeletable, UserRole, Identifiable):
 
 
 UserRole.default_role = User
+
+
+def create_users_bulk(entries: list[dict[str, Any]], password: str) -> set[str]:
+    """
+    Inserts users with free emails in one statement, hashing the
+    password once for all of them. Entries should have the same keys
+
+    :return: emails of created users
+    """
+    emails: list[str] = [entry["email"] for entry in entries]
+    taken: set[str] = set(db.get_all(select(User.email).filter(User.email.in_(emails))))
+    entries = [entry for entry in entries if entry["email"] not in taken]
+    if not entries:
+        return set()
+
+    password_hash: str = User.generate_hash(password)
+    dialect_insert = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+    stmt = dialect_insert[db.engine.dialect.name](User.__table__)
+    db.session.execute(
+        stmt.on_conflict_do_nothing(index_elements=[User.email]),
+        [dict(entry, password=password_hash) for entry in entries],
+    )
+    return {entry["email"] for entry in entries}
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from contextlib import suppress
 from datetime import timedelta
+from os import remove
 from typing import Any, Self, ClassVar
 
 from pydantic_marshals.sqlalchemy import MappedModel
@@ -10,10 +12,22 @@ from sqlalchemy.sql.sqltypes import Text
 
 from common import db, absolute_path
 from common.abstract import SoftDeletable
+from other.task_queue import enqueue, handler
 
 FILES_PATH: str = absolute_path("files/vault/")
 
 
+@handler("delete-file")
+def delete_file(filename: str) -> None:
+    """Missing files are skipped, in case the job is retried after removing"""
+    with suppress(FileNotFoundError):
+        remove(FILES_PATH + filename)
+
+
+def delete_file_later(filename: str) -> None:
+    enqueue("delete-file", key=f"delete-file:{filename}", filename=filename)
+
+
 class File(SoftDeletable):
     __tablename__ = "files"
     not_found_text = "File not found"
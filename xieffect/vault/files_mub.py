@@ -1,12 +1,10 @@
 from __future__ import annotations
 
-from os import remove
-
 from flask_fullstack import counter_parser
 from flask_restx import Resource
 
 from moderation import MUBController, permission_index
-from vault.files_db import File, FILES_PATH
+from vault.files_db import delete_file_later, File
 
 content_management = permission_index.add_section("content management")
 manage_files = permission_index.add_permission(content_management, "manage files")
@@ -37,5 +35,5 @@ class MUBFileManager(Resource):
     @controller.database_searcher(File)
     @controller.a_response()
     def delete(self, file: File) -> None:
-        remove(FILES_PATH + file.filename)
+        delete_file_later(file.filename)
         file.delete()
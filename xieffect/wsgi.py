@@ -4,7 +4,7 @@ import logging
 from json import dump as dump_json, load as load_json
 from pathlib import Path
 
-from api import app as application, log_stuff, socketio
+from api import api_documents, app as application, log_stuff, socketio
 from common import (
     db,
     db_url,
@@ -18,12 +18,30 @@ from common import (
     BASIC_PASS,
     absolute_path,
 )
-from common.consts import PRODUCTION_MODE, DATABASE_RESET
+from common.consts import (
+    DATABASE_RESET,
+    DISABLE_WEBHOOKS,
+    PRODUCTION_MODE,
+    QUEUE_WORKER_ENABLED,
+)
+from communities.tasks.tasks_sio import TasksEventSpace
+from communities.tasks.tasks_timers import task_timers
 from moderation import Moderator, permission_index
-from other.discorder import send_message as send_discord_message, WebhookURLs
+from other.discorder import (
+    dispatcher,
+    send_message as send_discord_message,
+    WebhookURLs,
+)
+from other.emailer import preload_email_templates
+from other.error_groups import error_groups
+from other.outbox import run_email_sender
+from other.scheduler import scheduler
+from other.startup import startup
+from other.task_queue import run_queue_worker
 from users.invites_db import Invite
-from users.users_db import User
+from users.users_db import create_users_bulk, User
 
+BUNDLE_COLUMNS = ("name", "surname", "patronymic")  # other settings aren't stored
 SECRETS = (
     "SECRET_KEY",
     "SECURITY_PASSWORD_SALT",
@@ -38,7 +56,12 @@ def init_test_mod() -> None:
         moderator.super = True
 
 
-if PRODUCTION_MODE:  # works on server restart  # pragma: no coverage
+if not DISABLE_WEBHOOKS:  # pragma: no coverage
+    dispatcher.start(socketio.start_background_task, socketio.sleep)
+    socketio.start_background_task(error_groups.run, socketio.sleep)
+
+
+def check_production_setup() -> None:  # pragma: no coverage
     try:
         send_discord_message(WebhookURLs.NOTIFY, "Application restated")
     except Exception as e:  # noqa: PIE786
@@ -65,14 +88,19 @@ if PRODUCTION_MODE:  # works on server restart  # pragma: no coverage
         setup_fail = True
     if setup_fail:
         send_discord_message(WebhookURLs.NOTIFY, "Production environment setup failed")
+
+
+if PRODUCTION_MODE:  # works on server restart  # pragma: no coverage
+    startup.defer("production-check", check_production_setup)
 else:  # pragma: no coverage
     application.debug = True
     with application.app_context():
-        if db_url.endswith("app.db") or DATABASE_RESET:
-            db.drop_all()
-        if not db_url.startswith("postgresql") or DATABASE_RESET:
-            db.create_all()
-        init_test_mod()
+        with startup.phase("database"):
+            if db_url.endswith("app.db") or DATABASE_RESET:
+                db.drop_all()
+            if not db_url.startswith("postgresql") or DATABASE_RESET:
+                db.create_all()
+            init_test_mod()
         db.session.commit()
 
 
@@ -86,31 +114,37 @@ def init_folder_structure() -> None:
     Path(absolute_path("files/tfs/wip-modules")).mkdir(parents=True, exist_ok=True)
 
 
-def init_users() -> None:
-    invite: Invite = Invite.find_by_id(TEST_INVITE_ID)
-    if invite is None:
+def init_invite() -> None:
+    if Invite.find_by_id(TEST_INVITE_ID) is None:
         log_stuff("status", "Database has been reset")
-        invite: Invite = Invite.create(id=TEST_INVITE_ID, name="TEST_INVITE")
-
-    if (User.find_by_email_address(TEST_EMAIL)) is None:
-        User.create(
-            email=TEST_EMAIL,
-            username="test",
-            password=BASIC_PASS,
-            invite=invite,
-        )
+        Invite.create(id=TEST_INVITE_ID, name="TEST_INVITE")
+
+
+def bundle_user_entry(index: int, user_settings: dict[str, str | None]) -> dict:
+    entry: dict[str, str | int | None] = {
+        "email": f"{index}@user.user",
+        "username": user_settings.get("username") or f"user-{index}",
+        "invite_id": None,
+    }
+    for column in BUNDLE_COLUMNS:
+        entry[column] = user_settings.get(column)
+    return entry
 
+
+def init_users() -> None:
+    """Creates missing test users at once, so only the first boot hashes"""
+    test_entry = {"email": TEST_EMAIL, "username": "test", "invite_id": TEST_INVITE_ID}
+    # the test user goes first, so that it gets the first id (used by `/go/`)
+    entries: list[dict] = [dict(dict.fromkeys(BUNDLE_COLUMNS), **test_entry)]
     with open_file("static/test/user-bundle.json") as f:
-        for i, user_settings in enumerate(load_json(f)):
-            email: str = f"{i}@user.user"
-            user: User = User.find_by_email_address(email)
-            if user is None:
-                user = User.create(
-                    email=email,
-                    username=f"user-{i}",
-                    password=BASIC_PASS,
-                )
-            user.change_settings(**user_settings)
+        entries.extend(
+            bundle_user_entry(i, user_settings)
+            for i, user_settings in enumerate(load_json(f))
+        )
+
+    if TEST_EMAIL in create_users_bulk(entries, password=BASIC_PASS):
+        user: User = User.find_by_email_address(TEST_EMAIL)
+        user.code = user.invite.generate_code(user.id)
 
 
 def version_check():  # TODO pragma: no coverage
@@ -136,11 +170,41 @@ def version_check():  # TODO pragma: no coverage
 
 
 with application.app_context():
-    permission_index.initialize()
-    init_folder_structure()
-    init_users()
-    version_check()
+    with startup.phase("permissions"):
+        permission_index.initialize()
+    with startup.phase("folders"):
+        init_folder_structure()
+    with startup.phase("seeding"):
+        init_invite()
+        if not PRODUCTION_MODE:
+            init_users()
     db.session.commit()
+startup.defer("version-check", version_check)
+for document in api_documents:
+    startup.defer(f"{document.name}-docs", document.prepare)
+
+if mail_initialized:  # pragma: no coverage
+    with startup.phase("email-templates"):
+        preload_email_templates()
+    socketio.start_background_task(run_email_sender, socketio.sleep)
+
+
+def finish_startup(*_) -> None:
+    """Runs deferred phases, :param _: `socketio.sleep` for background tasks"""
+    startup.run_deferred(application)
+    log_stuff("status", startup.report())
+
+
+if application.testing:
+    finish_startup()
+else:  # pragma: no coverage
+    socketio.start_background_task(finish_startup, socketio.sleep)
+    socketio.start_background_task(scheduler.run, socketio.sleep)
+    socketio.start_background_task(
+        task_timers.run, socketio.sleep, TasksEventSpace.notify_students
+    )
+    if QUEUE_WORKER_ENABLED:
+        socketio.start_background_task(run_queue_worker, socketio.sleep)
 
 if __name__ == "__main__":  # test only
     socketio.run(